@@ -1,7 +1,9 @@
+import asyncio
 from logging.config import fileConfig
 
-from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
 
@@ -19,16 +21,19 @@ if config.config_file_name is not None:
 from src.core.base import Base
 from src.books.models import BookModel  # noqa: F401 - импорт для autogenerate
 from src.genres.models import GenreModel  # noqa: F401 - импорт для autogenerate
+from src.images.models import ImageBlobModel  # noqa: F401 - импорт для autogenerate
+from src.stats.models import BookStatsModel  # noqa: F401 - импорт для autogenerate
+from src.user.models import UserModel  # noqa: F401 - импорт для autogenerate
 
 target_metadata = Base.metadata
 
 # Получаем database_url из настроек приложения
 from src.core.config import settings
 
-# Для Alembic используем синхронный драйвер SQLite
-# (Alembic работает синхронно, поэтому используем sqlite:// вместо sqlite+aiosqlite://)
-database_url = settings.database_url.replace("+aiosqlite", "")
-config.set_main_option("sqlalchemy.url", database_url)
+# Миграции выполняются через тот же асинхронный драйвер, что и приложение
+# (aiosqlite или asyncpg), поэтому URL берётся из настроек как есть.
+# '%' экранируется для ConfigParser (пароли в URL).
+config.set_main_option("sqlalchemy.url", settings.database_url.replace("%", "%%"))
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -60,27 +65,42 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
-def run_migrations_online() -> None:
-    """Run migrations in 'online' mode.
+def do_run_migrations(connection: Connection) -> None:
+    """Выполнить миграции на синхронном фасаде асинхронного соединения."""
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        # SQLite не умеет большинство ALTER TABLE - autogenerate пишет batch-операции
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
 
-    In this scenario we need to create an Engine
-    and associate a connection with the context.
+    with context.begin_transaction():
+        context.run_migrations()
 
-    Используем синхронный драйвер SQLite для миграций (стандартная практика).
-    """
-    connectable = engine_from_config(
+
+async def run_async_migrations() -> None:
+    """Создать асинхронный движок и выполнить миграции в его соединении."""
+    connectable = async_engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
 
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode.
+
+    In this scenario we need to create an Engine
+    and associate a connection with the context.
 
-        with context.begin_transaction():
-            context.run_migrations()
+    Работает с любым асинхронным драйвером приложения (aiosqlite, asyncpg).
+    """
+    asyncio.run(run_async_migrations())
 
 
 if context.is_offline_mode():
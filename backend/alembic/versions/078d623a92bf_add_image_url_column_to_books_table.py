@@ -20,7 +20,10 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    op.add_column('books', sa.Column('image_url', sa.String(), nullable=True))
+    # Колонка уже есть в базах, созданных через create_all
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('books')}
+    if 'image_url' not in columns:
+        op.add_column('books', sa.Column('image_url', sa.String(), nullable=True))
 
 
 def downgrade() -> None:
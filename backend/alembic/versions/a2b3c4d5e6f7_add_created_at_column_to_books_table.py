@@ -20,10 +20,29 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
+    connection = op.get_bind()
+
+    # created_at мог уже добавить параллельный head db29145843f5
+    columns = {column['name'] for column in sa.inspect(connection).get_columns('books')}
+    if 'created_at' in columns:
+        return
+
     # Add created_at column with default value for existing rows
-    op.add_column('books', sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()))
+    column = sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now())
+    if connection.dialect.name == 'sqlite':
+        # SQLite не разрешает ADD COLUMN с CURRENT_TIMESTAMP - пересоздаём таблицу
+        with op.batch_alter_table('books', recreate='always') as batch_op:
+            batch_op.add_column(column)
+    else:
+        op.add_column('books', column)
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    op.drop_column('books', 'created_at')
+    # Колонку мог уже удалить откат параллельного head db29145843f5
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('books')}
+    if 'created_at' not in columns:
+        return
+
+    with op.batch_alter_table('books') as batch_op:
+        batch_op.drop_column('created_at')
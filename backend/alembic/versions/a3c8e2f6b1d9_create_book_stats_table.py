@@ -0,0 +1,52 @@
+"""create book_stats table
+
+Revision ID: a3c8e2f6b1d9
+Revises: f5b1c7d3e9a2
+Create Date: 2026-10-17 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c8e2f6b1d9'
+down_revision: Union[str, Sequence[str], None] = 'f5b1c7d3e9a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Агрегаты книг по статусу, жанру и месяцу добавления, заполненные по текущим данным."""
+    # Таблица уже есть в базах, созданных через create_all, и её ведёт приложение
+    if sa.inspect(op.get_bind()).has_table('book_stats'):
+        return
+
+    op.create_table(
+        'book_stats',
+        sa.Column('owner_key', sa.Integer(), nullable=False),
+        sa.Column('dimension', sa.String(), nullable=False),
+        sa.Column('value', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('owner_key', 'dimension', 'value')
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        month = "to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM')"
+    else:
+        month = "strftime('%Y-%m', created_at)"
+
+    for dimension, expression in (('status', "COALESCE(status, '')"), ('genre', "COALESCE(genre, '')"), ('month', month)):
+        op.execute(f"""
+            INSERT INTO book_stats (owner_key, dimension, value, count)
+            SELECT COALESCE(owner_id, 0), '{dimension}', {expression}, COUNT(*)
+            FROM books
+            GROUP BY COALESCE(owner_id, 0), {expression}
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('book_stats')
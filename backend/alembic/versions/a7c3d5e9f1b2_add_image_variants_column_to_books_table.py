@@ -0,0 +1,31 @@
+"""add image_variants column to books table
+
+Revision ID: a7c3d5e9f1b2
+Revises: f4a2b8c1d9e3
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3d5e9f1b2'
+down_revision: Union[str, Sequence[str], None] = 'f4a2b8c1d9e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Колонка уже есть в базах, созданных через create_all
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('books')}
+    if 'image_variants' not in columns:
+        op.add_column('books', sa.Column('image_variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('books', 'image_variants')
@@ -0,0 +1,103 @@
+"""add genre_id column and status constraint to books table
+
+Revision ID: b4d9f3a7c2e1
+Revises: a3c8e2f6b1d9
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d9f3a7c2e1'
+down_revision: Union[str, Sequence[str], None] = 'a3c8e2f6b1d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUSES = ('want_to_read', 'reading', 'finished', 'dropped')
+STATUS_CHECK = "status IN ({})".format(", ".join(f"'{status}'" for status in STATUSES))
+
+
+def upgrade() -> None:
+    """genre_id со ссылкой на genres, ограничение на status и индексы для фильтров списка."""
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    columns = {column['name'] for column in inspector.get_columns('books')}
+    indexes = {index['name'] for index in inspector.get_indexes('books')}
+    checks = {check['name'] for check in inspector.get_check_constraints('books')}
+
+    # Как и owner_id (колонка уже есть в базах, созданных через create_all): в SQLite
+    # ссылка в самой колонке (без пересоздания books и её триггеров FTS), в остальных
+    # СУБД - отдельным ограничением
+    if 'genre_id' not in columns:
+        if connection.dialect.name == 'sqlite':
+            op.execute('ALTER TABLE books ADD COLUMN genre_id INTEGER REFERENCES genres (id) ON DELETE SET NULL')
+        else:
+            op.add_column('books', sa.Column('genre_id', sa.Integer(), nullable=True))
+            op.create_foreign_key(
+                'fk_books_genre_id_genres', 'books', 'genres', ['genre_id'], ['id'], ondelete='SET NULL'
+            )
+
+    # Недостающие жанры из свободного текста books.genre
+    op.execute("""
+        INSERT INTO genres (name)
+        SELECT DISTINCT genre FROM books
+        WHERE genre IS NOT NULL AND genre NOT IN (SELECT name FROM genres)
+    """)
+
+    # Заполнение genre_id идёт в общей транзакции миграции, как и остальные шаги
+    op.execute("""
+        UPDATE books
+        SET genre_id = (SELECT genres.id FROM genres WHERE genres.name = books.genre)
+        WHERE genre IS NOT NULL
+    """)
+
+    # Статусы вне перечня раньше принимались как свободный текст
+    op.execute(f"UPDATE books SET status = NULL WHERE status IS NOT NULL AND NOT ({STATUS_CHECK})")
+    # Счётчики book_stats по статусу пересчитываются с учётом сброшенных значений
+    op.execute("DELETE FROM book_stats WHERE dimension = 'status'")
+    op.execute("""
+        INSERT INTO book_stats (owner_key, dimension, value, count)
+        SELECT COALESCE(owner_id, 0), 'status', COALESCE(status, ''), COUNT(*)
+        FROM books
+        GROUP BY COALESCE(owner_id, 0), COALESCE(status, '')
+    """)
+    if 'ck_books_status' in checks:
+        pass  # create_all объявляет CHECK в самой таблице
+    elif connection.dialect.name == 'postgresql':
+        op.create_check_constraint('ck_books_status', 'books', STATUS_CHECK)
+    else:
+        # SQLite не добавляет CHECK через ALTER TABLE, а batch-режим пересоздал бы books
+        for event in ('INSERT', 'UPDATE OF status'):
+            suffix = 'ai' if event == 'INSERT' else 'au'
+            op.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS books_status_check_{suffix} BEFORE {event} ON books
+                WHEN new.status IS NOT NULL AND NOT (new.{STATUS_CHECK})
+                BEGIN
+                    SELECT RAISE(ABORT, 'CHECK constraint failed: ck_books_status');
+                END
+            """)
+
+    for name, index_columns in (
+            ('ix_books_status_created_at_id', ['status', 'created_at', 'id']),
+            ('ix_books_genre_id_created_at_id', ['genre_id', 'created_at', 'id']),
+    ):
+        if name not in indexes:
+            op.create_index(name, 'books', index_columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_books_genre_id_created_at_id', table_name='books')
+    op.drop_index('ix_books_status_created_at_id', table_name='books')
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_constraint('ck_books_status', 'books', type_='check')
+    else:
+        op.execute("DROP TRIGGER IF EXISTS books_status_check_au")
+        op.execute("DROP TRIGGER IF EXISTS books_status_check_ai")
+    if op.get_bind().dialect.name != 'sqlite':
+        op.drop_constraint('fk_books_genre_id_genres', 'books', type_='foreignkey')
+    op.drop_column('books', 'genre_id')
@@ -0,0 +1,46 @@
+"""create image_blobs table
+
+Revision ID: b8d4e6f2a3c5
+Revises: a7c3d5e9f1b2
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d4e6f2a3c5'
+down_revision: Union[str, Sequence[str], None] = 'a7c3d5e9f1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Счётчики ссылок на файлы обложек."""
+    # Таблица уже есть в базах, созданных через create_all
+    if sa.inspect(op.get_bind()).has_table('image_blobs'):
+        return
+
+    op.create_table(
+        'image_blobs',
+        sa.Column('url', sa.String(), nullable=False),
+        sa.Column('refcount', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('url')
+    )
+
+    # Уже загруженные обложки получают счётчик по числу ссылающихся книг
+    op.execute("""
+        INSERT INTO image_blobs (url, refcount)
+        SELECT image_url, COUNT(*) FROM books
+        WHERE image_url IS NOT NULL
+        GROUP BY image_url
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('image_blobs')
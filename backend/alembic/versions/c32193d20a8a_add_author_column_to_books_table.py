@@ -20,9 +20,10 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.add_column('books', sa.Column('author', sa.String(), nullable=True))
-    # ### end Alembic commands ###
+    # Колонка уже есть в базах, созданных через create_all
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('books')}
+    if 'author' not in columns:
+        op.add_column('books', sa.Column('author', sa.String(), nullable=True))
 
 
 def downgrade() -> None:
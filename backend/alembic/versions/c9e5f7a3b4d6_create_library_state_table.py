@@ -0,0 +1,39 @@
+"""create library_state table
+
+Revision ID: c9e5f7a3b4d6
+Revises: b8d4e6f2a3c5
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e5f7a3b4d6'
+down_revision: Union[str, Sequence[str], None] = 'b8d4e6f2a3c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Версия каталога для ETag / Last-Modified."""
+    # Таблица уже есть в базах, созданных через create_all
+    if sa.inspect(op.get_bind()).has_table('library_state'):
+        return
+
+    op.create_table(
+        'library_state',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO library_state (id, version) VALUES (1, 0)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('library_state')
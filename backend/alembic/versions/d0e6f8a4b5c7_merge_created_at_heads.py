@@ -0,0 +1,28 @@
+"""merge created_at heads
+
+Revision ID: d0e6f8a4b5c7
+Revises: c9e5f7a3b4d6, a2b3c4d5e6f7
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0e6f8a4b5c7'
+down_revision: Union[str, Sequence[str], None] = ('c9e5f7a3b4d6', 'a2b3c4d5e6f7')
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Объединение двух веток, добавлявших created_at (обе идемпотентны)."""
+    pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    pass
@@ -20,11 +20,27 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Add genre column to books table."""
-    # Добавляем колонку genre как nullable (SQLite ограничения)
-    op.add_column('books', sa.Column('genre', sa.String(), nullable=True))
-    
-    # Заполняем существующие записи значением по умолчанию
-    op.execute("UPDATE books SET genre = 'Fantasy' WHERE genre IS NULL")
+    # Первые версии создавали books через create_all, без миграции.
+    # На пустой базе (например, новой Postgres) создаём исходную таблицу здесь.
+    inspector = sa.inspect(op.get_bind())
+    if 'books' not in inspector.get_table_names():
+        op.create_table(
+            'books',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_books_id'), 'books', ['id'], unique=False)
+        op.create_index(op.f('ix_books_name'), 'books', ['name'], unique=False)
+
+    # В базе, созданной через create_all, колонка уже есть - её значения не трогаем
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('books')}
+    if 'genre' not in columns:
+        # Добавляем колонку genre как nullable (SQLite ограничения)
+        op.add_column('books', sa.Column('genre', sa.String(), nullable=True))
+
+        # Заполняем существующие записи значением по умолчанию
+        op.execute("UPDATE books SET genre = 'Fantasy' WHERE genre IS NULL")
     
     # Примечание: В SQLite нельзя изменить nullable для существующей колонки без пересоздания таблицы.
     # NOT NULL ограничение обеспечивается на уровне модели SQLAlchemy (BookModel.genre.nullable=False)
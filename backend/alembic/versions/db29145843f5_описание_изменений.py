@@ -20,27 +20,38 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.add_column('books', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False))
-    op.alter_column('books', 'name',
-               existing_type=sa.VARCHAR(),
-               nullable=False)
-    op.alter_column('books', 'genre',
-               existing_type=sa.VARCHAR(),
-               nullable=True,
-               existing_server_default=sa.text("'Fantasy'"))
-    # ### end Alembic commands ###
+    # created_at мог уже добавить параллельный head a2b3c4d5e6f7
+    columns = {column['name']: column for column in sa.inspect(op.get_bind()).get_columns('books')}
+
+    # База уже в нужном виде (create_all или другой head) - пересоздание books в SQLite
+    # не нужно и сбросило бы её триггеры
+    if 'created_at' in columns and not columns['name']['nullable'] and columns['genre']['nullable']:
+        return
+
+    # batch: SQLite не умеет ALTER COLUMN и пересоздаёт таблицу, в Postgres это обычный ALTER
+    with op.batch_alter_table('books') as batch_op:
+        if 'created_at' not in columns:
+            batch_op.add_column(sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False))
+        batch_op.alter_column('name',
+                   existing_type=sa.VARCHAR(),
+                   nullable=False)
+        batch_op.alter_column('genre',
+                   existing_type=sa.VARCHAR(),
+                   nullable=True,
+                   existing_server_default=sa.text("'Fantasy'"))
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.alter_column('books', 'genre',
-               existing_type=sa.VARCHAR(),
-               nullable=False,
-               existing_server_default=sa.text("'Fantasy'"))
-    op.alter_column('books', 'name',
-               existing_type=sa.VARCHAR(),
-               nullable=True)
-    op.drop_column('books', 'created_at')
-    # ### end Alembic commands ###
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('books')}
+
+    with op.batch_alter_table('books') as batch_op:
+        batch_op.alter_column('genre',
+                   existing_type=sa.VARCHAR(),
+                   nullable=False,
+                   existing_server_default=sa.text("'Fantasy'"))
+        batch_op.alter_column('name',
+                   existing_type=sa.VARCHAR(),
+                   nullable=True)
+        if 'created_at' in columns:
+            batch_op.drop_column('created_at')
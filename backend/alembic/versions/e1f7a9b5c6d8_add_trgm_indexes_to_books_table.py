@@ -0,0 +1,50 @@
+"""add pg_trgm indexes to books table
+
+Revision ID: e1f7a9b5c6d8
+Revises: d0e6f8a4b5c7
+Create Date: 2026-10-17 15:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f7a9b5c6d8'
+down_revision: Union[str, Sequence[str], None] = 'd0e6f8a4b5c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Триграммные GIN-индексы для поиска по name/author/genre (только Postgres)."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # Без pg_trgm на сервере индексы пропускаются: поиск работает, но сканированием
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+                CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                CREATE INDEX IF NOT EXISTS ix_books_name_trgm ON books USING gin (name gin_trgm_ops);
+                CREATE INDEX IF NOT EXISTS ix_books_author_trgm ON books USING gin (author gin_trgm_ops);
+                CREATE INDEX IF NOT EXISTS ix_books_genre_trgm ON books USING gin (genre gin_trgm_ops);
+            ELSE
+                RAISE NOTICE 'pg_trgm is not available, trigram indexes on books are skipped';
+            END IF;
+        END
+        $$
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_books_genre_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_books_author_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_books_name_trgm")
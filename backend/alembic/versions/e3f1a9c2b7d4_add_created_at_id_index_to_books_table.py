@@ -0,0 +1,32 @@
+"""add (created_at, id) index to books table
+
+Revision ID: e3f1a9c2b7d4
+Revises: db29145843f5
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f1a9c2b7d4'
+down_revision: Union[str, Sequence[str], None] = 'db29145843f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Индекс для курсорной пагинации списка книг."""
+    # Индекс уже есть в базах, созданных через create_all
+    indexes = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('books')}
+    if 'ix_books_created_at_id' in indexes:
+        return
+    op.create_index('ix_books_created_at_id', 'books', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_books_created_at_id', table_name='books')
@@ -0,0 +1,70 @@
+"""create books_fts full-text index
+
+Revision ID: f4a2b8c1d9e3
+Revises: e3f1a9c2b7d4
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a2b8c1d9e3'
+down_revision: Union[str, Sequence[str], None] = 'e3f1a9c2b7d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """FTS5 индекс по name/author/genre с триггерами синхронизации (только SQLite)."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    # create_all создаёт индекс вместе с books (after_create в моделях)
+    if sa.inspect(op.get_bind()).has_table('books_fts'):
+        return
+
+    op.execute("""
+        CREATE VIRTUAL TABLE books_fts USING fts5(
+            name, author, genre,
+            content='books', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER books_fts_ai AFTER INSERT ON books BEGIN
+            INSERT INTO books_fts(rowid, name, author, genre)
+            VALUES (new.id, new.name, new.author, new.genre);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER books_fts_ad AFTER DELETE ON books BEGIN
+            INSERT INTO books_fts(books_fts, rowid, name, author, genre)
+            VALUES ('delete', old.id, old.name, old.author, old.genre);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER books_fts_au AFTER UPDATE OF name, author, genre ON books BEGIN
+            INSERT INTO books_fts(books_fts, rowid, name, author, genre)
+            VALUES ('delete', old.id, old.name, old.author, old.genre);
+            INSERT INTO books_fts(rowid, name, author, genre)
+            VALUES (new.id, new.name, new.author, new.genre);
+        END
+    """)
+
+    # Индексируем уже существующие книги
+    op.execute("INSERT INTO books_fts(books_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS books_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS books_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS books_fts_ai")
+    op.execute("DROP TABLE IF EXISTS books_fts")
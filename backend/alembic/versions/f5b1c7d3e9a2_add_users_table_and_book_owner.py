@@ -0,0 +1,61 @@
+"""add users table and owner_id column to books table
+
+Revision ID: f5b1c7d3e9a2
+Revises: e1f7a9b5c6d8
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5b1c7d3e9a2'
+down_revision: Union[str, Sequence[str], None] = 'e1f7a9b5c6d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Пользователи и владелец книги."""
+    # В dev-базах таблица могла быть создана через create_all
+    if not sa.inspect(op.get_bind()).has_table('users'):
+        op.create_table(
+            'users',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('email', sa.String(), nullable=False),
+            sa.Column('password', sa.String(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+        op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+
+    inspector = sa.inspect(op.get_bind())
+    columns = {column['name'] for column in inspector.get_columns('books')}
+    indexes = {index['name'] for index in inspector.get_indexes('books')}
+
+    # Alembic добавляет внешний ключ отдельным ALTER TABLE ADD CONSTRAINT, которого нет
+    # в SQLite, а batch-режим пересоздал бы books вместе с триггерами FTS. В SQLite
+    # ссылка объявляется в самой колонке (ADD COLUMN ... REFERENCES допустим при NULL
+    # по умолчанию), в остальных СУБД - отдельным ограничением. В базах, созданных
+    # через create_all, колонка уже есть.
+    if 'owner_id' not in columns:
+        if op.get_bind().dialect.name == 'sqlite':
+            op.execute('ALTER TABLE books ADD COLUMN owner_id INTEGER REFERENCES users (id) ON DELETE CASCADE')
+        else:
+            op.add_column('books', sa.Column('owner_id', sa.Integer(), nullable=True))
+            op.create_foreign_key(
+                'fk_books_owner_id_users', 'books', 'users', ['owner_id'], ['id'], ondelete='CASCADE'
+            )
+    if 'ix_books_owner_id_created_at_id' not in indexes:
+        op.create_index('ix_books_owner_id_created_at_id', 'books', ['owner_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_books_owner_id_created_at_id', table_name='books')
+    if op.get_bind().dialect.name != 'sqlite':
+        op.drop_constraint('fk_books_owner_id_users', 'books', type_='foreignkey')
+    op.drop_column('books', 'owner_id')
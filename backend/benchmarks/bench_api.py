@@ -0,0 +1,125 @@
+"""
+Нагрузочный прогон API книг внутри процесса (ASGI, без сети).
+
+Каталог заполняется генератором benchmarks.seed во временной базе,
+затем httpx через ASGITransport гоняет запросы к `src.main:app`:
+- list: первая страница списка;
+- list_deep: страница по курсору из середины каталога;
+- search: полнотекстовый поиск `q`;
+- filter: фильтр по жанру и статусу;
+- create / update / delete: изменение книг;
+- upload: создание книги с обложкой (PNG, миниатюры в пуле процессов;
+  файл один и тот же, поэтому после первого раза срабатывает дедупликация).
+
+Сеть и сервер (uvicorn) в замер не входят: отчёт показывает стоимость
+самого приложения и БД, его удобно сравнивать между версиями
+(см. benchmarks.compare).
+
+Запуск (из backend/):
+    python -m benchmarks.bench_api --rows 100k --requests 2000 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import datetime
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict
+
+from benchmarks.common import PRESETS, measure_concurrent, parse_rows, report
+
+WARMUP = 20
+
+SCENARIOS = ["list", "list_deep", "search", "filter", "create", "update", "delete", "upload"]
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+async def _run(rows: int, requests: int, concurrency: int, scenarios: list) -> Dict[str, Any]:
+    # Импорт после настройки окружения: настройки и движок создаются при импорте
+    import httpx
+    from PIL import Image
+
+    from benchmarks.seed import SEED_STARTED, seed_database
+    from src.books.pagination import encode_cursor
+    from src.common.utils.image import shutdown_image_workers
+    from src.core.config import settings
+    from src.main import app
+
+    seeding = await seed_database(settings.database_url, rows)
+
+    cover = io.BytesIO()
+    Image.new("RGB", (800, 1200), (120, 90, 60)).save(cover, "PNG")
+    cover_bytes = cover.getvalue()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Курсор на середину каталога: позиция книги rows // 2 из генератора
+        middle = rows // 2
+        deep_cursor = encode_cursor(SEED_STARTED + datetime.timedelta(minutes=middle), middle + 1)
+
+        # Книги для update/delete создаются заранее, чтобы delete не зависел от create
+        victims = []
+        for index in range(requests + WARMUP):
+            response = await client.post("/api/v1/book", data={"name": f"Удаляемая {index}"})
+            victims.append(response.json()["id"])
+
+        def check(response: httpx.Response) -> None:
+            if response.status_code >= 400:
+                raise RuntimeError(f"{response.request.method} {response.request.url}: {response.status_code} {response.text}")
+
+        operations = {
+            "list": lambda i: client.get("/api/v1/book", params={"limit": 50}),
+            "list_deep": lambda i: client.get("/api/v1/book", params={"limit": 50, "cursor": deep_cursor}),
+            "search": lambda i: client.get("/api/v1/book", params={"q": "война", "limit": 50}),
+            "filter": lambda i: client.get("/api/v1/book", params={"genre": "Жанр 7", "status": "reading", "limit": 50}),
+            "create": lambda i: client.post("/api/v1/book", data={"name": f"Новая {i}", "genre": "Жанр 1"}),
+            "update": lambda i: client.put(f"/api/v1/book/{victims[i % len(victims)]}", json={"status": "finished"}),
+            "delete": lambda i: client.delete(f"/api/v1/book/{victims[i]}"),
+            "upload": lambda i: client.post(
+                "/api/v1/book",
+                data={"name": f"С обложкой {i}"},
+                files={"image": ("cover.png", cover_bytes, "image/png")},
+            ),
+        }
+
+        results: Dict[str, Any] = {"seed": seeding}
+        for name in scenarios:
+            operation = operations[name]
+            # Загрузка обложки на порядок дороже остальных сценариев
+            count = max(requests // 20, 10) if name == "upload" else requests
+
+            async def run_once(index: int, operation=operation) -> None:
+                check(await operation(index))
+
+            results[name] = await measure_concurrent(run_once, count, concurrency, warmup=WARMUP)
+
+    shutdown_image_workers()
+    return results
+
+
+async def main(rows: int, requests: int, concurrency: int, scenarios: list) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}"
+        # Обложки пишутся в uploads/ текущего каталога - уводим их во временный
+        sys.path.insert(0, str(BACKEND_DIR))
+        os.chdir(directory)
+        try:
+            results = await _run(rows, requests, concurrency, scenarios)
+        finally:
+            os.chdir(BACKEND_DIR)
+
+    report("api", {"rows": rows, "requests": requests, "concurrency": concurrency, "scenarios": results})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=parse_rows, default=PRESETS["100k"], help="число строк или 1k/100k/1m")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.requests, args.concurrency, args.scenarios))
@@ -0,0 +1,76 @@
+"""
+Бенчмарк отдачи обложек: StaticFiles против CoverStaticFiles.
+
+Сценарии:
+- full: обычный GET файла;
+- revalidate: повторный GET с If-None-Match (браузер со старым кэшем);
+- range: GET первых 16 KiB.
+
+Главный выигрыш нового mount не виден в замере на сервере: с
+`immutable` браузер и прокси вообще не отправляют запросы за
+закэшированной обложкой. Бенчмарк показывает, что серверная
+стоимость каждого пути (в т.ч. 304) не хуже прежней.
+
+Запуск (из backend/):
+    python -m benchmarks.bench_covers --iterations 2000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+
+import httpx
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.staticfiles import StaticFiles
+
+from benchmarks.common import measure, report
+from src.common.utils.static import CoverStaticFiles
+
+COVER_NAME = "0" * 64 + ".jpg"
+
+
+def _make_app(static_class, directory: str) -> Starlette:
+    return Starlette(routes=[Mount("/uploads", static_class(directory=directory))])
+
+
+async def _run_scenarios(static_class, directory: str, iterations: int) -> dict:
+    transport = httpx.ASGITransport(app=_make_app(static_class, directory))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        url = f"/uploads/{COVER_NAME}"
+        first = await client.get(url)
+        etag = first.headers["etag"]
+
+        results = {}
+        results["full"] = await measure(lambda: client.get(url), iterations)
+        results["revalidate"] = await measure(
+            lambda: client.get(url, headers={"If-None-Match": etag}), iterations
+        )
+        results["range"] = await measure(
+            lambda: client.get(url, headers={"Range": "bytes=0-16383"}), iterations
+        )
+        results["revalidate_status"] = (await client.get(url, headers={"If-None-Match": etag})).status_code
+        results["cache_control"] = first.headers.get("cache-control")
+        return results
+
+
+async def main(iterations: int, size_kb: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, COVER_NAME), "wb") as f:
+            f.write(os.urandom(size_kb * 1024))
+
+        report("covers", {
+            "file_size_kb": size_kb,
+            "iterations": iterations,
+            "static_files": await _run_scenarios(StaticFiles, directory, iterations),
+            "cover_static_files": await _run_scenarios(CoverStaticFiles, directory, iterations),
+        })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--size-kb", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.size_kb))
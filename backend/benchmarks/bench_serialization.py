@@ -0,0 +1,102 @@
+"""
+Бенчмарк сериализации страницы списка книг.
+
+Сравниваются два пути для одних и тех же строк результата:
+- models: строки -> BookListItem/BookPage, затем как в FastAPI -
+  валидация в response_model, dump в JSON-совместимые объекты и
+  JSONResponse (прежний путь GET /api/v1/book);
+- direct: строки -> словари -> `serialization.dumps` (orjson, если
+  установлен, иначе pydantic-core) - текущий путь.
+
+Запуск (из backend/):
+    python -m benchmarks.bench_serialization --sizes 1000 10000 100000
+"""
+
+import argparse
+import datetime
+import time
+from collections import namedtuple
+from typing import Callable, Dict, List
+
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+from benchmarks.common import report
+from src.books.schemas import BOOK_LIST_FIELDS, BookListItem, BookPage
+from src.common.utils import serialization
+
+Row = namedtuple("Row", ["id", *BOOK_LIST_FIELDS])
+
+_page_adapter = TypeAdapter(BookPage)
+
+
+def _make_rows(count: int) -> List[Row]:
+    started = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    return [
+        Row(
+            id=index,
+            name=f"Книга {index}",
+            genre="Fantasy",
+            author=f"Автор {index % 500}",
+            status="reading",
+            image_url=f"uploads/images/{index:064d}.jpg",
+            image_variants=[{"url": f"uploads/images/{index:064d}_320.webp", "width": 320, "height": 480, "format": "webp"}],
+            created_at=started + datetime.timedelta(minutes=index),
+        )
+        for index in range(count)
+    ]
+
+
+def _via_models(rows: List[Row]) -> bytes:
+    items = [BookListItem(id=row.id, **{field: getattr(row, field) for field in BOOK_LIST_FIELDS}) for row in rows]
+    page = BookPage(items=items, next_cursor=None)
+    validated = _page_adapter.validate_python(page, from_attributes=True)
+    content = _page_adapter.dump_python(validated, mode="json", exclude_unset=True)
+    return JSONResponse(content).body
+
+
+def _direct(rows: List[Row]) -> bytes:
+    items = [{"id": row.id, **{field: getattr(row, field) for field in BOOK_LIST_FIELDS}} for row in rows]
+    return serialization.dumps({"items": items, "next_cursor": None})
+
+
+def _rows_per_second(encode: Callable[[List[Row]], bytes], rows: List[Row], repeats: int) -> Dict[str, float]:
+    encode(rows)  # прогрев
+    timings = []
+    for _ in range(repeats):
+        begin = time.perf_counter()
+        body = encode(rows)
+        timings.append(time.perf_counter() - begin)
+    best = min(timings)
+    return {
+        "best_ms": round(best * 1000, 2),
+        "rows_per_sec": round(len(rows) / best),
+        "body_bytes": len(body),
+    }
+
+
+def main(sizes: List[int], repeats: int) -> None:
+    results = {}
+    for size in sizes:
+        rows = _make_rows(size)
+        models = _rows_per_second(_via_models, rows, repeats)
+        direct = _rows_per_second(_direct, rows, repeats)
+        results[str(size)] = {
+            "models": models,
+            "direct": direct,
+            "speedup": round(direct["rows_per_sec"] / models["rows_per_sec"], 2),
+        }
+
+    report("serialization", {
+        "encoder": "orjson" if serialization.orjson is not None else "pydantic-core",
+        "repeats": repeats,
+        "sizes": results,
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    main(args.sizes, args.repeats)
@@ -0,0 +1,70 @@
+"""
+Микробенчмарки BookService на заполненном каталоге (без HTTP).
+
+Сценарии:
+- first_page / deep_page: страница списка с начала и по курсору из середины;
+- projection: страница только с name и author;
+- search: полнотекстовый поиск (SQLite FTS5);
+- filter: фильтр по жанру и статусу;
+- stats: статистика из агрегатов book_stats;
+- validators: ETag/Last-Modified (запрос, предшествующий каждому списку);
+- get_book: книга по ID.
+
+Запуск (из backend/):
+    python -m benchmarks.bench_service --rows 100k --iterations 500
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import tempfile
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from benchmarks.common import PRESETS, measure, parse_rows, report
+from benchmarks.seed import SEED_STARTED, seed_database
+from src.books.pagination import encode_cursor
+from src.books.repository import BookRepository
+from src.books.service import BookService
+from src.common.enums import BookStatus
+from src.core.database import create_engine
+
+
+async def main(rows: int, iterations: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}"
+        seeding = await seed_database(url, rows)
+
+        engine = create_engine(url)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        middle = rows // 2
+        deep_cursor = encode_cursor(SEED_STARTED + datetime.timedelta(minutes=middle), middle + 1)
+
+        async with session_factory() as session:
+            service = BookService(BookRepository(session))
+            scenarios = {
+                "first_page": lambda: service.get_all_books_json(limit=50),
+                "deep_page": lambda: service.get_all_books_json(cursor=deep_cursor, limit=50),
+                "projection": lambda: service.get_all_books_json(limit=50, fields="name,author"),
+                "search": lambda: service.get_all_books_json(q="война", limit=50),
+                "filter": lambda: service.get_all_books_json(genre="Жанр 7", status=BookStatus.READING, limit=50),
+                "stats": service.get_stats,
+                "validators": lambda: service.get_cache_validators("list?limit=50"),
+                "get_book": lambda: service.get_book(middle + 1),
+            }
+            results = {"seed": seeding}
+            for name, operation in scenarios.items():
+                results[name] = await measure(operation, iterations)
+
+        await engine.dispose()
+
+    report("service", {"rows": rows, "iterations": iterations, "scenarios": results})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=parse_rows, default=PRESETS["100k"], help="число строк или 1k/100k/1m")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.iterations))
@@ -0,0 +1,119 @@
+"""
+Бенчмарк чтения SQLite при параллельной записи.
+
+Сравниваются два профиля соединений на одной и той же нагрузке:
+- rollback: журнал по умолчанию (DELETE, synchronous=FULL) - писатель
+  блокирует читателей на время коммита;
+- wal: PRAGMA из настроек приложения (WAL, synchronous=NORMAL, mmap,
+  cache_size) - читатели не ждут писателя.
+
+Несколько задач непрерывно создают книги через BookRepository.create,
+остальные в это время читают первую страницу списка. В отчёте -
+латентность и пропускная способность чтения и число успевших записей.
+
+Все задачи работают в одном процессе: на одном ядре узким местом
+становится event loop, и разница профилей почти не видна. Запросы
+aiosqlite выполняются в отдельных потоках без GIL, поэтому на
+нескольких ядрах и реальном диске блокировки журнала проявляются в p95/p99.
+
+Запуск (из backend/):
+    python -m benchmarks.bench_sqlite_concurrency --seconds 10 --readers 8 --writers 2
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.common import report, summarize
+from src.books.models import BookModel
+from src.books.repository import BookRepository
+from src.books.schemas import BOOK_LIST_FIELDS
+from src.core.base import Base
+from src.core.config import settings
+from src.core.database import apply_sqlite_pragmas, sqlite_pragmas
+from src.images.models import ImageBlobModel  # noqa: F401 - таблица image_blobs для create_all
+from src.user.models import UserModel  # noqa: F401 - books.owner_id ссылается на users
+
+PROFILES = {
+    "rollback": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+    },
+    "wal": sqlite_pragmas(),
+}
+
+
+async def _run_profile(pragmas: Dict[str, Any], seconds: float, readers: int, writers: int, seed: int) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}",
+            pool_size=readers + writers,
+            max_overflow=0,
+        )
+        apply_sqlite_pragmas(engine, pragmas)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(
+                insert(BookModel),
+                [{"name": f"Книга {i}", "author": f"Автор {i % 100}", "genre": "Роман"} for i in range(seed)],
+            )
+
+        deadline = time.perf_counter() + seconds
+        read_latencies: List[float] = []
+        writes = 0
+
+        async def reader() -> None:
+            async with session_factory() as session:
+                repository = BookRepository(session)
+                while time.perf_counter() < deadline:
+                    begin = time.perf_counter()
+                    await repository.get_page(BOOK_LIST_FIELDS, settings.books_page_size)
+                    # Завершаем транзакцию, иначе читатель держит старый снимок
+                    await session.rollback()
+                    read_latencies.append(time.perf_counter() - begin)
+
+        async def writer() -> None:
+            nonlocal writes
+            async with session_factory() as session:
+                repository = BookRepository(session)
+                while time.perf_counter() < deadline:
+                    await repository.create({"name": "Новая книга", "author": "Автор", "genre": "Роман"})
+                    writes += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[reader() for _ in range(readers)], *[writer() for _ in range(writers)])
+        elapsed = time.perf_counter() - started
+        await engine.dispose()
+
+    return {
+        "pragmas": pragmas,
+        "reads": summarize(read_latencies, elapsed),
+        "writes": writes,
+        "writes_per_second": round(writes / elapsed, 1),
+    }
+
+
+async def main(seconds: float, readers: int, writers: int, seed: int) -> None:
+    results = {"seconds": seconds, "readers": readers, "writers": writers, "seed_rows": seed}
+    for name, pragmas in PROFILES.items():
+        results[name] = await _run_profile(pragmas, seconds, readers, writers, seed)
+    report("sqlite_concurrency", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=10000)
+    args = parser.parse_args()
+    asyncio.run(main(args.seconds, args.readers, args.writers, args.seed))
@@ -0,0 +1,167 @@
+"""
+Масштабирование пропускной способности по числу воркеров.
+
+Для каждого числа воркеров (1, 2, 4, ... до --max-workers) сервер
+запускается как в production (`python main.py --production --workers N`)
+на заполненной временной базе, и по HTTP гоняются запросы списка книг.
+Нагрузку дают `--clients` отдельных процессов, чтобы сам генератор
+не упирался в одно ядро; на одной машине клиенты и сервер делят
+ядра, поэтому рост меньше линейного ожидаем.
+
+В отчёте на каждое N: p50/p95/p99, RPS и ускорение относительно 1 воркера.
+
+Запуск (из backend/):
+    python -m benchmarks.bench_workers --rows 100k --max-workers 8 --requests 4000
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.common import PRESETS, parse_rows, report, summarize
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PATH = "/api/v1/book?limit=50"
+READY_TIMEOUT = 60.0
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _worker_counts(maximum: int) -> List[int]:
+    """1, 2, 4, ... и сам maximum."""
+    counts = []
+    count = 1
+    while count < maximum:
+        counts.append(count)
+        count *= 2
+    return counts + [maximum]
+
+
+async def _load(url: str, requests: int, concurrency: int) -> List[float]:
+    import httpx
+
+    latencies: List[float] = []
+    counter = iter(range(requests))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        async def worker() -> None:
+            for _ in counter:
+                begin = time.perf_counter()
+                response = await client.get(url)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - begin)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def _client_process(args: Tuple[str, int, int]) -> List[float]:
+    return asyncio.run(_load(*args))
+
+
+def _wait_ready(url: str, server: subprocess.Popen) -> None:
+    import httpx
+
+    deadline = time.monotonic() + READY_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with code {server.returncode}")
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+def run_workers(workers: int, env: Dict[str, str], requests: int, concurrency: int, clients: int) -> Dict[str, float]:
+    """Запустить сервер с `workers` воркерами и замерить нагрузку."""
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, str(BACKEND_DIR / "main.py"), "--production", "--workers", str(workers),
+         "--host", "127.0.0.1", "--port", str(port), "--schema", "none"],
+        cwd=env["BENCH_DIR"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_ready(base_url + "/api/v1/book/statuses", server)
+        # Прогрев: соединения пулов и кэши страниц SQLite во всех воркерах
+        asyncio.run(_load(base_url + PATH, workers * 50, concurrency))
+
+        per_client = requests // clients
+        started = time.perf_counter()
+        with multiprocessing.Pool(clients) as pool:
+            parts = pool.map(_client_process, [(base_url + PATH, per_client, concurrency // clients or 1)] * clients)
+        elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    return summarize([latency for part in parts for latency in part], elapsed)
+
+
+async def _seed(url: str, rows: int) -> Dict[str, Any]:
+    from benchmarks.seed import seed_database
+    return await seed_database(url, rows)
+
+
+def main(rows: int, max_workers: int, requests: int, concurrency: int, clients: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}"
+        env = {
+            **os.environ,
+            "DATABASE_URL": database_url,
+            "PYTHONPATH": str(BACKEND_DIR),
+            "BENCH_DIR": directory,
+            "IMAGE_GC_INTERVAL_SECONDS": "0",
+            # production-режим не запускается с ключом подписи по умолчанию
+            "AUTH_SECRET_KEY": "bench-secret-key",
+        }
+        os.environ["DATABASE_URL"] = database_url
+        seeding = asyncio.run(_seed(database_url, rows))
+
+        results: Dict[str, Any] = {"seed": seeding}
+        baseline = None
+        for workers in _worker_counts(max_workers):
+            result = run_workers(workers, env, requests, concurrency, clients)
+            baseline = baseline or result["throughput_rps"]
+            result["speedup"] = round(result["throughput_rps"] / baseline, 2) if baseline else 0.0
+            results[f"workers_{workers}"] = result
+
+    report("workers", {
+        "rows": rows,
+        "requests": requests,
+        "concurrency": concurrency,
+        "clients": clients,
+        "cpu_count": os.cpu_count(),
+        "path": PATH,
+        "scenarios": results,
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=parse_rows, default=PRESETS["100k"], help="число строк или 1k/100k/1m")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, default=64, help="всего одновременных запросов")
+    parser.add_argument("--clients", type=int, default=min(4, os.cpu_count() or 1), help="процессов-генераторов нагрузки")
+    args = parser.parse_args()
+    main(args.rows, args.max_workers, args.requests, args.concurrency, args.clients)
@@ -0,0 +1,87 @@
+"""
+Запись через BookService: время и число SQL-запросов на операцию.
+
+Сценарии:
+- create: новая книга с жанром;
+- update_author: изменение поля без статистики (один UPDATE ... RETURNING);
+- update_status: изменение статуса с пересчётом book_stats;
+- delete: удаление книги (DELETE ... RETURNING).
+
+Запросы считаются по событию before_cursor_execute движка (COMMIT
+не входит). Отчёты до и после изменения можно сравнить через
+benchmarks.compare: `statements_per_op` считается ухудшившимся при росте.
+
+Запуск (из backend/):
+    python -m benchmarks.bench_writes --rows 100k --iterations 500
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import tempfile
+from typing import Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from benchmarks.common import PRESETS, measure, parse_rows, report
+from benchmarks.seed import seed_database
+from src.books.repository import BookRepository
+from src.books.schemas import BookCreate, BookUpdate
+from src.books.service import BookService
+from src.common.enums import BookStatus
+from src.core.database import create_engine
+
+WARMUP = 20
+
+
+async def main(rows: int, iterations: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}"
+        await seed_database(url, rows)
+
+        engine = create_engine(url)
+        statements = [0]
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def count_statement(*args) -> None:
+            statements[0] += 1
+
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        created: List[int] = []
+        statuses = itertools.cycle(BookStatus)
+        counter = itertools.count()
+
+        async with session_factory() as session:
+            service = BookService(BookRepository(session))
+
+            async def create() -> None:
+                number = next(counter)
+                book = await service.create_book(BookCreate(name=f"Книга {number}", genre=f"Жанр {number % 50}"))
+                created.append(book.id)
+
+            scenarios = {
+                "create": create,
+                "update_author": lambda: service.update_book(BookUpdate(author=f"Автор {next(counter)}"), rows // 2),
+                "update_status": lambda: service.update_book(BookUpdate(status=next(statuses)), rows // 2),
+                "delete": lambda: service.delete_book(created.pop()),
+            }
+            results: Dict[str, Dict[str, float]] = {}
+            for name, operation in scenarios.items():
+                before = statements[0]
+                results[name] = await measure(operation, iterations, warmup=WARMUP)
+                executed = statements[0] - before
+                results[name]["statements_per_op"] = round(executed / (iterations + WARMUP), 2)
+
+        await engine.dispose()
+
+    report("writes", {"rows": rows, "iterations": iterations, "scenarios": results})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=parse_rows, default=PRESETS["100k"], help="число строк или 1k/100k/1m")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.iterations))
@@ -0,0 +1,97 @@
+"""Общие утилиты бенчмарков: замер, перцентили, JSON-отчёт."""
+
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+# Типовые размеры каталога для генератора benchmarks.seed
+PRESETS = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+
+def parse_rows(value: str) -> int:
+    """Число строк или имя пресета (1k, 100k, 1m)."""
+    return PRESETS.get(value.lower()) or int(value)
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Перцентиль q (0..100) по отсортированной выборке, линейная интерполяция."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """Сводка по латентностям (секунды) и общему времени прогона."""
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+    }
+
+
+async def measure(operation: Callable[[], Awaitable[Any]], iterations: int, warmup: int = 20) -> Dict[str, float]:
+    """Выполнить операцию `iterations` раз последовательно и вернуть сводку."""
+    for _ in range(warmup):
+        await operation()
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        begin = time.perf_counter()
+        await operation()
+        latencies.append(time.perf_counter() - begin)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def measure_concurrent(
+        operation: Callable[[int], Awaitable[Any]],
+        requests: int,
+        concurrency: int,
+        warmup: int = 20,
+) -> Dict[str, float]:
+    """
+    Выполнить `requests` операций в `concurrency` параллельных задачах.
+
+    Операция получает порядковый номер вызова, включая прогрев (0..warmup-1),
+    - например, чтобы обновлять или удалять разные книги. Пропускная
+    способность считается по общему времени.
+    """
+    for index in range(warmup):
+        await operation(index)
+
+    latencies: List[float] = []
+    counter = iter(range(warmup, warmup + requests))
+
+    async def worker() -> None:
+        for index in counter:
+            begin = time.perf_counter()
+            await operation(index)
+            latencies.append(time.perf_counter() - begin)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def report(name: str, results: Dict[str, Any]) -> None:
+    """Напечатать машиночитаемый отчёт бенчмарка в stdout."""
+    payload = {
+        "benchmark": name,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+    json.dump(payload, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
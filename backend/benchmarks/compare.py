@@ -0,0 +1,81 @@
+"""
+Сравнение двух JSON-отчётов бенчмарков (базовая версия и новая).
+
+Сравниваются одноимённые метрики на одинаковых путях отчёта:
+латентности (`*_ms`) считаются ухудшившимися при росте, пропускная
+способность (`throughput_rps`, `rows_per_sec`) - при падении.
+Изменения больше `--threshold` печатаются, код выхода 1 при
+регрессиях - удобно для CI.
+
+Запуск (из backend/):
+    python -m benchmarks.bench_api > new.json
+    python -m benchmarks.compare base.json new.json --threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Метрика -> направление: 1 - больше значит хуже, -1 - больше значит лучше
+DIRECTIONS = {
+    "p50_ms": 1,
+    "p95_ms": 1,
+    "p99_ms": 1,
+    "mean_ms": 1,
+    "best_ms": 1,
+    "throughput_rps": -1,
+    "rows_per_sec": -1,
+    "statements_per_op": 1,
+}
+
+
+def _walk(node: Any, path: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], float]]:
+    """Все числовые значения отчёта с путём до них."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield from _walk(value, (*path, key))
+    elif isinstance(node, (int, float)) and not isinstance(node, bool):
+        yield path, float(node)
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Изменения метрик больше порога.
+
+    Returns:
+        List[Dict[str, Any]]: {metric, base, new, change, regression} по каждой метрике.
+    """
+    base_values = dict(_walk(base.get("results", base)))
+    changes = []
+    for path, new_value in _walk(new.get("results", new)):
+        direction = DIRECTIONS.get(path[-1])
+        base_value = base_values.get(path)
+        if direction is None or not base_value:
+            continue
+        change = (new_value - base_value) / base_value
+        if abs(change) < threshold:
+            continue
+        changes.append({
+            "metric": "/".join(path),
+            "base": base_value,
+            "new": new_value,
+            "change": round(change, 3),
+            "regression": change * direction > 0,
+        })
+    return changes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.1, help="относительное изменение, например 0.1 = 10%%")
+    args = parser.parse_args()
+
+    with open(args.base) as base_file, open(args.new) as new_file:
+        changes = compare(json.load(base_file), json.load(new_file), args.threshold)
+
+    json.dump({"threshold": args.threshold, "changes": changes}, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+    sys.exit(1 if any(change["regression"] for change in changes) else 0)
@@ -0,0 +1,99 @@
+"""
+Генератор синтетического каталога для бенчмарков.
+
+Заполняет books и genres детерминированными данными (одинаковый `--seed`
+даёт одинаковые строки), чтобы замеры разных версий шли на одном наборе.
+Книги вставляются через BookRepository.bulk_create пачками, поэтому
+genre_id, агрегаты book_stats и FTS-индекс заполняются так же, как при
+импорте через API.
+
+Запуск (из backend/):
+    python -m benchmarks.seed --rows 100000 --database-url sqlite+aiosqlite:///./bench.db
+"""
+
+import argparse
+import asyncio
+import datetime
+import random
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from benchmarks.common import PRESETS, parse_rows, report
+from src.books.repository import BookRepository
+from src.common.enums import BookStatus
+from src.core.base import Base
+from src.core.database import create_engine
+
+# Модели всех таблиц для create_all (books ссылается на users и genres)
+from src.books.models import BookModel  # noqa: F401
+from src.genres.models import GenreModel  # noqa: F401
+from src.images.models import ImageBlobModel  # noqa: F401
+from src.stats.models import BookStatsModel  # noqa: F401
+from src.user.models import UserModel  # noqa: F401
+
+GENRE_COUNT = 40
+AUTHOR_COUNT = 5_000
+WORDS = (
+    "война", "мир", "тень", "город", "море", "ветер", "память", "дом", "звезда", "сад",
+    "ночь", "дорога", "огонь", "зима", "остров", "письмо", "сон", "река", "голос", "время",
+)
+STATUSES = [status.value for status in BookStatus] + [None]
+
+# created_at книги с индексом i - SEED_STARTED + i минут (id = i + 1 в пустой базе)
+SEED_STARTED = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def make_books(count: int, seed: int = 42, start_id: int = 0) -> List[Dict[str, Any]]:
+    """Сгенерировать `count` книг (словари для BookRepository.bulk_create)."""
+    rng = random.Random(seed + start_id)
+    books = []
+    for index in range(start_id, start_id + count):
+        books.append({
+            "name": f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} {index}",
+            "author": f"Автор {rng.randrange(AUTHOR_COUNT)}",
+            "genre": f"Жанр {rng.randrange(GENRE_COUNT)}",
+            "status": rng.choice(STATUSES),
+            "created_at": SEED_STARTED + datetime.timedelta(minutes=index),
+        })
+    return books
+
+
+async def seed_database(database_url: str, rows: int, batch_size: int = 5_000, seed: int = 42) -> Dict[str, Any]:
+    """
+    Создать схему и заполнить каталог.
+
+    Returns:
+        Dict[str, Any]: Число строк и время заполнения.
+    """
+    engine = create_engine(database_url)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    started = time.perf_counter()
+    async with session_factory() as session:
+        repository = BookRepository(session)
+        for offset in range(0, rows, batch_size):
+            await repository.bulk_create(make_books(min(batch_size, rows - offset), seed, offset))
+            await repository.commit()
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    return {
+        "rows": rows,
+        "seconds": round(elapsed, 2),
+        "rows_per_sec": round(rows / elapsed) if elapsed else 0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=parse_rows, default=PRESETS["100k"], help="число строк или 1k/100k/1m")
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./bench.db")
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    report("seed", asyncio.run(seed_database(args.database_url, args.rows, args.batch_size, args.seed)))
@@ -1,6 +1,55 @@
-"""Application entry point."""
+"""
+Application entry point.
+
+    python main.py                  # разработка: один процесс, перезагрузка при изменении кода
+    python main.py --production     # N воркеров без reload, миграции один раз до их запуска
+"""
+
+import argparse
+import os
 
 import uvicorn
 
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--production", action="store_true", help="несколько воркеров, без reload")
+    parser.add_argument("--workers", type=int, default=None, help="число воркеров (по умолчанию SERVER_WORKERS или число ядер)")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument(
+        "--schema",
+        choices=["migrate", "create_all", "none"],
+        default="migrate",
+        help="подготовка схемы перед запуском воркеров (только --production)",
+    )
+    args = parser.parse_args()
+
+    from src.core.config import DEV_AUTH_SECRET_KEY, settings
+
+    host = args.host or settings.server_host
+    port = args.port or settings.server_port
+
+    if not args.production:
+        uvicorn.run("src.main:app", host=host, port=port, reload=True)
+        return
+
+    if settings.auth_secret_key == DEV_AUTH_SECRET_KEY:
+        # С известным ключом любой может подписать токен за любого пользователя
+        parser.error("AUTH_SECRET_KEY must be set to a private value in --production mode")
+
+    from src.core.bootstrap import bootstrap
+
+    # Схема и каталоги - один раз в родительском процессе; воркеры получают
+    # окружение родителя и пропускают этот шаг в lifespan
+    bootstrap(args.schema)
+    os.environ["DB_SCHEMA_INIT"] = "none"
+    # С одним воркером uvicorn запускает приложение в этом же процессе
+    settings.db_schema_init = "none"
+
+    workers = args.workers or settings.server_workers or os.cpu_count() or 1
+    uvicorn.run("src.main:app", host=host, port=port, workers=workers, reload=False, proxy_headers=True)
+
+
 if __name__ == "__main__":
-    uvicorn.run("src.main:app", host="0.0.0.0", port=8000, reload=True)
+    main()
@@ -0,0 +1,103 @@
+"""Потоковая выгрузка каталога книг в NDJSON / CSV."""
+
+import csv
+import datetime
+import io
+import json
+import zlib
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from sqlalchemy import Row
+
+from src.books.repository import BookRepository
+from src.books.schemas import BOOK_LIST_FIELDS
+from src.common.enums import CatalogFormat
+from src.core.config import settings
+from src.core.database import ReaderSessionLocal
+
+EXPORT_FIELDS = ("id", *BOOK_LIST_FIELDS)
+
+MEDIA_TYPES = {
+    CatalogFormat.NDJSON: "application/x-ndjson",
+    CatalogFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def _to_text(value: Any) -> Any:
+    """Привести значение колонки к JSON/CSV-совместимому виду."""
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def _to_cell(value: Any) -> Any:
+    """Привести значение колонки к ячейке CSV (вложенные структуры - JSON)."""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return _to_text(value)
+
+
+def _encode_ndjson(rows: Sequence[Row]) -> bytes:
+    """Закодировать пачку строк в NDJSON."""
+    lines = (
+        json.dumps({field: _to_text(value) for field, value in zip(EXPORT_FIELDS, row)}, ensure_ascii=False)
+        for row in rows
+    )
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _encode_csv(rows: Sequence[Row]) -> bytes:
+    """Закодировать пачку строк в CSV (без заголовка)."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_to_cell(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Сжимать поток на лету, не накапливая его целиком."""
+    compressor = zlib.compressobj(wbits=31)  # 31 - формат gzip
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+async def _iter_export(export_format: CatalogFormat, owner_id: Optional[int]) -> AsyncIterator[bytes]:
+    """
+    Итерировать выгрузку всех книг владельца.
+
+    Сессия открывается внутри генератора: она должна жить, пока
+    StreamingResponse отдаёт тело, а не только пока работает endpoint.
+    """
+    if export_format == CatalogFormat.CSV:
+        header = io.StringIO()
+        csv.writer(header).writerow(EXPORT_FIELDS)
+        yield header.getvalue().encode()
+
+    encode = _encode_csv if export_format == CatalogFormat.CSV else _encode_ndjson
+
+    async with ReaderSessionLocal() as session:
+        repository = BookRepository(session, owner_id=owner_id)
+        async for rows in repository.stream_all(BOOK_LIST_FIELDS, settings.export_batch_size):
+            yield encode(rows)
+
+
+def stream_export(
+        export_format: CatalogFormat,
+        compress: bool = False,
+        owner_id: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Тело ответа для выгрузки каталога.
+
+    Args:
+        export_format: Формат выгрузки.
+        compress: Сжать поток в gzip.
+        owner_id: Владелец книг (None - общий каталог).
+
+    Returns:
+        AsyncIterator[bytes]: Поток байтов для StreamingResponse.
+    """
+    chunks = _iter_export(export_format, owner_id)
+    return _gzip(chunks) if compress else chunks
@@ -0,0 +1,125 @@
+"""Потоковый разбор файлов импорта каталога (NDJSON / CSV)."""
+
+import codecs
+import csv
+import io
+import json
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, Union
+
+from fastapi import UploadFile
+
+from src.common.enums import CatalogFormat
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# (номер строки, запись) или (номер строки, текст ошибки разбора)
+ParsedRecord = Tuple[int, Union[Dict[str, Any], str]]
+
+
+def detect_format(file: UploadFile, requested: Optional[CatalogFormat]) -> CatalogFormat:
+    """
+    Определить формат файла импорта.
+
+    Raises:
+        ValueError: Если формат не указан и не угадывается по расширению.
+    """
+    if requested is not None:
+        return requested
+
+    suffix = Path(file.filename or "").suffix.lower()
+    if suffix == ".csv":
+        return CatalogFormat.CSV
+    if suffix in {".ndjson", ".jsonl"}:
+        return CatalogFormat.NDJSON
+    raise ValueError("Не удалось определить формат файла: укажите format=ndjson или format=csv")
+
+
+async def _iter_lines(file: UploadFile) -> AsyncIterator[str]:
+    """Читать файл кусками и отдавать строки целиком (с переводом строки)."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    while True:
+        chunk = await file.read(READ_CHUNK_SIZE)
+        # Делим только по \n: str.splitlines режет и по U+2028 внутри JSON-строк
+        *lines, tail = (tail + decoder.decode(chunk, final=not chunk)).split("\n")
+        for line in lines:
+            yield line + "\n"
+        if not chunk:
+            break
+    if tail:
+        yield tail
+
+
+async def _iter_ndjson(file: UploadFile) -> AsyncIterator[ParsedRecord]:
+    """Записи NDJSON: один JSON-объект на строку, пустые строки пропускаются."""
+    line_number = 0
+    async for line in _iter_lines(file):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, f"Некорректный JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, "Ожидается JSON-объект"
+            continue
+        yield line_number, record
+
+
+async def _iter_csv(file: UploadFile) -> AsyncIterator[ParsedRecord]:
+    """
+    Записи CSV с заголовком.
+
+    Поле в кавычках может содержать перевод строки, поэтому строки
+    копятся, пока число кавычек в записи не станет чётным.
+    """
+    header = None
+    buffer = ""
+    line_number = 0
+    record_start = 1
+
+    async for line in _iter_lines(file):
+        line_number += 1
+        if not buffer:
+            record_start = line_number
+        buffer += line
+        if buffer.count('"') % 2:
+            continue
+
+        values = next(csv.reader(io.StringIO(buffer)), [])
+        buffer = ""
+        if not any(value.strip() for value in values):
+            continue
+
+        if header is None:
+            header = [value.strip() for value in values]
+            continue
+
+        if len(values) != len(header):
+            yield record_start, f"Ожидалось {len(header)} колонок, получено {len(values)}"
+            continue
+
+        # Пустая ячейка CSV означает отсутствие значения
+        yield record_start, {key: value or None for key, value in zip(header, values)}
+
+    if buffer:
+        yield record_start, "Незакрытая кавычка в конце файла"
+
+
+def iter_records(file: UploadFile, import_format: CatalogFormat) -> AsyncIterator[ParsedRecord]:
+    """
+    Потоково разобрать файл импорта.
+
+    Args:
+        file: Загруженный файл.
+        import_format: Формат файла.
+
+    Returns:
+        AsyncIterator[ParsedRecord]: Пары (номер строки, запись или текст ошибки).
+    """
+    if import_format == CatalogFormat.CSV:
+        return _iter_csv(file)
+    return _iter_ndjson(file)
@@ -1,24 +1,85 @@
 """Book ORM model."""
 
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import DDL, JSON, CheckConstraint, Column, ForeignKey, Integer, String, DateTime, Index, event
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.sql import func
 
 from src.core.base import Base
+from src.books.search import FTS_DDL, TRGM_DDL
+from src.common.enums import BookStatus
+
+
+# Допустимые значения status (NULL - статус не задан)
+STATUS_CHECK = "status IN ({})".format(", ".join(f"'{status.value}'" for status in BookStatus))
+
+# SQLite хранит даты строками. server_default=CURRENT_TIMESTAMP пишет их
+# без микросекунд, поэтому и параметры запросов сериализуем в том же формате -
+# иначе строковое сравнение в keyset-пагинации расходится на равных значениях.
+CreatedAtType = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
 
 
 class BookModel(Base):
     """Модель книги."""
 
     __tablename__ = "books"
+    __table_args__ = (
+        # Порядок курсорной пагинации: (created_at, id)
+        Index("ix_books_created_at_id", "created_at", "id"),
+        # Список книг владельца в том же порядке
+        Index("ix_books_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        # Фильтры списка по статусу и жанру в том же порядке
+        Index("ix_books_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_books_genre_id_created_at_id", "genre_id", "created_at", "id"),
+        CheckConstraint(STATUS_CHECK, name="ck_books_status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False)
+    # Название жанра хранится рядом с genre_id: по нему работают FTS, выгрузка и ответы API
     genre = Column(String, nullable=True)
+    genre_id = Column(Integer, ForeignKey("genres.id", ondelete="SET NULL"), nullable=True)
     status = Column(String, nullable=True)
     author = Column(String, nullable=True)
     image_url = Column(String, nullable=True)
+    # Миниатюры и WebP-варианты обложки: [{url, width, height, format}, ...]
+    image_variants = Column(JSON, nullable=True)
+    # Владелец; NULL - общий каталог, доступный без аутентификации. Книги удалённого
+    # пользователя удаляются вместе с ним, а не переходят в общий каталог
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
     created_at = Column(
-        DateTime(timezone=True),
+        CreatedAtType,
         server_default=func.now(),
         nullable=False
     )
+
+
+class LibraryStateModel(Base):
+    """
+    Версия каталога: счётчик изменений книг (одна строка, id = 1).
+
+    Увеличивается в той же транзакции, что и create/update/delete,
+    и служит дешёвым источником ETag / Last-Modified для списков.
+    """
+
+    __tablename__ = "library_state"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(
+        CreatedAtType,
+        server_default=func.now(),
+        nullable=False
+    )
+
+
+# FTS5 индекс для dev-БД, созданных через create_all (в остальных случаях - миграция)
+for _statement in FTS_DDL:
+    event.listen(BookModel.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+# Триграммные индексы для поиска в Postgres
+event.listen(BookModel.__table__, "after_create", DDL(TRGM_DDL).execute_if(dialect="postgresql"))
@@ -0,0 +1,79 @@
+"""Курсорная (keyset) пагинация списка книг."""
+
+import base64
+import binascii
+import datetime
+import json
+from typing import Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Курсор повреждён или сформирован не этим API."""
+
+
+def encode_cursor(created_at: datetime.datetime, book_id: int) -> str:
+    """
+    Закодировать позицию последней книги страницы в непрозрачный токен.
+
+    Args:
+        created_at: Дата создания последней книги на странице.
+        book_id: ID последней книги на странице.
+
+    Returns:
+        str: base64url-токен без паддинга.
+    """
+    payload = json.dumps([created_at.isoformat(), book_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime.datetime, int]:
+    """
+    Раскодировать токен, полученный из `encode_cursor`.
+
+    Args:
+        cursor: Токен из поля `next_cursor` предыдущей страницы.
+
+    Returns:
+        Tuple[datetime.datetime, int]: Пара (created_at, id), после которой начинается страница.
+
+    Raises:
+        InvalidCursorError: Если токен не удаётся разобрать.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, book_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.datetime.fromisoformat(created_at), int(book_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursorError("Некорректный курсор пагинации") from e
+
+
+def encode_rank_cursor(rank: float, book_id: int) -> str:
+    """
+    Закодировать позицию в выдаче полнотекстового поиска.
+
+    Args:
+        rank: Значение bm25 последней книги страницы.
+        book_id: ID последней книги страницы.
+
+    Returns:
+        str: base64url-токен без паддинга.
+    """
+    payload = json.dumps(["rank", rank, book_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Раскодировать токен, полученный из `encode_rank_cursor`.
+
+    Raises:
+        InvalidCursorError: Если токен не удаётся разобрать.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        kind, rank, book_id = json.loads(base64.urlsafe_b64decode(padded))
+        if kind != "rank":
+            raise ValueError(kind)
+        return float(rank), int(book_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursorError("Некорректный курсор пагинации") from e
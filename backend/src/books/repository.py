@@ -1,73 +1,542 @@
 """Book Repository - работа с БД."""
 
-from typing import List, Optional
+import datetime
+import enum
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import Row, and_, delete, func, insert, literal, or_, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.books.models import BookModel
+from src.books import search
+from src.books.models import BookModel, LibraryStateModel
+from src.common.enums import BookStatus
+from src.core.database import dialect_insert
 from src.genres.models import GenreModel
-from src.user.models import UserModel
+from src.images.repository import ImageBlobRepository
+from src.stats.repository import GENRE, STATUS, BookStatsRepository, book_keys, dimension_value
+
+
+def _copy_value(value: Any) -> Any:
+    """Значение для COPY: перечисления передаются строкой."""
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def _stats_fields(book: BookModel) -> Dict[str, Any]:
+    """Поля книги, по которым ведётся статистика."""
+    return {"status": book.status, "genre": book.genre, "created_at": book.created_at}
+
 
 class BookRepository:
-    """Репозиторий для работы с книгами в БД."""
+    """
+    Репозиторий для работы с книгами в БД.
+
+    Все запросы ограничены книгами владельца `owner_id`; без владельца
+    (анонимный доступ) - книгами общего каталога с owner_id IS NULL.
+    """
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, owner_id: Optional[int] = None):
         self.db = db
+        self.owner_id = owner_id
+        self.images = ImageBlobRepository(db)
+        self.stats = BookStatsRepository(db, owner_id)
+        # Добавлялись ли в справочник новые жанры (см. take_genres_added)
+        self._genres_added = False
+
+    def _owned(self):
+        """Условие принадлежности книги текущему владельцу."""
+        if self.owner_id is None:
+            return BookModel.owner_id.is_(None)
+        return BookModel.owner_id == self.owner_id
+
+    @staticmethod
+    def _filter_conditions(genre: Optional[str], status: Optional[BookStatus]) -> List[Any]:
+        """
+        Условия фильтров по жанру и статусу.
+
+        Жанр сравнивается по genre_id: id находится подзапросом по
+        уникальному индексу genres.name, а книги - по индексу
+        ix_books_genre_id_created_at_id, без сравнения строк в books.
+        """
+        conditions = []
+        if genre:
+            genre_id = select(GenreModel.id).where(GenreModel.name == genre).scalar_subquery()
+            conditions.append(BookModel.genre_id == genre_id)
+        if status:
+            conditions.append(BookModel.status == status.value)
+        return conditions
+
+    @classmethod
+    def _filter(cls, stmt, genre: Optional[str], status: Optional[BookStatus]):
+        """Добавить к запросу фильтры по жанру и статусу."""
+        conditions = cls._filter_conditions(genre, status)
+        return stmt.where(*conditions) if conditions else stmt
+
+    def _selection(
+            self,
+            ids: Optional[Sequence[int]],
+            genre: Optional[str],
+            status: Optional[BookStatus],
+    ) -> List[Any]:
+        """Условия выбора книг пакетной операции: книги владельца по списку ID и/или фильтру."""
+        conditions = [self._owned(), *self._filter_conditions(genre, status)]
+        if ids is not None:
+            conditions.append(BookModel.id.in_(ids))
+        return conditions
 
-    async def register(self, user) -> UserModel:
-        """Регистрация."""
+    async def get_page(
+            self,
+            fields: Sequence[str],
+            limit: int,
+            after: Optional[Tuple[datetime.datetime, int]] = None,
+            name: Optional[str] = None,
+            text: Optional[str] = None,
+            genre: Optional[str] = None,
+            status: Optional[BookStatus] = None,
+    ) -> List[Row]:
+        """
+        Получить страницу книг в порядке (created_at, id).
 
-        new_user = UserModel(
-            email=user.email,
-            password=user.password
+        Выбираются только запрошенные колонки; id и created_at нужны
+        для курсора и выбираются всегда. Условие по курсору идёт
+        по индексу ix_books_created_at_id (с фильтрами - по составным
+        индексам со статусом или жанром впереди), поэтому глубина
+        страницы не влияет на время запроса.
+        """
+        column_names = list(dict.fromkeys(["id", "created_at", *fields]))
+        stmt = select(*(getattr(BookModel, column) for column in column_names)).where(self._owned())
+        stmt = self._filter(stmt, genre, status)
+
+        if name:
+            stmt = stmt.where(BookModel.name.ilike(f"%{name}%"))
+
+        if text:
+            pattern = f"%{text}%"
+            stmt = stmt.where(or_(
+                BookModel.name.ilike(pattern),
+                BookModel.author.ilike(pattern),
+                BookModel.genre.ilike(pattern),
+            ))
+
+        if after is not None:
+            created_at, book_id = after
+            stmt = stmt.where(
+                tuple_(BookModel.created_at, BookModel.id)
+                > tuple_(literal(created_at, BookModel.created_at.type), literal(book_id))
+            )
+
+        stmt = stmt.order_by(BookModel.created_at, BookModel.id).limit(limit)
+        result = await self.db.execute(stmt)
+        return list(result.all())
+
+    async def stream_all(self, fields: Sequence[str], batch_size: int) -> AsyncIterator[Sequence[Row]]:
+        """
+        Потоково прочитать все книги пачками по `batch_size` строк.
+
+        Используется серверный курсор (`stream` + `yield_per`), поэтому
+        в памяти одновременно находится не больше одной пачки. В Postgres
+        это курсор asyncpg внутри транзакции, в SQLite - построчное чтение
+        результата без fetchall.
+        """
+        column_names = list(dict.fromkeys(["id", *fields]))
+        stmt = (
+            select(*(getattr(BookModel, column) for column in column_names))
+            .where(self._owned())
+            .order_by(BookModel.id)
+            .execution_options(stream_results=True, yield_per=batch_size)
         )
+        result = await self.db.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
 
-        self.db.add(new_user)
-        await self.db.commit()
+    def supports_full_text_search(self) -> bool:
+        """Доступен ли FTS5 индекс books_fts (только SQLite)."""
+        return self.db.get_bind().dialect.name == "sqlite"
 
-        return {"message": "User Registered"}
+    async def search_page(
+            self,
+            match_query: str,
+            fields: Sequence[str],
+            limit: int,
+            after: Optional[Tuple[float, int]] = None,
+            highlight: bool = False,
+            genre: Optional[str] = None,
+            status: Optional[BookStatus] = None,
+            name: Optional[str] = None,
+    ) -> List[Row]:
+        """
+        Найти книги через FTS5 в порядке релевантности bm25.
 
+        Строки содержат колонку rank (меньше - релевантнее) и,
+        если запрошено, snippet с подсветкой совпадений. `name` -
+        подстрока названия, как в get_page.
+        """
+        column_names = list(dict.fromkeys(["id", *fields]))
+        columns = [getattr(BookModel, column) for column in column_names]
+        columns.append(search.RANK.label("rank"))
+        if highlight:
+            columns.append(search.SNIPPET.label("snippet"))
+
+        ranked = self._filter(
+            select(*columns)
+            .select_from(search.books_fts)
+            .join(BookModel, BookModel.id == search.books_fts.c.rowid)
+            .where(search.match(match_query), self._owned()),
+            genre,
+            status,
+        )
+        if name:
+            ranked = ranked.where(BookModel.name.ilike(f"%{name}%"))
+        ranked = ranked.subquery()
 
-    async def get_all(self, stmt) -> List[BookModel]:
-        """Получить все книги."""
+        stmt = select(ranked)
+        if after is not None:
+            rank, book_id = after
+            stmt = stmt.where(or_(
+                ranked.c.rank > rank,
+                and_(ranked.c.rank == rank, ranked.c.id > book_id),
+            ))
+
+        stmt = stmt.order_by(ranked.c.rank, ranked.c.id).limit(limit)
         result = await self.db.execute(stmt)
-        return list(result.scalars().all())
+        return list(result.all())
 
     async def get_by_id(self, book_id: int) -> Optional[BookModel]:
         """Получить книгу по ID."""
         result = await self.db.execute(
-            select(BookModel).where(BookModel.id == book_id)
+            select(BookModel).where(BookModel.id == book_id, self._owned())
         )
         return result.scalar_one_or_none()
 
+    def _returning(self, kind: str) -> bool:
+        """Поддерживает ли диалект RETURNING для `kind` ("insert", "update", "delete")."""
+        return getattr(self.db.get_bind().dialect, f"{kind}_returning", False)
+
+    async def _genre_ref(self, name: Optional[str]) -> Any:
+        """
+        genre_id для одной книги, без отдельного SELECT.
+
+        Жанр добавляется в справочник INSERT ... ON CONFLICT DO NOTHING,
+        а id подставляется подзапросом в INSERT/UPDATE книги.
+        """
+        if not name:
+            return None
+        await self._insert_genres([name])
+        return select(GenreModel.id).where(GenreModel.name == name).scalar_subquery()
+
+    async def _insert_genres(self, names: List[str]) -> None:
+        """INSERT ... ON CONFLICT DO NOTHING в справочник; rowcount - число действительно новых жанров."""
+        stmt = dialect_insert(self.db)(GenreModel).values([{"name": name} for name in names])
+        result = await self.db.execute(stmt.on_conflict_do_nothing(index_elements=["name"]))
+        if result.rowcount:
+            self._genres_added = True
+
+    def take_genres_added(self) -> bool:
+        """
+        Добавлялись ли новые жанры с прошлого вызова (флаг сбрасывается).
+
+        Сервис сбрасывает по нему кэш справочника жанров: запись книги
+        с уже известным жанром справочник не меняет.
+        """
+        added, self._genres_added = self._genres_added, False
+        return added
+
     async def create(self, book_data: dict) -> BookModel:
-        """Создать новую книгу."""
-        book = BookModel(**book_data)
-        self.db.add(book)
+        """
+        Создать новую книгу.
+
+        Строка вставляется одним INSERT ... RETURNING: id и created_at
+        приходят из него, без refresh после коммита.
+        """
+        # Явный NULL в Core INSERT перекрыл бы server_default (created_at)
+        columns = BookModel.__table__.c
+        values = {
+            key: value for key, value in book_data.items()
+            if value is not None or columns[key].server_default is None
+        }
+        values.update(owner_id=self.owner_id, genre_id=await self._genre_ref(book_data.get("genre")))
+        if self._returning("insert"):
+            book = (await self.db.scalars(insert(BookModel).values(**values).returning(BookModel))).one()
+        else:
+            book = BookModel(**values)
+            self.db.add(book)
+            await self.db.flush()
+            await self.db.refresh(book)
+
+        await self.images.acquire(book.image_url)
+        await self.stats.add([_stats_fields(book)])
+        await self._bump_version()
         await self.db.commit()
-        await self.db.refresh(book)
         return book
 
     async def update(self, book_updated_data: dict, book_id: int) -> Optional[BookModel]:
-        """Обновить книгу."""
+        """
+        Обновить книгу одним UPDATE ... RETURNING.
+
+        Книга не читается заранее: отсутствие книги (или чужая книга)
+        определяется по пустому RETURNING. Старые статус и жанр для
+        book_stats нужны, только если они меняются, - тогда перед UPDATE
+        выполняется тот же агрегирующий запрос, что и у пакетного изменения.
+
+        Returns:
+            Optional[BookModel]: Обновлённая книга или None, если не найдена.
+        """
+        if not self._returning("update"):
+            return await self._update_loaded(book_updated_data, book_id)
+
+        conditions = [BookModel.id == book_id, self._owned()]
+        values = dict(book_updated_data)
+        if "genre" in values:
+            values["genre_id"] = await self._genre_ref(values["genre"])
+        if "status" in values or "genre" in values:
+            await self._shift_stats(conditions, values)
+
+        result = await self.db.scalars(
+            update(BookModel)
+            .where(*conditions)
+            .values(**values)
+            .returning(BookModel)
+            .execution_options(synchronize_session=False)
+        )
+        book = result.one_or_none()
+        if book is None:
+            await self.db.rollback()
+            return None
+
+        await self._bump_version()
+        await self.db.commit()
+        return book
+
+    async def _update_loaded(self, book_updated_data: dict, book_id: int) -> Optional[BookModel]:
+        """Обновить книгу через ORM (диалекты без UPDATE ... RETURNING)."""
         book = await self.get_by_id(book_id)
 
         if not book:
             return None
 
+        before = book_keys(_stats_fields(book))
         for field, value in book_updated_data.items():
             setattr(book, field, value)
+        if "genre" in book_updated_data:
+            genre_ids = await self.upsert_genres([book.genre] if book.genre else [])
+            book.genre_id = genre_ids.get(book.genre)
 
+        delta = Counter(book_keys(_stats_fields(book)))
+        delta.subtract(before)
+        await self.stats.apply(delta)
+        await self._bump_version()
         await self.db.commit()
-        await self.db.refresh(book)
 
         return book
 
-    async def delete(self, book: BookModel) -> None:
-        """Удалить книгу."""
-        await self.db.delete(book)
+    async def set_image_variants(self, book_id: int, image_url: str, variants: List[Dict[str, Any]]) -> bool:
+        """
+        Записать миниатюры обложки (из фоновой задачи).
+
+        Книга обновляется, только если её обложка всё ещё `image_url`:
+        пока генерировались миниатюры, её могли сменить или удалить.
+
+        Returns:
+            bool: Обновлена ли книга.
+        """
+        result = await self.db.execute(
+            update(BookModel)
+            .where(BookModel.id == book_id, BookModel.image_url == image_url, self._owned())
+            .values(image_variants=variants)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            await self._bump_version()
+        await self.db.commit()
+        return bool(result.rowcount)
+
+    async def delete(self, book_id: int) -> Optional[List[Optional[str]]]:
+        """
+        Удалить книгу одним DELETE ... RETURNING, без предварительного SELECT.
+
+        Returns:
+            Optional[List[Optional[str]]]: image_url удалённой книги
+            (для удаления файла) или None, если книга не найдена.
+        """
+        return await self.batch_delete(ids=[book_id]) or None
+
+    async def batch_update(
+            self,
+            patch: Dict[str, Any],
+            ids: Optional[Sequence[int]] = None,
+            genre: Optional[str] = None,
+            status: Optional[BookStatus] = None,
+    ) -> int:
+        """
+        Изменить выбранные книги одним UPDATE ... WHERE.
+
+        Если меняются статус или жанр, счётчики book_stats поправляются
+        по одному агрегирующему запросу к выбранным книгам (до UPDATE,
+        в той же транзакции) - без чтения самих строк.
+
+        Returns:
+            int: Число изменённых книг.
+        """
+        conditions = self._selection(ids, genre, status)
+        values = dict(patch)
+        if "genre" in values:
+            genre_ids = await self.upsert_genres([values["genre"]] if values["genre"] else [])
+            values["genre_id"] = genre_ids.get(values["genre"])
+
+        if "status" in values or "genre" in values:
+            await self._shift_stats(conditions, values)
+
+        result = await self.db.execute(
+            update(BookModel)
+            .where(*conditions)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            await self._bump_version()
+        await self.db.commit()
+        return result.rowcount
+
+    async def _shift_stats(self, conditions: List[Any], values: Dict[str, Any]) -> None:
+        """Перенести книги в book_stats со старых статуса/жанра на новые."""
+        # FOR UPDATE направляет запрос в writer и в Postgres блокирует строки до UPDATE
+        result = await self.db.execute(
+            select(BookModel.status, BookModel.genre, func.count())
+            .where(*conditions)
+            .group_by(BookModel.status, BookModel.genre)
+            .with_for_update()
+        )
+        delta: Counter = Counter()
+        for old_status, old_genre, count in result:
+            for dimension, old, field in ((STATUS, old_status, "status"), (GENRE, old_genre, "genre")):
+                new = values.get(field, old)
+                delta[dimension, dimension_value(old)] -= count
+                delta[dimension, dimension_value(new)] += count
+        await self.stats.apply(delta)
+
+    async def batch_delete(
+            self,
+            ids: Optional[Sequence[int]] = None,
+            genre: Optional[str] = None,
+            status: Optional[BookStatus] = None,
+    ) -> List[Optional[str]]:
+        """
+        Удалить выбранные книги одним DELETE ... RETURNING.
+
+        По возвращённым строкам в той же транзакции уменьшаются счётчики
+        ссылок на обложки и book_stats.
+
+        Returns:
+            List[Optional[str]]: image_url удалённых книг (по одному на книгу).
+        """
+        conditions = self._selection(ids, genre, status)
+        columns = (BookModel.image_url, BookModel.status, BookModel.genre, BookModel.created_at)
+        stmt = delete(BookModel).where(*conditions).execution_options(synchronize_session=False)
+        if self._returning("delete"):
+            rows = (await self.db.execute(stmt.returning(*columns))).all()
+        else:
+            rows = (await self.db.execute(select(*columns).where(*conditions).with_for_update())).all()
+            await self.db.execute(stmt)
+        if rows:
+            await self.images.release_many(row.image_url for row in rows)
+            await self.stats.add([row._asdict() for row in rows], sign=-1)
+            await self._bump_version()
         await self.db.commit()
+        return [row.image_url for row in rows]
+
+    async def bulk_create(self, books: List[Dict[str, Any]]) -> None:
+        """
+        Вставить пачку книг одним executemany (в Postgres - COPY), без коммита.
+
+        Коммит выполняет вызывающий код, чтобы весь импорт шёл
+        в одной транзакции.
+        """
+        if not books:
+            return
+
+        genre_ids = await self.upsert_genres(book["genre"] for book in books if book.get("genre"))
+        books = [
+            {**book, "genre_id": genre_ids.get(book.get("genre")), "owner_id": self.owner_id}
+            for book in books
+        ]
+        # Версия обновляется первой: так транзакция уже открыта и COPY попадает в неё
+        await self._bump_version()
+        await self.stats.add(books)
+        if self.db.get_bind().dialect.name == "postgresql":
+            await self._copy_books(books)
+        else:
+            await self.db.execute(insert(BookModel), books)
+
+    async def _copy_books(self, books: List[Dict[str, Any]]) -> None:
+        """Загрузить пачку книг через COPY FROM STDIN (asyncpg) в транзакции сессии."""
+        columns = list(books[0])
+        # asyncpg кодирует значения по типам колонок и не знает про Enum
+        records = [
+            tuple(_copy_value(book[column]) for column in columns)
+            for book in books
+        ]
+        connection = await self.db.connection(bind_arguments={"clause": insert(BookModel)})
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            BookModel.__tablename__,
+            records=records,
+            columns=columns,
+        )
+
+    async def upsert_genres(self, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Добавить отсутствующие жанры одним INSERT ... ON CONFLICT DO NOTHING, без коммита.
+
+        Returns:
+            Dict[str, int]: ID жанров по названию (для genre_id книг).
+        """
+        unique_names = sorted(set(names))
+        if not unique_names:
+            return {}
+
+        await self._insert_genres(unique_names)
+        result = await self.db.execute(
+            select(GenreModel.name, GenreModel.id).where(GenreModel.name.in_(unique_names))
+        )
+        return dict(result.all())
+
+    async def get_version(self) -> Tuple[int, int, Optional[datetime.datetime]]:
+        """
+        Версия каталога одним запросом по первичным ключам.
+
+        Returns:
+            Tuple[int, int, Optional[datetime.datetime]]: (max(id) книг, счётчик изменений, время изменения).
+        """
+        max_id = select(func.coalesce(func.max(BookModel.id), 0)).scalar_subquery()
+        result = await self.db.execute(
+            select(max_id, LibraryStateModel.version, LibraryStateModel.updated_at)
+            .where(LibraryStateModel.id == 1)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return await self.db.scalar(select(max_id)), 0, None
+        return row[0], row[1], row[2]
+
+    async def _bump_version(self) -> None:
+        """Увеличить счётчик изменений каталога (без коммита)."""
+        stmt = dialect_insert(self.db)(LibraryStateModel).values(id=1, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LibraryStateModel.id],
+            set_={"version": LibraryStateModel.version + 1, "updated_at": func.now()},
+        )
+        await self.db.execute(stmt)
+
+    async def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Статистика книг владельца из агрегатов book_stats."""
+        return await self.stats.get()
+
+    async def commit(self) -> None:
+        """Зафиксировать транзакцию."""
+        await self.db.commit()
+
+    async def rollback(self) -> None:
+        """Откатить транзакцию."""
+        await self.db.rollback()
 
     async def get_all_genres(self) -> List[str]:
         """Получить все жанры из БД."""
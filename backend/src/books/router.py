@@ -3,40 +3,57 @@
 import logging
 from typing import List, Optional
 
-from fastapi import APIRouter, Query, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Query,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.database import get_db
 from src.books.repository import BookRepository
-from src.books.schemas import BookCreate, BookPublic, BookStatusPublic, BookUpdate
-from src.user.schemas import UserCreate
+from src.books.schemas import (
+    BookBatchDelete,
+    BookBatchResult,
+    BookBatchUpdate,
+    BookCreate,
+    BookImportResult,
+    BookPage,
+    BookPublic,
+    BookStats,
+    BookStatusPublic,
+    BookUpdate,
+)
 from src.books.service import BookService
+from src.books.export import MEDIA_TYPES, stream_export
+from src.common.enums import BookStatus, CatalogFormat
+from src.common.utils.http import cache_headers, etag_matches
 from src.common.utils.image import save_image
+from src.jobs import enqueue
+from src.jobs.tasks import REMOVE_RELEASED, THUMBNAILS
+from src.user.dependencies import get_optional_user_id
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def get_book_service(db: AsyncSession = Depends(get_db)) -> BookService:
-    """Dependency для получения BookService."""
-    repository = BookRepository(db)
+def get_book_service(
+        db: AsyncSession = Depends(get_db),
+        user_id: Optional[int] = Depends(get_optional_user_id),
+) -> BookService:
+    """Dependency для получения BookService в области книг текущего пользователя."""
+    repository = BookRepository(db, owner_id=user_id)
     return BookService(repository)
 
 
-@router.post("/register")
-async def register(
-        user: UserCreate,
-        service: BookService = Depends(get_book_service)
-):
-    try:
-        return await service.user_register(user)
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-
-
 @router.get("/statuses", response_model=List[BookStatusPublic])
 async def get_book_statuses():
     """
@@ -45,7 +62,7 @@ async def get_book_statuses():
     Returns:
         List[BookStatusPublic]: Список статусов с их метками.
     """
-    return BookService.get_book_statuses()
+    return Response(content=BookService.get_book_statuses_json(), media_type="application/json")
 
 
 @router.get("/genres", response_model=List[str])
@@ -56,22 +73,175 @@ async def get_genres(service: BookService = Depends(get_book_service)):
     Returns:
         List[str]: Список жанров.
     """
-    return await service.get_genres()
+    return Response(content=await service.get_genres_json(), media_type="application/json")
+
+
+@router.get("/stats", response_model=BookStats)
+async def get_stats(
+        request: Request,
+        response: Response,
+        service: BookService = Depends(get_book_service)
+):
+    """
+    Статистика книг текущего пользователя: по статусам, жанрам и месяцам добавления.
+
+    Поддерживает If-None-Match / 304.
+
+    Returns:
+        BookStats: Счётчики книг.
+    """
+    etag, last_modified = await service.get_cache_validators("stats")
+    headers = cache_headers(etag, last_modified)
+    if etag_matches(request.headers, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return await service.get_stats()
+
+
+@router.get("/export")
+async def export_books(
+        export_format: CatalogFormat = Query(CatalogFormat.NDJSON, alias="format"),
+        gzip: bool = Query(False, description="Сжать выгрузку в gzip на лету"),
+        user_id: Optional[int] = Depends(get_optional_user_id),
+):
+    """
+    Выгрузить весь каталог потоком в NDJSON или CSV.
+
+    Строки читаются из БД пачками и сразу отправляются клиенту,
+    поэтому потребление памяти не зависит от размера таблицы.
+
+    Returns:
+        StreamingResponse: Файл выгрузки.
+    """
+    filename = f"books.{export_format.value}"
+    media_type = MEDIA_TYPES[export_format]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        stream_export(export_format, compress=gzip, owner_id=user_id),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/import", response_model=BookImportResult)
+async def import_books(
+        file: UploadFile = File(...),
+        import_format: Optional[CatalogFormat] = Query(None, alias="format"),
+        service: BookService = Depends(get_book_service)
+):
+    """
+    Массово импортировать книги из NDJSON или CSV.
+
+    Формат берётся из параметра `format` или из расширения файла.
+    Некорректные строки не прерывают импорт, а попадают в отчёт.
+
+    Returns:
+        BookImportResult: Количество принятых/отклонённых строк и причины отказа.
+    """
+    try:
+        return await service.import_books(file, import_format)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.post("/batch/update", response_model=BookBatchResult)
+async def batch_update_books(
+        batch: BookBatchUpdate,
+        service: BookService = Depends(get_book_service)
+):
+    """
+    Изменить книги по списку ID и/или фильтру одним запросом UPDATE.
+
+    Патч выставляет всем выбранным книгам одинаковые значения полей
+    (жанр, автор, статус).
+
+    Returns:
+        BookBatchResult: Число изменённых книг.
+    """
+    try:
+        return BookBatchResult(affected=await service.batch_update_books(batch))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.post("/batch/delete", response_model=BookBatchResult)
+async def batch_delete_books(
+        batch: BookBatchDelete,
+        service: BookService = Depends(get_book_service)
+):
+    """
+    Удалить книги по списку ID и/или фильтру одним запросом DELETE ... RETURNING.
+
+    Файлы обложек, на которые больше никто не ссылается, удаляет
+    фоновая задача, поставленная после коммита.
+
+    Returns:
+        BookBatchResult: Число удалённых книг.
+    """
+    try:
+        image_urls = await service.batch_delete_books(batch)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    if any(image_urls):
+        await enqueue(REMOVE_RELEASED, urls=[url for url in image_urls if url])
+    return BookBatchResult(affected=len(image_urls))
 
 
-@router.get("", response_model=List[BookPublic])
+@router.get("", response_model=BookPage, response_model_exclude_unset=True)
 async def get_books(
         name: Optional[str] = Query(None, min_length=1),
+        cursor: Optional[str] = Query(None, description="Токен next_cursor предыдущей страницы"),
+        limit: Optional[int] = Query(None, ge=1, description="Размер страницы"),
+        fields: Optional[str] = Query(None, description="Поля через запятую, например name,author"),
+        q: Optional[str] = Query(None, min_length=1, description="Поиск по названию, автору и жанру"),
+        highlight: bool = Query(False, description="Вернуть snippet с подсветкой совпадений"),
+        genre: Optional[str] = Query(None, min_length=1, description="Точное название жанра"),
+        book_status: Optional[BookStatus] = Query(None, alias="status", description="Статус чтения"),
+        *,
+        request: Request,
         service: BookService = Depends(get_book_service)
 ):
     """
-    Получить список всех книг.
+    Получить страницу книг в порядке добавления.
+
+    С параметром `q` выполняется полнотекстовый поиск (FTS5, префиксное
+    совпадение, сортировка по bm25). На других СУБД - поиск через ILIKE.
+    Фильтры `genre` и `status` идут по составным индексам с created_at.
+
+    Поддерживает условные запросы: при совпадении If-None-Match
+    возвращается 304 без выполнения основного запроса. Тело собирается
+    сразу в JSON, минуя валидацию response_model (он описывает схему).
     
     Returns:
-        List[BookPublic]: Список книг.
+        BookPage: Книги страницы и курсор на следующую.
     """
     try:
-        return await service.get_all_books(name)
+        etag, last_modified = await service.get_cache_validators(f"list?{request.url.query}")
+        headers = cache_headers(etag, last_modified)
+        if etag_matches(request.headers, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        body = await service.get_all_books_json(name, cursor, limit, fields, q, highlight, genre, book_status)
+        return Response(content=body, media_type="application/json", headers=headers)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error in get_books: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -80,6 +250,36 @@ async def get_books(
         )
 
 
+@router.get("/{book_id}", response_model=BookPublic)
+async def get_book(
+        book_id: int,
+        request: Request,
+        response: Response,
+        service: BookService = Depends(get_book_service)
+):
+    """
+    Получить книгу по ID. Поддерживает If-None-Match / 304.
+
+    Raises:
+        HTTPException: Если книга не найдена.
+    """
+    etag, last_modified = await service.get_cache_validators(f"book/{book_id}")
+    headers = cache_headers(etag, last_modified)
+    if etag_matches(request.headers, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    try:
+        book = await service.get_book(book_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+    response.headers.update(headers)
+    return book
+
+
 @router.put("/{book_id}", response_model=BookPublic)
 async def update_book(
         book_update: BookUpdate,
@@ -102,10 +302,14 @@ async def create_book(
         author: Optional[str] = Form(None),
         book_status: Optional[str] = Form(None),
         image: Optional[UploadFile] = File(None),
+        user_id: Optional[int] = Depends(get_optional_user_id),
         service: BookService = Depends(get_book_service)
 ):
     """
     Создать новую книгу.
+
+    Оригинал обложки сохраняется в запросе, а миниатюры генерирует
+    фоновая задача после коммита: до её завершения image_variants пуст.
     
     Args:
         name: Название книги.
@@ -128,7 +332,10 @@ async def create_book(
             )
 
     book_data = BookCreate(name=name, genre=genre, author=author, status=book_status, image_url=image_url)
-    return await service.create_book(book_data, image_url)
+    book = await service.create_book(book_data, image_url)
+    if image_url:
+        await enqueue(THUMBNAILS, book_id=book.id, image_url=image_url, owner_id=user_id)
+    return book
 
 
 @router.delete("/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -138,6 +345,9 @@ async def delete_book(
 ):
     """
     Удалить книгу по ID.
+
+    Файл обложки, на который больше никто не ссылается, удаляет
+    фоновая задача, поставленная после коммита.
     
     Args:
         book_id: ID книги для удаления.
@@ -146,9 +356,12 @@ async def delete_book(
         HTTPException: Если книга не найдена.
     """
     try:
-        await service.delete_book(book_id)
+        image_urls = await service.delete_book(book_id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+
+    if any(image_urls):
+        await enqueue(REMOVE_RELEASED, urls=[url for url in image_urls if url])
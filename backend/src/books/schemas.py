@@ -1,10 +1,20 @@
 """Book Pydantic schemas."""
 
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, ConfigDict, Field
 import datetime
 
 from src.common.enums import BookStatus
+from src.core.config import settings
+
+
+class ImageVariant(BaseModel):
+    """Вариант обложки определённого размера и формата."""
+
+    url: str
+    width: int
+    height: int
+    format: str
 
 
 class BookBase(BaseModel):
@@ -21,7 +31,7 @@ class BookUpdate(BaseModel):
     name: Optional[str] = Field(None, example="1984")
     genre: Optional[str] = Field(None, example="Антиутопия")
     author: Optional[str] = Field(None, example="Джордж Оруэлл")
-    status: Optional[str] = Field(None, example="reading")
+    status: Optional[BookStatus] = Field(None, example="reading")
 
 class BookCreate(BookBase):
     """Схема для создания книги. Жанр может быть любым строковым значением."""
@@ -33,10 +43,104 @@ class BookPublic(BookBase):
     """Схема книги для публичного API."""
 
     id: int
+    image_variants: Optional[List[ImageVariant]] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class BookListItem(BaseModel):
+    """
+    Книга в списке. Все поля, кроме id, опциональны: при проекции
+    через `fields=` в ответ попадают только запрошенные колонки.
+    """
+
+    id: int
+    name: Optional[str] = None
+    genre: Optional[str] = None
+    author: Optional[str] = None
+    status: Optional[BookStatus] = None
+    image_url: Optional[str] = None
+    image_variants: Optional[List[ImageVariant]] = None
+    created_at: Optional[datetime.datetime] = None
+    snippet: Optional[str] = None
+
+
+# Колонки, доступные для проекции через `fields=`
+BOOK_LIST_FIELDS = ("name", "genre", "author", "status", "image_url", "image_variants", "created_at")
+
+
+class BookPage(BaseModel):
+    """Страница списка книг с курсором на следующую страницу."""
+
+    items: List[BookListItem]
+    next_cursor: Optional[str] = None
+
+
+class BookImportError(BaseModel):
+    """Отклонённая при импорте строка."""
+
+    line: int
+    reason: str
+
+
+class BookImportResult(BaseModel):
+    """Итог массового импорта."""
+
+    accepted: int
+    rejected: int
+    errors: List[BookImportError]
+
+
+class BookBatchFilter(BaseModel):
+    """Выбор книг пакетной операции по фильтру (как у списка книг)."""
+
+    genre: Optional[str] = Field(None, min_length=1)
+    status: Optional[BookStatus] = None
+
+
+class BookBatchPatch(BaseModel):
+    """Поля, которые пакетное изменение выставляет всем выбранным книгам."""
+
+    genre: Optional[str] = Field(None, example="Антиутопия")
+    author: Optional[str] = Field(None, example="Джордж Оруэлл")
+    status: Optional[BookStatus] = Field(None, example="finished")
+
+
+class BookBatchDelete(BaseModel):
+    """
+    Выбор книг для пакетной операции: список ID и/или фильтр.
+
+    Если заданы оба, операция затрагивает книги из списка,
+    подходящие под фильтр.
+    """
+
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=settings.books_batch_max_ids)
+    filter: Optional[BookBatchFilter] = None
+
+
+class BookBatchUpdate(BookBatchDelete):
+    """Пакетное изменение книг."""
+
+    patch: BookBatchPatch
+
+
+class BookBatchResult(BaseModel):
+    """Итог пакетной операции."""
+
+    affected: int
+
+
+class BookStats(BaseModel):
+    """Статистика книг пользователя."""
+
+    total: int
+    # Книги без статуса или жанра в разбивку не попадают
+    by_status: Dict[str, int]
+    by_genre: Dict[str, int]
+    # Месяц добавления (YYYY-MM, UTC) -> число книг
+    by_month: Dict[str, int]
+
+
 class BookStatusPublic(BaseModel):
     """Схема статуса книги для публичного API."""
 
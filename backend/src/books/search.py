@@ -0,0 +1,91 @@
+"""Полнотекстовый поиск книг (SQLite FTS5, Postgres pg_trgm)."""
+
+import re
+from typing import List, Optional
+
+from sqlalchemy import column, func, literal_column, table
+
+# external content таблица: сам текст хранится в books, FTS5 держит только индекс.
+# prefix='2 3' строит префиксные индексы для быстрого поиска "по мере ввода".
+FTS_DDL: List[str] = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+        name, author, genre,
+        content='books', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts(rowid, name, author, genre)
+        VALUES (new.id, new.name, new.author, new.genre);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, name, author, genre)
+        VALUES ('delete', old.id, old.name, old.author, old.genre);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE OF name, author, genre ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, name, author, genre)
+        VALUES ('delete', old.id, old.name, old.author, old.genre);
+        INSERT INTO books_fts(rowid, name, author, genre)
+        VALUES (new.id, new.name, new.author, new.genre);
+    END
+    """,
+]
+
+# Пересобрать индекс из содержимого books
+FTS_REBUILD = "INSERT INTO books_fts(books_fts) VALUES ('rebuild')"
+
+# Postgres: триграммные GIN-индексы ускоряют ILIKE '%...%' по name/author/genre.
+# Если расширение pg_trgm недоступно на сервере, индексы не создаются и
+# поиск остаётся последовательным сканированием.
+TRGM_DDL = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS ix_books_name_trgm ON books USING gin (name gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS ix_books_author_trgm ON books USING gin (author gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS ix_books_genre_trgm ON books USING gin (genre gin_trgm_ops);
+    ELSE
+        RAISE NOTICE 'pg_trgm is not available, trigram indexes on books are skipped';
+    END IF;
+END
+$$
+"""
+
+books_fts = table("books_fts", column("rowid"))
+_fts = literal_column("books_fts")
+
+# Веса колонок для bm25: совпадение в названии важнее автора и жанра
+RANK = func.bm25(_fts, 10.0, 5.0, 1.0)
+SNIPPET = func.snippet(_fts, -1, "<mark>", "</mark>", "…", 12)
+
+
+def match(query: str):
+    """Условие `books_fts MATCH :query`."""
+    return _fts.op("MATCH")(query)
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """
+    Преобразовать пользовательский ввод в запрос FTS5.
+
+    Каждое слово становится префиксным термом в кавычках, поэтому
+    спецсимволы синтаксиса FTS5 во вводе не интерпретируются.
+
+    Args:
+        text: Строка из поисковой строки.
+
+    Returns:
+        Optional[str]: Запрос для MATCH или None, если во вводе нет слов.
+    """
+    tokens = re.findall(r"\w+", text)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
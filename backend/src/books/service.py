@@ -1,15 +1,53 @@
 """Book Service - бизнес-логика работы с книгами."""
 
-from typing import List, Optional
+import datetime
+import json
+from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import select
+from fastapi import UploadFile
+from pydantic import TypeAdapter, ValidationError
 from src.books.models import BookModel
-from src.user.models import UserModel
 from src.books.repository import BookRepository
-from src.books.schemas import BookCreate, BookStatusPublic, BookUpdate
-from src.user.schemas import UserCreate
-from src.common.enums import BookStatus
-from fastapi import Depends
+from src.books.pagination import decode_cursor, decode_rank_cursor, encode_cursor, encode_rank_cursor
+from src.books.schemas import (
+    BOOK_LIST_FIELDS,
+    BookBatchDelete,
+    BookBatchUpdate,
+    BookCreate,
+    BookImportError,
+    BookImportResult,
+    BookStats,
+    BookStatusPublic,
+    BookUpdate,
+)
+from src.books.importer import detect_format, iter_records
+from src.books.search import build_match_query
+from src.common.cache import TTLCache
+from src.common.enums import BookStatus, CatalogFormat
+from src.common.utils.http import weak_etag
+from src.common.utils.serialization import dumps
+from src.stats.repository import GENRE, MONTH, STATUS
+from src.core.config import settings
+
+# Справочники меняются редко: держим их и готовый JSON в памяти процесса.
+# Значение - пара (данные, сериализованный JSON).
+reference_cache: TTLCache[Tuple[Any, bytes]] = TTLCache(
+    "books.reference",
+    maxsize=settings.reference_cache_max_entries,
+    ttl=settings.reference_cache_ttl_seconds,
+)
+
+GENRES_CACHE_KEY = "genres"
+STATUSES_CACHE_KEY = "statuses"
+
+STATUS_LABELS = {
+    BookStatus.WANT_TO_READ: "Хочу прочитать",
+    BookStatus.READING: "Читаю",
+    BookStatus.FINISHED: "Прочитал",
+    BookStatus.DROPPED: "Бросил",
+}
+
+_statuses_adapter = TypeAdapter(List[BookStatusPublic])
 
 
 class BookService:
@@ -18,81 +56,356 @@ class BookService:
     def __init__(self, repository: BookRepository):
         self.repository = repository
 
-    async def user_register(self, user: UserCreate):
-        """Регистрация."""
+    async def get_all_books_json(
+            self,
+            name: Optional[str] = None,
+            cursor: Optional[str] = None,
+            limit: Optional[int] = None,
+            fields: Optional[str] = None,
+            q: Optional[str] = None,
+            highlight: bool = False,
+            genre: Optional[str] = None,
+            status: Optional[BookStatus] = None,
+    ) -> bytes:
+        """
+        Получить страницу книг с опциональным поиском в виде готового JSON.
 
-        existing_user = self.get_user_by_email(user)
+        Ответ собирается из строк результата без валидации в BookListItem
+        и кодируется сразу в байты (форма ответа - BookPage).
 
-        if existing_user:
-            raise ValueError(f"Пользователь с email {user.email} уже зарегистрирован")
+        Args:
+            name: Подстрока названия для поиска.
+            cursor: Токен `next_cursor` предыдущей страницы.
+            limit: Размер страницы (ограничивается `books_max_page_size`).
+            fields: Список полей через запятую для проекции.
+            q: Полнотекстовый запрос по названию, автору и жанру.
+            highlight: Добавить к результатам поиска snippet с подсветкой.
+            genre: Точное название жанра.
+            status: Статус чтения.
 
-        return await self.repository.register(user)
+        Returns:
+            bytes: JSON страницы `{items, next_cursor}`.
 
-    async def get_user_by_email(self, email: str):
-        """Поиск пользователя по email."""
+        Raises:
+            ValueError: Если курсор или список полей некорректны.
+        """
+        page_size = min(limit or settings.books_page_size, settings.books_max_page_size)
+        selected = self._parse_fields(fields)
 
-        result = self.db.execute(
-            select(UserModel).where(UserModel.email == email)
-        )
+        if q and self.repository.supports_full_text_search():
+            match_query = build_match_query(q)
+            if match_query:
+                return await self._search_books(
+                    match_query, selected, page_size, cursor, highlight, genre, status, name
+                )
+
+        after = decode_cursor(cursor) if cursor else None
 
-        return result.scalar_one_or_none()
+        # Берём на одну строку больше, чтобы понять, есть ли следующая страница
+        rows = await self.repository.get_page(selected, page_size + 1, after, name, text=q, genre=genre, status=status)
 
-    async def get_all_books(self, name: Optional[str] = None) -> List[BookModel]:
-        """Получить все книги с опциональным поиском по названию."""
-        stmt = select(BookModel)
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
 
-        if name:
-            stmt = stmt.where(BookModel.name.ilike(f"%{name}%"))
+        items = [
+            {"id": row.id, **{field: getattr(row, field) for field in selected}}
+            for row in rows
+        ]
+        return dumps({"items": items, "next_cursor": next_cursor})
 
-        return await self.repository.get_all(stmt)
+    async def _search_books(
+            self,
+            match_query: str,
+            selected: List[str],
+            page_size: int,
+            cursor: Optional[str],
+            highlight: bool,
+            genre: Optional[str],
+            status: Optional[BookStatus],
+            name: Optional[str],
+    ) -> bytes:
+        """Страница полнотекстового поиска, упорядоченная по релевантности (JSON)."""
+        after = decode_rank_cursor(cursor) if cursor else None
+        rows = await self.repository.search_page(
+            match_query, selected, page_size + 1, after, highlight, genre=genre, status=status, name=name
+        )
 
-    async def create_book(self, book_data: BookCreate, image_url: Optional[str] = None) -> BookModel:
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].id)
+
+        items = []
+        for row in rows:
+            item = {"id": row.id, **{field: getattr(row, field) for field in selected}}
+            if highlight:
+                item["snippet"] = row.snippet
+            items.append(item)
+        return dumps({"items": items, "next_cursor": next_cursor})
+
+    async def create_book(
+            self,
+            book_data: BookCreate,
+            image_url: Optional[str] = None,
+            image_variants: Optional[List[Dict[str, Any]]] = None,
+    ) -> BookModel:
         """Создать новую книгу."""
         data = book_data.model_dump()
         if image_url:
             data["image_url"] = image_url
-        return await self.repository.create(data)
+            data["image_variants"] = image_variants
+        book = await self.repository.create(data)
+        self._invalidate_genres()
+        return book
 
     async def update_book(self, book_updated_data: BookUpdate, book_id: int) -> Optional[BookModel]:
         """Обновляет книгу."""
         data = book_updated_data.model_dump(exclude_unset=True)
         book = await self.repository.update(data, book_id)
 
+        # Новый жанр мог быть добавлен и в откаченной транзакции - лишний сброс безвреден
+        self._invalidate_genres()
         if not book:
             raise ValueError(f"Book with id {book_id} not found")
-
         return book
 
+    def _invalidate_genres(self) -> None:
+        """Сбросить кэш справочника жанров, если запись добавила в него новые жанры."""
+        if self.repository.take_genres_added():
+            reference_cache.invalidate(GENRES_CACHE_KEY)
+
+    async def delete_book(self, book_id: int) -> List[Optional[str]]:
+        """
+        Удалить книгу по ID.
+
+        Returns:
+            List[Optional[str]]: image_url удалённой книги (для удаления файла).
+
+        Raises:
+            ValueError: Если книга не найдена.
+        """
+        image_urls = await self.repository.delete(book_id)
+        if image_urls is None:
+            raise ValueError(f"Book with id {book_id} not found")
+        return image_urls
+
+    async def batch_update_books(self, request: BookBatchUpdate) -> int:
+        """
+        Изменить выбранные книги одним UPDATE.
+
+        Returns:
+            int: Число изменённых книг.
+
+        Raises:
+            ValueError: Если не заданы ни ID, ни фильтр, или патч пустой.
+        """
+        patch = request.patch.model_dump(exclude_unset=True, mode="json")
+        if not patch:
+            raise ValueError("Patch is empty")
+        ids, genre, book_status = self._batch_selection(request)
+
+        affected = await self.repository.batch_update(patch, ids, genre, book_status)
+        self._invalidate_genres()
+        return affected
+
+    async def batch_delete_books(self, request: BookBatchDelete) -> List[Optional[str]]:
+        """
+        Удалить выбранные книги одним DELETE ... RETURNING.
+
+        Returns:
+            List[Optional[str]]: image_url удалённых книг (для удаления файлов).
+
+        Raises:
+            ValueError: Если не заданы ни ID, ни фильтр.
+        """
+        return await self.repository.batch_delete(*self._batch_selection(request))
+
+    @staticmethod
+    def _batch_selection(
+            request: BookBatchDelete,
+    ) -> Tuple[Optional[List[int]], Optional[str], Optional[BookStatus]]:
+        """ID и фильтры пакетной операции; без них операция затронула бы все книги."""
+        batch_filter = request.filter
+        genre = batch_filter.genre if batch_filter else None
+        book_status = batch_filter.status if batch_filter else None
+        if request.ids is None and not genre and book_status is None:
+            raise ValueError("Either ids or a non-empty filter is required")
+        return request.ids, genre, book_status
+
+    async def import_books(
+            self,
+            file: UploadFile,
+            import_format: Optional[CatalogFormat] = None,
+    ) -> BookImportResult:
+        """
+        Массово импортировать книги из NDJSON/CSV.
+
+        Файл разбирается потоково, строки валидируются по `BookCreate`
+        и вставляются пачками по `import_batch_size` одним executemany.
+        Жанры добавляются в справочник в том же проходе. Весь импорт -
+        одна транзакция.
+
+        Raises:
+            ValueError: Если формат файла не удалось определить.
+        """
+        import_format = detect_format(file, import_format)
+        imported_at = datetime.datetime.now(datetime.timezone.utc)
+        accepted = 0
+        errors: List[BookImportError] = []
+        rejected = 0
+        batch: List[Dict[str, Any]] = []
+
+        def reject(line: int, reason: str) -> None:
+            nonlocal rejected
+            rejected += 1
+            if len(errors) < settings.import_max_reported_errors:
+                errors.append(BookImportError(line=line, reason=reason))
+
+        try:
+            async for line, record in iter_records(file, import_format):
+                if isinstance(record, str):
+                    reject(line, record)
+                    continue
 
-    async def delete_book(self, book_id: int) -> None:
-        """Удалить книгу по ID."""
+                try:
+                    book = BookCreate.model_validate(record)
+                except ValidationError as e:
+                    reject(line, self._format_validation_error(e))
+                    continue
+
+                # Обложки загружаются отдельно, ссылки из чужих систем не принимаем
+                data = book.model_dump(exclude={"image_url"})
+                if data["created_at"] is None:
+                    data["created_at"] = imported_at
+                batch.append(data)
+
+                if len(batch) >= settings.import_batch_size:
+                    await self._insert_import_batch(batch)
+                    accepted += len(batch)
+                    batch = []
+
+            await self._insert_import_batch(batch)
+            accepted += len(batch)
+            await self.repository.commit()
+        except Exception:
+            await self.repository.rollback()
+            raise
+
+        self._invalidate_genres()
+        return BookImportResult(accepted=accepted, rejected=rejected, errors=errors)
+
+    async def _insert_import_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Вставить пачку импорта (новые жанры добавляются в справочник там же)."""
+        await self.repository.bulk_create(batch)
+
+    @staticmethod
+    def _format_validation_error(error: ValidationError) -> str:
+        """Короткое описание ошибок валидации строки импорта."""
+        return "; ".join(
+            f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+            for item in error.errors()
+        )
+
+    async def get_cache_validators(self, key: str) -> Tuple[str, Optional[datetime.datetime]]:
+        """
+        ETag и Last-Modified для ответа по версии каталога.
+
+        Стоит одного запроса по первичным ключам, поэтому выполняется
+        до основного запроса и позволяет ответить 304 без него.
+
+        Args:
+            key: Что именно отдаётся (маршрут + параметры запроса).
+
+        Returns:
+            Tuple[str, Optional[datetime.datetime]]: Слабый ETag и время последнего изменения.
+        """
+        max_id, version, updated_at = await self.repository.get_version()
+        # Владелец входит в ETag: у разных пользователей разные списки по одному URL
+        return weak_etag(max_id, version, self.repository.owner_id, key), updated_at
+
+    async def get_stats(self) -> BookStats:
+        """
+        Статистика по статусам, жанрам и месяцам добавления.
+
+        Читается из агрегатов, которые поддерживаются при каждом
+        изменении книг, - без сканирования таблицы books.
+        """
+        stats = await self.repository.get_stats()
+        by_month = stats[MONTH]
+        return BookStats(
+            total=sum(by_month.values()),
+            by_status={value: count for value, count in stats[STATUS].items() if value},
+            by_genre={value: count for value, count in stats[GENRE].items() if value},
+            by_month=dict(sorted(by_month.items())),
+        )
+
+    async def get_book(self, book_id: int) -> BookModel:
+        """Получить книгу по ID."""
         book = await self.repository.get_by_id(book_id)
         if book is None:
             raise ValueError(f"Book with id {book_id} not found")
-        await self.repository.delete(book)
+        return book
 
     async def get_genres(self) -> List[str]:
         """Получить список рекомендуемых жанров."""
-        return await self.repository.get_all_genres()
+        genres, _ = await reference_cache.get_or_load(GENRES_CACHE_KEY, self._load_genres)
+        return genres
+
+    async def get_genres_json(self) -> bytes:
+        """Получить список жанров в виде готового JSON."""
+        _, body = await reference_cache.get_or_load(GENRES_CACHE_KEY, self._load_genres)
+        return body
+
+    async def _load_genres(self) -> Tuple[List[str], bytes]:
+        """Загрузить жанры из БД и сериализовать их."""
+        genres = await self.repository.get_all_genres()
+        return genres, json.dumps(genres, ensure_ascii=False).encode()
+
+    @staticmethod
+    def _parse_fields(fields: Optional[str]) -> List[str]:
+        """Разобрать параметр `fields` в список колонок."""
+        if not fields:
+            return list(BOOK_LIST_FIELDS)
+
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = set(selected) - set(BOOK_LIST_FIELDS) - {"id"}
+        if unknown:
+            raise ValueError(
+                f"Неизвестные поля: {', '.join(sorted(unknown))}. Доступны: {', '.join(BOOK_LIST_FIELDS)}"
+            )
+        return [field for field in selected if field != "id"]
 
     @staticmethod
     def get_book_statuses() -> List[BookStatusPublic]:
         """Получить все возможные статусы книг."""
-        return [
-            BookStatusPublic(
-                value=book_status.value,
-                label=BookService._get_status_label(book_status)
-            )
-            for book_status in BookStatus
-        ]
+        statuses, _ = BookService._get_statuses_entry()
+        return statuses
+
+    @staticmethod
+    def get_book_statuses_json() -> bytes:
+        """Получить статусы книг в виде готового JSON."""
+        _, body = BookService._get_statuses_entry()
+        return body
+
+    @staticmethod
+    def _get_statuses_entry() -> Tuple[List[BookStatusPublic], bytes]:
+        """Статусы и их JSON из кэша (собираются при первом обращении)."""
+        entry = reference_cache.get(STATUSES_CACHE_KEY)
+        if entry is None:
+            statuses = [
+                BookStatusPublic(
+                    value=book_status.value,
+                    label=BookService._get_status_label(book_status)
+                )
+                for book_status in BookStatus
+            ]
+            entry = (statuses, _statuses_adapter.dump_json(statuses))
+            reference_cache.set(STATUSES_CACHE_KEY, entry)
+        return entry
 
     @staticmethod
     def _get_status_label(book_status: BookStatus) -> str:
         """Получить русское название статуса."""
-        labels = {
-            BookStatus.WANT_TO_READ: "Хочу прочитать",
-            BookStatus.READING: "Читаю",
-            BookStatus.FINISHED: "Прочитал",
-            BookStatus.DROPPED: "Бросил",
-        }
-        return labels[book_status]
+        return STATUS_LABELS[book_status]
@@ -1,5 +1,5 @@
 """Common module - общие компоненты."""
 
-from src.common.enums import BookStatus
+from src.common.enums import BookStatus, CatalogFormat
 
-__all__ = ["BookStatus"]
+__all__ = ["BookStatus", "CatalogFormat"]
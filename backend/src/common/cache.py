@@ -0,0 +1,135 @@
+"""In-process кэш с TTL и LRU-вытеснением."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    """Счётчики кэша."""
+
+    name: str
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+
+class TTLCache(Generic[V]):
+    """
+    Кэш в памяти процесса.
+
+    Запись живёт `ttl` секунд (None - без срока), при превышении
+    `maxsize` вытесняется давно не использованная. Кэш локален для
+    процесса: при нескольких воркерах каждый держит свою копию, а
+    устаревание между ними ограничено TTL.
+    """
+
+    def __init__(self, name: str, maxsize: int = 128, ttl: Optional[float] = 300.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[Optional[float], V]]" = OrderedDict()
+        self._stats = CacheStats(name=name)
+        self._invalidation_hooks: List[Callable[[Optional[Hashable]], None]] = []
+        self._loading: "Dict[Hashable, asyncio.Future[V]]" = {}
+        _registry[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Получить значение или `default`, если его нет или оно устарело."""
+        entry = self._data.get(key, _MISSING)
+        if entry is not _MISSING:
+            expires_at, value = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                self._stats.hits += 1
+                return value
+            del self._data[key]
+        self._stats.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: V) -> None:
+        """Сохранить значение."""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self._stats.evictions += 1
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> V:
+        """
+        Получить значение, при промахе загрузив его через `loader`.
+
+        Одновременные промахи по одному ключу ждут одну загрузку, а не
+        запускают `loader` каждый. Ошибка загрузки передаётся всем
+        ожидающим и не кэшируется. Если ключ инвалидирован во время
+        загрузки, результат возвращается, но не сохраняется.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            # shield: отмена одного ожидающего не отменяет общую загрузку
+            return await asyncio.shield(pending)
+
+        future: "asyncio.Future[V]" = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Ожидающих может не быть - помечаем исключение полученным
+            future.exception()
+            raise
+        finally:
+            current = self._loading.get(key)
+            if current is future:
+                del self._loading[key]
+        if current is future:
+            self.set(key, value)
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Удалить запись `key` или весь кэш, если ключ не указан."""
+        if key is None:
+            self._data.clear()
+            self._loading.clear()
+        else:
+            self._data.pop(key, None)
+            self._loading.pop(key, None)
+        self._stats.invalidations += 1
+        for hook in self._invalidation_hooks:
+            hook(key)
+
+    def on_invalidate(self, hook: Callable[[Optional[Hashable]], None]) -> None:
+        """Подписаться на инвалидацию (например, чтобы сбросить производные кэши)."""
+        self._invalidation_hooks.append(hook)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Текущие счётчики."""
+        self._stats.size = len(self._data)
+        return self._stats
+
+
+_registry: Dict[str, TTLCache] = {}
+
+
+def get_cache_stats() -> List[CacheStats]:
+    """Счётчики всех созданных кэшей."""
+    return [cache.stats for cache in _registry.values()]
@@ -10,3 +10,10 @@ class BookStatus(str, Enum):
     READING = "reading"
     FINISHED = "finished"
     DROPPED = "dropped"
+
+
+class CatalogFormat(str, Enum):
+    """Форматы выгрузки и загрузки каталога."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
@@ -0,0 +1,161 @@
+"""
+Сбор метрик: HTTP middleware, хуки SQLAlchemy и сборщики метрик подсистем.
+
+Подключается в src.main только при `metrics_enabled`; выключенные
+метрики не добавляют ни middleware, ни обработчиков событий движка.
+"""
+
+import logging
+import time
+from typing import Any, Iterable, List
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.common import metrics
+from src.common.cache import get_cache_stats
+
+logger = logging.getLogger(__name__)
+
+# Длина текста SQL в логе медленных запросов
+SLOW_QUERY_LOG_CHARS = 500
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Полный шаблон маршрута запроса (`/api/v1/book/{book_id}`).
+
+    Новые версии FastAPI кладут в scope["route"] маршрут роутера без
+    префикса include_router (`/{book_id}`), старые - уже с префиксом.
+    Префикс восстанавливается по пути запроса: это часть пути перед
+    самым длинным суффиксом, который совпадает с шаблоном маршрута.
+    Маршруты приложения (документация, /uploads) ищутся в app.router.
+
+    Returns:
+        str: Шаблон или "unmatched", если маршрут не найден (404).
+    """
+    path = scope["path"]
+    route = scope.get("route")
+    regex = getattr(route, "path_regex", None)
+    if regex is not None:
+        for index, char in enumerate(path):
+            if char == "/" and regex.match(path[index:]):
+                return path[:index] + route.path_format
+        if regex.match(""):
+            return path + route.path_format
+        return route.path_format
+
+    router = getattr(scope.get("app"), "router", None)
+    for candidate in getattr(router, "routes", ()):
+        regex = getattr(candidate, "path_regex", None)
+        if regex is not None and regex.match(path):
+            return candidate.path_format
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Латентность запросов по шаблону маршрута (`/api/v1/book/{book_id}`,
+    а не конкретному URL - число серий ограничено) и число запросов в работе.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.http_requests_in_flight.dec()
+            metrics.http_request_duration_seconds.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                route_template(scope),
+                str(status_code),
+            )
+
+
+def instrument_engine(async_engine: AsyncEngine, slow_query_ms: float) -> None:
+    """
+    Замерять каждый SQL-запрос движка и логировать медленные.
+
+    Время начала хранится в `conn.info` стеком: запрос может выполняться
+    внутри другого (например, при загрузке связей).
+    """
+    slow_seconds = slow_query_ms / 1000
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        kind = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        metrics.db_statement_duration_seconds.observe(elapsed, kind)
+        if elapsed >= slow_seconds:
+            metrics.db_slow_statements_total.inc(kind)
+            logger.warning("Slow SQL (%.1f ms): %s", elapsed * 1000, statement[:SLOW_QUERY_LOG_CHARS])
+
+    def handle_error(exception_context) -> None:
+        # after_cursor_execute не вызывается для упавших запросов
+        started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+        if started:
+            started.pop()
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(async_engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(async_engine.sync_engine, "handle_error", handle_error)
+
+
+def collect_cache_metrics() -> Iterable[str]:
+    """Попадания и промахи всех TTLCache процесса."""
+    stats = get_cache_stats()
+    lines: List[str] = []
+    for name, attribute, kind, documentation in (
+            ("cache_hits_total", "hits", "counter", "In-process cache hits."),
+            ("cache_misses_total", "misses", "counter", "In-process cache misses."),
+            ("cache_evictions_total", "evictions", "counter", "In-process cache LRU evictions."),
+            ("cache_entries", "size", "gauge", "In-process cache entries."),
+    ):
+        lines.extend(metrics.sample_lines(
+            name, documentation, kind, (({"cache": item.name}, getattr(item, attribute)) for item in stats)
+        ))
+    return lines
+
+
+def collect_password_hasher_metrics(hasher: Any) -> Iterable[str]:
+    """Очередь и время работы пула хэширования паролей (PasswordHasher.stats)."""
+    stats = hasher.stats
+    lines: List[str] = []
+    lines += metrics.sample_lines(
+        "password_hash_in_flight", "Password hash operations running.", "gauge", [({}, stats.in_flight)]
+    )
+    lines += metrics.sample_lines(
+        "password_hash_queue_depth", "Password hash operations waiting for a worker.", "gauge", [({}, stats.queue_depth)]
+    )
+    lines += metrics.sample_lines(
+        "password_hash_rejected_total", "Password hash operations rejected (503).", "counter", [({}, stats.rejected)]
+    )
+    lines += metrics.sample_lines(
+        "password_hash_operations_total", "Password hash operations completed.", "counter",
+        [({"operation": "hash"}, stats.hash_count), ({"operation": "verify"}, stats.verify_count)],
+    )
+    lines += metrics.sample_lines(
+        "password_hash_seconds_total", "Time spent computing bcrypt.", "counter",
+        [({"operation": "hash"}, stats.hash_seconds_total), ({"operation": "verify"}, stats.verify_seconds_total)],
+    )
+    return lines
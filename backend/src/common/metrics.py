@@ -0,0 +1,183 @@
+"""
+Метрики процесса в формате Prometheus (text exposition 0.0.4).
+
+Счётчики, gauge и гистограммы хранятся в памяти процесса без блокировок:
+всё обновляется из event loop. Метрики других подсистем (кэши, пул
+хэширования паролей) не дублируются, а снимаются при выдаче /metrics
+через зарегистрированные сборщики.
+"""
+
+import abc
+import bisect
+import math
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# Границы гистограмм по умолчанию, секунды
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(abc.ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _registry.append(self)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    @abc.abstractmethod
+    def render(self) -> List[str]:
+        """Строки метрики в формате exposition (вместе с HELP/TYPE)."""
+
+
+class Counter(_Metric):
+    """Монотонный счётчик."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        values = self.values or ({} if self.labelnames else {(): 0})
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+            for labels, value in sorted(values.items())
+        ]
+
+
+class Gauge(Counter):
+    """Значение, которое может уменьшаться."""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Гистограмма с фиксированными границами корзин."""
+
+    kind = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> (счётчики по корзинам без кумуляции, сумма, количество)
+        self.values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, series in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), series):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {series[-1]}")
+        return lines
+
+
+_registry: List[_Metric] = []
+_collectors: List[Callable[[], Iterable[str]]] = []
+
+
+def register_collector(collector: Callable[[], Iterable[str]]) -> None:
+    """Добавить функцию, которая при выдаче /metrics возвращает готовые строки метрик."""
+    _collectors.append(collector)
+
+
+def render() -> bytes:
+    """Все метрики процесса в текстовом формате Prometheus."""
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    for collector in _collectors:
+        lines.extend(collector())
+    return ("\n".join(lines) + "\n").encode()
+
+
+def sample_lines(name: str, documentation: str, kind: str, samples: Iterable[Tuple[Dict[str, str], float]]) -> List[str]:
+    """Строки метрики из готовых значений (для сборщиков)."""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(list(labels), list(labels.values()))} {_number(value)}")
+    return lines
+
+
+# HTTP
+http_requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests being processed.")
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+
+# SQL
+db_statement_duration_seconds = Histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time by statement kind.",
+    ("kind",),
+)
+db_slow_statements_total = Counter(
+    "db_slow_statements_total",
+    "SQL statements slower than metrics_slow_query_ms.",
+    ("kind",),
+)
+
+# Фоновые задачи
+jobs_in_flight = Gauge("jobs_in_flight", "Background jobs being executed.")
+jobs_total = Counter(
+    "jobs_total",
+    "Background job executions by job type and outcome (succeeded, retried, failed).",
+    ("job", "outcome"),
+)
+job_duration_seconds = Histogram("job_duration_seconds", "Background job execution time.", ("job",))
+
+# Обложки
+image_upload_bytes_total = Counter("image_upload_bytes_total", "Bytes of cover uploads received.")
+image_bytes_written_total = Counter(
+    "image_bytes_written_total",
+    "Bytes of new cover originals written to storage (deduplicated uploads excluded).",
+)
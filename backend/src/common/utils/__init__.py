@@ -1,5 +1,5 @@
 """Common utilities module."""
 
-from src.common.utils.image import save_image, delete_image
+from src.common.utils.image import save_image, delete_image, create_variants
 
-__all__ = ["save_image", "delete_image"]
+__all__ = ["save_image", "delete_image", "create_variants"]
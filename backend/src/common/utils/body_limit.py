@@ -0,0 +1,73 @@
+"""
+Предел размера тела запроса до его разбора приложением.
+
+Starlette разбирает multipart-форму (и складывает файлы во временные
+файлы) до вызова обработчика, поэтому проверка размера в обработчике
+срабатывает только после приёма всего тела. Middleware отвечает 413
+по Content-Length сразу, а при передаче без Content-Length (chunked) -
+как только принято больше предела, не дочитывая остальное.
+"""
+
+from typing import Mapping, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class BodySizeLimitMiddleware:
+    """
+    ASGI middleware: предел тела для отдельных маршрутов.
+
+    Args:
+        app: Вложенное ASGI-приложение.
+        limits: Предел в байтах по (метод, путь); остальные запросы не ограничиваются.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Mapping[Tuple[str, str], int]):
+        self.app = app
+        self.limits = dict(limits)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = self.limits.get((scope.get("method"), scope.get("path"))) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > limit:
+            await self._reject(limit, scope, receive, send)
+            return
+
+        received = 0
+        rejected = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Отвечаем сами, а приложению сообщаем об обрыве соединения
+                    rejected = True
+                    await self._reject(limit, scope, receive, send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            # После 413 ответ приложения (ошибка разбора тела) уже не нужен
+            if not rejected:
+                await send(message)
+
+        await self.app(scope, limited_receive, guarded_send)
+
+    @staticmethod
+    async def _reject(limit: int, scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(
+            {"detail": f"Тело запроса больше {limit} байт"},
+            status_code=413,
+            headers={"Connection": "close"},
+        )
+        await response(scope, receive, send)
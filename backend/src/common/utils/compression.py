@@ -0,0 +1,212 @@
+"""
+Сжатие ответов gzip / brotli.
+
+Сжимаются только ответы из списка типов содержимого и не меньше
+`minimum_size` байт. Потоковые ответы (выгрузка NDJSON) сжимаются
+по частям с flush после каждой, так что клиент получает данные сразу.
+Ответы по путям из `cached_paths` (OpenAPI, справочники) сжимаются
+один раз с максимальным уровнем и дальше берутся из памяти.
+"""
+
+import functools
+import gzip
+import hashlib
+import zlib
+from typing import Iterable, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.common.cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # необязательная зависимость: pip install .[speedups]
+    brotli = None
+
+# Ответы, которые нельзя или бессмысленно сжимать
+SKIP_STATUSES = {204, 206, 304}
+
+# Уровни для ответов, которые сжимаются один раз и кэшируются
+CACHED_GZIP_LEVEL = 9
+CACHED_BROTLI_QUALITY = 11
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Доступные кодировки в порядке предпочтения."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def select_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Выбрать кодировку по Accept-Encoding (кодировки с q=0 не принимаются).
+
+    Returns:
+        Optional[str]: "br", "gzip" или None, если сжимать нельзя.
+    """
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            if params and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.strip().lower())
+
+    for encoding in supported_encodings():
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    """Сжать тело целиком (`level` - уровень gzip или quality brotli)."""
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    # mtime=0: одинаковое тело даёт одинаковый результат
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class _StreamCompressor:
+    """Сжатие потока по частям с flush после каждой."""
+
+    def __init__(self, encoding: str, level: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=level)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(level, wbits=31)  # 31 - формат gzip
+
+    def compress(self, chunk: bytes, final: bool) -> bytes:
+        if self._brotli is not None:
+            data = self._brotli.process(chunk)
+            return data + (self._brotli.finish() if final else self._brotli.flush())
+        data = self._zlib.compress(chunk)
+        return data + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware сжатия ответов.
+
+    Не трогает ответы, у которых уже есть Content-Encoding (выгрузка
+    с gzip=true, предсжатые обложки), а также 204/206/304. Сильный ETag
+    сжатого ответа становится слабым: байты представления другие.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            minimum_size: int = 1024,
+            content_types: Iterable[str] = ("application/json", "text/"),
+            gzip_level: int = 6,
+            brotli_quality: int = 5,
+            cached_paths: Iterable[str] = (),
+            cache_max_entries: int = 32,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = tuple(content_types)
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+        self.cached_paths = frozenset(cached_paths)
+        # (кодировка, хэш тела) -> сжатое тело
+        self.cache: TTLCache[bytes] = TTLCache("http.precompressed", maxsize=cache_max_entries, ttl=None)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, cached=scope["path"] in self.cached_paths)
+        await self.app(scope, receive, functools.partial(responder.send, send))
+
+    def is_compressible(self, headers: Headers) -> bool:
+        """Подходит ли ответ по заголовкам."""
+        if "content-encoding" in headers or "no-transform" in headers.get("cache-control", ""):
+            return False
+        media_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        return bool(media_type) and media_type.startswith(self.content_types)
+
+    def compress_cached(self, body: bytes, encoding: str) -> bytes:
+        """Сжать тело с максимальным уровнем или взять готовый результат из кэша."""
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self.cache.get(key)
+        if compressed is None:
+            level = CACHED_BROTLI_QUALITY if encoding == "br" else CACHED_GZIP_LEVEL
+            compressed = compress(body, encoding, level)
+            self.cache.set(key, compressed)
+        return compressed
+
+
+class _CompressionResponder:
+    """Состояние одного ответа: решение о сжатии принимается по первой части тела."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, cached: bool):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.cached = cached
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_StreamCompressor] = None
+
+    async def send(self, send: Send, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+
+        if self.start is None:
+            # Заголовки уже отправлены: сжимаем продолжение потока или передаём как есть
+            if self.compressor is not None and message["type"] == "http.response.body":
+                more_body = message.get("more_body", False)
+                message["body"] = self.compressor.compress(message.get("body", b""), final=not more_body)
+            await send(message)
+            return
+
+        start, self.start = self.start, None
+        if message["type"] != "http.response.body":
+            # Например, http.response.pathsend у FileResponse
+            await send(start)
+            await send(message)
+            return
+
+        headers = MutableHeaders(raw=list(start.get("headers", [])))
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        middleware = self.middleware
+
+        if (
+                start["status"] in SKIP_STATUSES
+                or not middleware.is_compressible(headers)
+                or (not more_body and len(body) < middleware.minimum_size)
+        ):
+            await send(start)
+            await send(message)
+            return
+
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
+
+        if more_body:
+            del headers["content-length"]
+            self.compressor = _StreamCompressor(self.encoding, middleware.levels[self.encoding])
+            message["body"] = self.compressor.compress(body, final=False)
+        else:
+            if self.cached:
+                message["body"] = middleware.compress_cached(body, self.encoding)
+            else:
+                message["body"] = compress(body, self.encoding, middleware.levels[self.encoding])
+            headers["content-length"] = str(len(message["body"]))
+
+        start["headers"] = headers.raw
+        await send(start)
+        await send(message)
@@ -0,0 +1,51 @@
+"""HTTP-утилиты: ETag, Last-Modified, условные запросы."""
+
+import datetime
+import hashlib
+from email.utils import format_datetime
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers
+
+# Клиент обязан перепроверять ответ (If-None-Match) при каждом запросе
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts: object) -> str:
+    """
+    Слабый ETag из частей версии.
+
+    Части склеиваются и хэшируются, чтобы длина ETag не зависела
+    от query string.
+    """
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def http_date(value: datetime.datetime) -> str:
+    """Дата в формате HTTP (RFC 9110). Наивные даты считаются UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return format_datetime(value.astimezone(datetime.timezone.utc), usegmt=True)
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime.datetime]) -> Dict[str, str]:
+    """Заголовки валидаторов кэша для ответа."""
+    # Содержимое зависит от владельца токена
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL, "Vary": "Authorization"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def etag_matches(request_headers: Headers, etag: str) -> bool:
+    """
+    Совпадает ли If-None-Match с ETag (слабое сравнение, RFC 9110 §13.1.2).
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
@@ -1,21 +1,65 @@
 """Image handling utilities."""
 
-import os
+import asyncio
+import hashlib
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence
 
+import anyio
 from fastapi import UploadFile
+from PIL import Image, UnidentifiedImageError
+
+from src.common import metrics
+from src.core.config import settings
 
 
 UPLOAD_DIR = Path("uploads/images")
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+CHUNK_SIZE = 64 * 1024
+TEMP_SUFFIX = ".part"
+
+# Сигнатуры форматов; WebP проверяется отдельно (RIFF....WEBP)
+SNIFF_SIZE = 12
+MAGIC_SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+)
+
+# Пул процессов для ресайза: Pillow держит GIL, в потоке он тормозил бы event loop
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _sniff_extension(header: bytes) -> Optional[str]:
+    """Определить формат изображения по сигнатуре (magic bytes)."""
+    for signature, extension in MAGIC_SIGNATURES:
+        if header.startswith(signature):
+            return extension
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return ".webp"
+    return None
+
+
+def _too_large_error() -> ValueError:
+    """Ошибка превышения MAX_FILE_SIZE."""
+    return ValueError(f"Файл слишком большой. Максимальный размер: {MAX_FILE_SIZE // (1024 * 1024)}MB")
 
 
 async def save_image(file: UploadFile) -> str:
     """
     Сохранить загруженное изображение.
+
+    Файл копируется кусками по CHUNK_SIZE во временный файл без
+    блокировки event loop. Копирование прерывается, как только превышен
+    MAX_FILE_SIZE или сигнатура не похожа на изображение; в каталог
+    обложек файл переносится атомарным rename только после успешной записи.
+
+    Имя файла - sha256 содержимого (`ab/cd/<sha256>.<ext>`), поэтому
+    одинаковые обложки хранятся на диске один раз.
     
     Args:
         file: Загруженный файл изображения.
@@ -35,31 +79,175 @@ async def save_image(file: UploadFile) -> str:
             )
     else:
         raise ValueError("Имя файла отсутствует")
+
+    # Тело уже принято и разобрано (большие запросы отсекает BodySizeLimitMiddleware
+    # по Content-Length); известный размер позволяет не копировать файл
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        raise _too_large_error()
     
     # Создаем директорию, если её нет
-    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-    
-    # Генерируем уникальное имя файла
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = UPLOAD_DIR / unique_filename
-    
-    # Сохраняем файл
-    contents = await file.read()
-    
-    # Проверяем размер файла
-    if len(contents) > MAX_FILE_SIZE:
-        raise ValueError(f"Файл слишком большой. Максимальный размер: {MAX_FILE_SIZE // (1024 * 1024)}MB")
-    
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    upload_dir = anyio.Path(UPLOAD_DIR)
+    await upload_dir.mkdir(parents=True, exist_ok=True)
+
+    temp_path = upload_dir / f".{uuid.uuid4()}{TEMP_SUFFIX}"
+    digest = hashlib.sha256()
+    header = b""
+    real_ext = None
+    size = 0
+
+    try:
+        async with await anyio.open_file(temp_path, "wb") as out:
+            while chunk := await file.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_FILE_SIZE:
+                    raise _too_large_error()
+
+                if real_ext is None and len(header) < SNIFF_SIZE:
+                    header += chunk[:SNIFF_SIZE - len(header)]
+                    if len(header) == SNIFF_SIZE:
+                        real_ext = _sniff_extension(header)
+                        if real_ext is None:
+                            raise ValueError("Содержимое файла не является поддерживаемым изображением")
+
+                digest.update(chunk)
+                await out.write(chunk)
+
+        if real_ext is None:
+            real_ext = _sniff_extension(header)
+            if real_ext is None:
+                raise ValueError("Содержимое файла не является поддерживаемым изображением")
+
+        # Адрес по содержимому; расширение - по реальному формату
+        content_hash = digest.hexdigest()
+        file_path = upload_dir / content_hash[:2] / content_hash[2:4] / f"{content_hash}{real_ext}"
+
+        if await file_path.exists():
+            # Такая обложка уже есть: копия не нужна, а свежий mtime
+            # не даст сборщику мусора удалить файл до коммита книги
+            await file_path.touch()
+            await temp_path.unlink()
+        else:
+            await file_path.parent.mkdir(parents=True, exist_ok=True)
+            await temp_path.replace(file_path)
+            metrics.image_bytes_written_total.inc(amount=size)
+        metrics.image_upload_bytes_total.inc(amount=size)
+    except BaseException:
+        await temp_path.unlink(missing_ok=True)
+        raise
     
     # Возвращаем относительный путь с forward slashes для URL
     return str(file_path).replace("\\", "/")
 
 
+def _variant(path: Path, width: int, height: int, image_format: str) -> Dict[str, Any]:
+    """Метаданные одного варианта изображения."""
+    return {
+        "url": str(path).replace("\\", "/"),
+        "width": width,
+        "height": height,
+        "format": image_format,
+    }
+
+
+def _render_variants(
+        image_path: str,
+        widths: Sequence[int],
+        webp_quality: int,
+) -> List[Dict[str, Any]]:
+    """
+    Построить миниатюры и WebP-варианты изображения (выполняется в пуле процессов).
+
+    Для каждой ширины из `widths`, меньшей исходной, сохраняются
+    WebP и JPEG/PNG миниатюры; для исходного размера - WebP-копия.
+
+    Returns:
+        List[Dict[str, Any]]: Варианты от меньшего к большему, включая оригинал.
+    """
+    source = Path(image_path)
+    with Image.open(source) as original:
+        original.seek(0)  # у GIF берём первый кадр
+        image = original.convert("RGBA" if original.mode in ("RGBA", "LA", "P") else "RGB")
+        original_format = (original.format or source.suffix.lstrip(".")).lower()
+
+    has_alpha = image.mode == "RGBA"
+    fallback_ext, fallback_format = (".png", "PNG") if has_alpha else (".jpg", "JPEG")
+
+    variants = []
+    for width in sorted(set(widths)):
+        if width >= image.width:
+            continue
+        height = max(1, round(image.height * width / image.width))
+        webp_path = source.with_name(f"{source.stem}_{width}.webp")
+        fallback_path = source.with_name(f"{source.stem}_{width}{fallback_ext}")
+
+        # Повторная загрузка той же обложки: варианты уже на диске
+        if not (webp_path.exists() and fallback_path.exists()):
+            thumbnail = image.resize((width, height), Image.Resampling.LANCZOS)
+            thumbnail.save(webp_path, "WEBP", quality=webp_quality, method=4)
+            thumbnail.save(fallback_path, fallback_format, optimize=True)
+
+        variants.append(_variant(webp_path, width, height, "webp"))
+        variants.append(_variant(fallback_path, width, height, fallback_format.lower()))
+
+    if original_format != "webp":
+        webp_path = source.with_name(f"{source.stem}_full.webp")
+        if not webp_path.exists():
+            image.save(webp_path, "WEBP", quality=webp_quality, method=4)
+        variants.append(_variant(webp_path, image.width, image.height, "webp"))
+
+    variants.append(_variant(source, image.width, image.height, original_format))
+    return variants
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Пул процессов для обработки изображений (создаётся при первом использовании)."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.image_workers)
+    return _executor
+
+
+def shutdown_image_workers() -> None:
+    """Остановить пул процессов обработки изображений."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def create_variants(image_url: str) -> List[Dict[str, Any]]:
+    """
+    Сгенерировать миниатюры и WebP-варианты сохранённой обложки.
+
+    Ресайз выполняется в отдельном процессе и не блокирует event loop.
+
+    Args:
+        image_url: Относительный путь, который вернул `save_image`.
+
+    Returns:
+        List[Dict[str, Any]]: Варианты с url, width, height и format.
+
+    Raises:
+        ValueError: Если файл не является изображением.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            _get_executor(),
+            _render_variants,
+            image_url,
+            tuple(settings.image_thumbnail_widths),
+            settings.image_webp_quality,
+        )
+    except (UnidentifiedImageError, OSError) as e:
+        # Файл не удаляем сразу: с дедупликацией его может разделять другая
+        # загрузка. Без ссылок он будет удалён сборщиком мусора.
+        raise ValueError("Файл не является корректным изображением") from e
+
+
 def delete_image(image_url: Optional[str]) -> None:
     """
-    Удалить изображение по URL.
+    Удалить изображение по URL вместе с его миниатюрами.
     
     Args:
         image_url: URL изображения для удаления.
@@ -71,6 +259,8 @@ def delete_image(image_url: Optional[str]) -> None:
         file_path = Path(image_url)
         if file_path.exists() and file_path.is_file():
             file_path.unlink()
+        for variant_path in file_path.parent.glob(f"{file_path.stem}_*"):
+            variant_path.unlink(missing_ok=True)
     except Exception:
         # Игнорируем ошибки удаления файлов
         pass
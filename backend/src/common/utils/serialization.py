@@ -0,0 +1,29 @@
+"""
+Сериализация ответов в JSON без промежуточных pydantic-моделей.
+
+Для списков на тысячи строк валидация каждой строки в модель и
+повторная сериализация FastAPI стоят дороже самого запроса к БД,
+поэтому такие ответы собираются из словарей и кодируются сразу в байты.
+"""
+
+from typing import Any
+
+import pydantic_core
+
+try:
+    import orjson
+except ImportError:  # необязательная зависимость: pip install .[speedups]
+    orjson = None
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Закодировать dict/list/скаляры в JSON (UTF-8).
+
+    Даты кодируются в ISO 8601 с `Z` для UTC, перечисления - значением,
+    как в ответах pydantic. При установленном orjson используется он,
+    иначе - сериализатор pydantic-core без валидации.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_UTC_Z)
+    return pydantic_core.to_json(value)
@@ -0,0 +1,110 @@
+"""Отдача файлов обложек с агрессивным кэшированием."""
+
+import mimetypes
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from src.common.utils.image import TEMP_SUFFIX
+from src.core.config import settings
+
+# Файлы обложек никогда не перезаписываются: имя - хэш содержимого (или uuid у старых)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Предсжатые копии рядом с файлом: cover.svg.br, cover.svg.gz
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+class CoverStaticFiles(StaticFiles):
+    """
+    StaticFiles для неизменяемых файлов с именами по содержимому.
+
+    - сильный ETag из имени файла и `Cache-Control: immutable`;
+    - 304 по If-None-Match / If-Modified-Since;
+    - Range-запросы и zero-copy отдача (`http.response.pathsend`)
+      средствами FileResponse;
+    - выгрузка передачи файла в nginx через X-Accel-Redirect,
+      если задан `static_accel_redirect_prefix`;
+    - предсжатые `.br` / `.gz` копии, если клиент их принимает.
+
+    Недописанные загрузки (`.<uuid>.part`) лежат в том же каталоге, чтобы
+    переименование в итоговое имя было атомарным, и не отдаются (404).
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if Path(path).name.endswith(TEMP_SUFFIX):
+            raise HTTPException(status_code=404)
+        return await super().get_response(path, scope)
+
+    def file_response(
+            self,
+            full_path: "os.PathLike[str] | str",
+            stat_result: os.stat_result,
+            scope: Scope,
+            status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        path = Path(full_path)
+        encoding, served_path, served_stat = self._select_representation(path, stat_result, request_headers)
+
+        headers = {
+            "etag": f'"{path.stem}{"-" + encoding if encoding else ""}"',
+            "cache-control": IMMUTABLE_CACHE_CONTROL,
+            "vary": "Accept-Encoding",
+        }
+        if encoding:
+            headers["content-encoding"] = encoding
+
+        # Тип - по исходному файлу, а не по .br/.gz копии
+        media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        response = FileResponse(
+            served_path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            stat_result=served_stat,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+
+        if settings.static_accel_redirect_prefix and self.directory is not None:
+            return self._accel_redirect(served_path, response)
+        return response
+
+    @staticmethod
+    def _select_representation(
+            path: Path,
+            stat_result: os.stat_result,
+            request_headers: Headers,
+    ) -> Tuple[Optional[str], Path, os.stat_result]:
+        """Выбрать предсжатую копию файла, если клиент её принимает и она есть."""
+        accepted = {
+            item.split(";", 1)[0].strip()
+            for item in request_headers.get("accept-encoding", "").split(",")
+        }
+        for encoding, suffix in PRECOMPRESSED:
+            if encoding not in accepted:
+                continue
+            candidate = path.with_name(path.name + suffix)
+            try:
+                return encoding, candidate, os.stat(candidate)
+            except FileNotFoundError:
+                continue
+        return None, path, stat_result
+
+    def _accel_redirect(self, served_path: Path, response: FileResponse) -> Response:
+        """Передать отдачу файла nginx (sendfile), оставив заголовки кэширования."""
+        relative = served_path.relative_to(Path(self.directory).resolve()).as_posix()
+        headers = {
+            key: value
+            for key, value in response.headers.items()
+            if key not in ("content-length", "accept-ranges")
+        }
+        headers["x-accel-redirect"] = f"{settings.static_accel_redirect_prefix.rstrip('/')}/{relative}"
+        return Response(status_code=response.status_code, headers=headers, media_type=response.media_type)
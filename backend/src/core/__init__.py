@@ -1,6 +1,21 @@
 """Core module - базовые компоненты приложения."""
 
 from src.core.config import settings
-from src.core.database import engine, AsyncSessionLocal, get_db
+from src.core.database import (
+    engine,
+    read_engine,
+    AsyncSessionLocal,
+    ReaderSessionLocal,
+    WriterSessionLocal,
+    get_db,
+)
 
-__all__ = ["settings", "engine", "AsyncSessionLocal", "get_db"]
+__all__ = [
+    "settings",
+    "engine",
+    "read_engine",
+    "AsyncSessionLocal",
+    "ReaderSessionLocal",
+    "WriterSessionLocal",
+    "get_db",
+]
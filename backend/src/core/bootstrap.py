@@ -0,0 +1,178 @@
+"""
+Подготовка общего состояния перед приёмом запросов.
+
+Каталоги загрузок и схема БД общие для всех процессов приложения.
+При нескольких воркерах (uvicorn --workers, gunicorn) они стартуют
+одновременно, поэтому подготовка выполняется под файловой блокировкой:
+схему создаёт или мигрирует один процесс, остальные ждут его и
+находят готовый результат. Production-запуск (`python main.py
+--production`) выполняет её один раз до запуска воркеров, а воркерам
+передаёт DB_SCHEMA_INIT=none.
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, List, Optional
+
+from src.core.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+UPLOAD_DIRS = (Path("uploads"), Path("uploads/images"))
+
+# Режимы подготовки схемы (settings.db_schema_init)
+SCHEMA_CREATE_ALL = "create_all"
+SCHEMA_MIGRATE = "migrate"
+SCHEMA_NONE = "none"
+
+
+def _lock(handle: IO, blocking: bool) -> bool:
+    """Взять эксклюзивную блокировку файла; без ожидания - False, если она занята."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        else:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+    except OSError:
+        if blocking:
+            raise
+        return False
+    return True
+
+
+def lock_path(name: str) -> Path:
+    """Путь файла блокировки `name` в каталоге settings.locks_dir."""
+    directory = Path(settings.locks_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"{name}.lock"
+
+
+@contextmanager
+def file_lock(name: str) -> Iterator[None]:
+    """Эксклюзивная блокировка между процессами на время блока (с ожиданием)."""
+    with open(lock_path(name), "a+") as handle:
+        _lock(handle, blocking=True)
+        yield
+        # Блокировка снимается при закрытии файла
+
+
+def try_hold_lock(name: str) -> Optional[IO]:
+    """
+    Взять блокировку без ожидания и держать её до завершения процесса.
+
+    Нужна задачам, которые при нескольких воркерах должен выполнять
+    только один из них (расписание фоновых задач).
+
+    Returns:
+        Optional[IO]: Открытый файл блокировки (его нужно хранить) или None, если она занята.
+    """
+    handle = open(lock_path(name), "a+")
+    if _lock(handle, blocking=False):
+        return handle
+    handle.close()
+    return None
+
+
+def prepare_storage() -> None:
+    """Создать каталоги загрузок."""
+    for directory in UPLOAD_DIRS:
+        directory.mkdir(parents=True, exist_ok=True)
+
+
+async def _table_names() -> List[str]:
+    """Таблицы в базе settings.database_url."""
+    from sqlalchemy import inspect
+
+    from src.core.database import create_engine
+
+    engine = create_engine(settings.database_url)
+    try:
+        async with engine.connect() as connection:
+            return await connection.run_sync(lambda sync_connection: inspect(sync_connection).get_table_names())
+    finally:
+        await engine.dispose()
+
+
+async def _create_all() -> None:
+    # Отдельный движок: вызов идёт из своего event loop и до форка воркеров
+    from src.core.base import Base
+    from src.core.database import create_engine
+    from src.books.models import BookModel  # noqa: F401 - модели для Base.metadata
+    from src.genres.models import GenreModel  # noqa: F401
+    from src.images.models import ImageBlobModel  # noqa: F401
+    from src.stats.models import BookStatsModel  # noqa: F401
+    from src.user.models import UserModel  # noqa: F401
+
+    engine = create_engine(settings.database_url)
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+    finally:
+        await engine.dispose()
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    return config
+
+
+def run_migrations() -> None:
+    """Применить миграции Alembic до head."""
+    from alembic import command
+
+    command.upgrade(_alembic_config(), "head")
+
+
+def stamp_head() -> None:
+    """Отметить схему как актуальную (head) без выполнения миграций."""
+    from alembic import command
+
+    command.stamp(_alembic_config(), "head")
+
+
+def bootstrap(schema: str = SCHEMA_CREATE_ALL) -> None:
+    """
+    Подготовить каталоги и схему БД под файловой блокировкой (синхронно).
+
+    Запускает собственный event loop, поэтому из async-кода вызывается
+    в потоке: `await anyio.to_thread.run_sync(bootstrap, mode)`.
+
+    Args:
+        schema: "create_all" (dev: пустая база создаётся по моделям и
+            отмечается как head; в существующую, в том числе созданную
+            раньше через create_all без alembic_version, недостающие
+            колонки добавляют миграции), "migrate" (alembic upgrade head)
+            или "none".
+
+    Raises:
+        ValueError: Если режим неизвестен.
+    """
+    if schema not in (SCHEMA_CREATE_ALL, SCHEMA_MIGRATE, SCHEMA_NONE):
+        raise ValueError(f"Unknown schema init mode: {schema}")
+
+    with file_lock("startup"):
+        prepare_storage()
+        if schema == SCHEMA_MIGRATE:
+            logger.info("Applying migrations (pid %d)", os.getpid())
+            run_migrations()
+        elif schema == SCHEMA_CREATE_ALL:
+            # create_all не добавляет колонки в уже существующие таблицы
+            if "books" in asyncio.run(_table_names()):
+                logger.info("Existing database, applying migrations (pid %d)", os.getpid())
+                run_migrations()
+            else:
+                asyncio.run(_create_all())
+                stamp_head()
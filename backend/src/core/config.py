@@ -1,14 +1,132 @@
 """Application configuration."""
 
+from typing import List, Optional
+
 from pydantic_settings import BaseSettings
 
 
+# Ключ подписи токенов по умолчанию: годится только для разработки,
+# `python main.py --production` с ним не запускается
+DEV_AUTH_SECRET_KEY = "dev-secret-key-change-me"
+
+
 class Settings(BaseSettings):
     """Настройки приложения."""
     
     database_url: str = "sqlite+aiosqlite:///./books.db"
     project_name: str = "Books Manager"
 
+    # Пул соединений и логирование SQL (echo заметно замедляет запросы - только для отладки)
+    db_echo: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+
+    # Чтение через отдельный пул: реплика (например, Postgres standby) или,
+    # для SQLite, соединения только для чтения (mode=ro) к тому же файлу.
+    # Без реплики для других СУБД чтение идёт через основной движок.
+    database_read_url: Optional[str] = None
+    db_read_routing: bool = True
+    db_read_pool_size: int = 10
+
+    # PRAGMA для каждого нового соединения SQLite.
+    # WAL позволяет читать параллельно с записью, synchronous=NORMAL в WAL
+    # безопасен для целостности и не делает fsync на каждый коммит.
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size: int = -64000  # отрицательное значение - в KiB
+    sqlite_busy_timeout_ms: int = 5000
+    # SQLite по умолчанию не проверяет внешние ключи и не выполняет ON DELETE
+    sqlite_foreign_keys: bool = True
+
+    # Пагинация списка книг
+    books_page_size: int = 50
+    books_max_page_size: int = 500
+
+    # Выгрузка каталога: сколько строк читать из БД за один раз
+    export_batch_size: int = 1000
+
+    # Массовый импорт: размер пачки для одного INSERT и лимит ошибок в ответе
+    import_batch_size: int = 1000
+    import_max_reported_errors: int = 1000
+
+    # Пакетные изменение и удаление: максимум ID в одном запросе
+    books_batch_max_ids: int = 1000
+
+    # Обложки: ширины миниатюр, качество WebP и число процессов для ресайза
+    image_thumbnail_widths: List[int] = [160, 320, 640]
+    image_webp_quality: int = 80
+    image_workers: int = 2
+
+    # Сборка мусора в хранилище обложек (0 - не запускать периодически)
+    image_gc_interval_seconds: int = 3600
+    image_gc_grace_seconds: int = 3600
+
+    # Фоновые задачи после коммита (миниатюры, удаление файлов обложек, пересчёты).
+    # jobs_backend: "memory" - очередь в памяти процесса, "sqlite" - в файле
+    # jobs_sqlite_path (переживает перезапуск). Число параллельных задач и
+    # повторы с экспоненциальной задержкой от jobs_retry_base_seconds.
+    jobs_backend: str = "memory"
+    jobs_sqlite_path: str = "jobs.db"
+    jobs_concurrency: int = 4
+    jobs_max_attempts: int = 5
+    jobs_retry_base_seconds: float = 1.0
+    jobs_retry_max_seconds: float = 300.0
+    jobs_poll_interval_seconds: float = 1.0
+    jobs_lock_timeout_seconds: float = 600.0
+
+    # Запуск: адрес, число воркеров production-режима (None - по числу ядер),
+    # подготовка схемы при старте ("create_all" - dev, "migrate" - alembic
+    # upgrade head, "none") и каталог файловых блокировок между воркерами
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: Optional[int] = None
+    db_schema_init: str = "create_all"
+    locks_dir: str = "."
+
+    # Внутренний location nginx для X-Accel-Redirect (например, /protected-uploads).
+    # Если задан, файлы обложек отдаёт nginx через sendfile, а не приложение.
+    static_accel_redirect_prefix: Optional[str] = None
+
+    # Хэширование паролей: cost factor bcrypt (2^rounds итераций), потоки пула
+    # и предел задач в работе и очереди, после которого отвечаем 503
+    password_bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 32
+
+    # Токены доступа: ключ подписи HMAC (в production обязательно задать свой),
+    # время жизни и кэш уже проверенных токенов
+    auth_secret_key: str = DEV_AUTH_SECRET_KEY
+    auth_token_ttl_seconds: int = 24 * 3600
+    auth_token_cache_size: int = 10000
+    auth_token_cache_ttl_seconds: float = 300.0
+
+    # Сжатие ответов: gzip всегда, brotli - если установлен пакет brotli.
+    # Ответы по compression_cached_paths сжимаются один раз и хранятся в памяти.
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_content_types: List[str] = ["application/json", "application/x-ndjson", "text/"]
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 5
+    compression_cached_paths: List[str] = [
+        "/api/v1/openapi.json",
+        "/api/v1/book/genres",
+        "/api/v1/book/statuses",
+    ]
+    compression_cache_max_entries: int = 32
+
+    # Метрики Prometheus на /metrics: латентность маршрутов, время SQL-запросов
+    # (медленнее metrics_slow_query_ms - в лог), кэши, пул паролей, обложки
+    metrics_enabled: bool = True
+    metrics_slow_query_ms: float = 200.0
+
+    # Кэш справочников (жанры, статусы) в памяти процесса
+    reference_cache_ttl_seconds: float = 300.0
+    reference_cache_max_entries: int = 64
+
     class Config:
         env_file = ".env"
 
@@ -1,24 +1,163 @@
 """Database connection and session management."""
 
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, Dict, Optional
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import Engine, TextClause, event, make_url
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
 
 from src.core.config import settings
 
-# Создание асинхронного движка для SQLAlchemy
-engine = create_async_engine(
-    settings.database_url,
-    echo=True,
-    future=True
+
+def _is_memory_sqlite(url: str) -> bool:
+    """URL указывает на SQLite в памяти."""
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def _pool_options(url: str, pool_size: int) -> Dict[str, Any]:
+    """Параметры пула соединений из настроек."""
+    if _is_memory_sqlite(url):
+        # In-memory SQLite живёт в одном соединении (StaticPool) - размеры пула к нему не применимы
+        return {}
+    return {
+        "pool_size": pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """PRAGMA, выполняемые на каждом новом соединении SQLite."""
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "mmap_size": settings.sqlite_mmap_size,
+        "cache_size": settings.sqlite_cache_size,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "foreign_keys": "ON" if settings.sqlite_foreign_keys else "OFF",
+    }
+
+
+def apply_sqlite_pragmas(target: AsyncEngine, pragmas: Dict[str, Any]) -> None:
+    """Выполнять `pragmas` при открытии каждого соединения движка."""
+
+    @event.listens_for(target.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def create_engine(url: str, pool_size: Optional[int] = None, read_only: bool = False) -> AsyncEngine:
+    """
+    Создать асинхронный движок с настройками пула и логирования.
+
+    Для SQLite дополнительно включаются PRAGMA из настроек. Соединение
+    только для чтения не может менять режим журнала, поэтому для него
+    journal_mode не выполняется.
+    """
+    async_engine = create_async_engine(
+        url,
+        echo=settings.db_echo,
+        **_pool_options(url, pool_size or settings.db_pool_size),
+    )
+    if async_engine.dialect.name == "sqlite":
+        pragmas = sqlite_pragmas()
+        if read_only:
+            pragmas.pop("journal_mode")
+        apply_sqlite_pragmas(async_engine, pragmas)
+    return async_engine
+
+
+def read_only_url(url: str) -> Optional[str]:
+    """
+    URL для пула чтения.
+
+    Явно заданный `database_read_url` или, для файла SQLite, URI того же
+    файла с `mode=ro`. None - отдельного пула чтения нет.
+    """
+    if settings.database_read_url:
+        return settings.database_read_url
+
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or _is_memory_sqlite(url) or parsed.query.get("uri"):
+        return None
+    return parsed.set(
+        database=f"file:{parsed.database}",
+        query={**parsed.query, "mode": "ro", "uri": "true"},
+    ).render_as_string(hide_password=False)
+
+
+# Движок записи - единственный, через который идут INSERT/UPDATE/DELETE
+engine = create_engine(settings.database_url)
+
+# Движок чтения: отдельный пул соединений (реплика или SQLite mode=ro)
+_read_url = read_only_url(settings.database_url) if settings.db_read_routing else None
+read_engine = (
+    create_engine(_read_url, pool_size=settings.db_read_pool_size, read_only=True)
+    if _read_url else engine
 )
 
-# Фабрика сессий
+
+def _is_write(clause: Any) -> bool:
+    """Выражение меняет данные или блокирует строки."""
+    if clause is None:
+        return False
+    if getattr(clause, "is_dml", False) or isinstance(clause, TextClause):
+        return True
+    return getattr(clause, "_for_update_arg", None) is not None
+
+
+class RoutingSession(Session):
+    """
+    Сессия, выбирающая движок под каждый запрос.
+
+    SELECT идут в пул чтения, flush и DML - в движок записи. После первой
+    записи сессия до закрытия читает тоже через writer: так видны
+    собственные незакоммиченные изменения, а `refresh` после коммита не
+    зависит от отставания реплики.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._use_writer = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs: Any) -> Engine:
+        if self._use_writer or self._flushing or _is_write(clause):
+            self._use_writer = True
+            return engine.sync_engine
+        return read_engine.sync_engine
+
+    def close(self) -> None:
+        super().close()
+        self._use_writer = False
+
+
+# Фабрика сессий с маршрутизацией чтения/записи (по умолчанию для API)
 AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False
+)
+
+# Фабрики с явным выбором движка
+WriterSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
+ReaderSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession | Any, Any]:
@@ -33,3 +172,13 @@ async def get_db() -> AsyncGenerator[AsyncSession | Any, Any]:
             yield session
         finally:
             await session.close()
+
+
+def dialect_insert(db: AsyncSession):
+    """
+    Конструктор INSERT с поддержкой ON CONFLICT для диалекта сессии.
+
+    Returns:
+        `postgresql.insert` или `sqlite.insert`.
+    """
+    return postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
@@ -0,0 +1,6 @@
+"""Images module - учёт файлов обложек."""
+
+from src.images.models import ImageBlobModel
+from src.images.repository import ImageBlobRepository
+
+__all__ = ["ImageBlobModel", "ImageBlobRepository"]
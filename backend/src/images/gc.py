@@ -0,0 +1,129 @@
+"""
+Сборка мусора в хранилище обложек.
+
+Удаляет файлы, на которые больше не ссылается ни одна книга, и
+осиротевшие файлы в uploads/images без записи в image_blobs.
+Свежие файлы (моложе grace-периода) не трогаются: их могла только что
+загрузить книга, которая ещё не закоммичена.
+
+Запуск вручную:
+    python -m src.images.gc
+"""
+
+import asyncio
+import datetime
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Set, Tuple
+
+import anyio
+from sqlalchemy import select
+
+from src.books.models import BookModel
+from src.common.utils.image import TEMP_SUFFIX, UPLOAD_DIR, delete_image
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.images.repository import ImageBlobRepository
+
+
+@dataclass
+class GarbageCollectionReport:
+    """Итог сборки мусора."""
+
+    released_blobs: int = 0
+    orphan_files: int = 0
+
+
+def _blob_key(path: Path) -> Tuple[Path, str]:
+    """Ключ файла: каталог и имя оригинала (миниатюры `<stem>_<size>.*` относятся к нему)."""
+    return path.parent, path.name.split(".", 1)[0].split("_", 1)[0]
+
+
+def _remove_orphans(referenced_urls: Set[str], grace_seconds: int) -> int:
+    """Удалить с диска файлы без ссылок, старше grace-периода (синхронно)."""
+    referenced = {_blob_key(Path(url)) for url in referenced_urls}
+    deadline = time.time() - grace_seconds
+    removed = 0
+
+    if not UPLOAD_DIR.exists():
+        return removed
+
+    for path in UPLOAD_DIR.rglob("*"):
+        if not path.is_file() or path.stat().st_mtime > deadline:
+            continue
+        if path.suffix != TEMP_SUFFIX and _blob_key(path) in referenced:
+            continue
+        path.unlink(missing_ok=True)
+        removed += 1
+
+    return removed
+
+
+async def collect_garbage(grace_seconds: int = settings.image_gc_grace_seconds) -> GarbageCollectionReport:
+    """
+    Удалить обложки без ссылок и осиротевшие файлы.
+
+    Args:
+        grace_seconds: Минимальный возраст файла/записи для удаления.
+
+    Returns:
+        GarbageCollectionReport: Сколько записей и файлов удалено.
+    """
+    older_than = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=grace_seconds)
+
+    async with AsyncSessionLocal() as session:
+        repository = ImageBlobRepository(session)
+        released = await repository.delete_unreferenced(older_than)
+        await session.commit()
+        referenced = await repository.get_referenced_urls()
+        # Страховка для обложек, загруженных до появления image_blobs
+        result = await session.execute(
+            select(BookModel.image_url).where(BookModel.image_url.is_not(None)).distinct()
+        )
+        referenced.update(result.scalars().all())
+
+    for url in released:
+        if url in referenced:
+            continue
+        # Файл мог быть повторно загружен после освобождения - тогда он свежий и остаётся
+        path = anyio.Path(url)
+        if await path.exists() and (await path.stat()).st_mtime < older_than.timestamp():
+            await anyio.to_thread.run_sync(delete_image, url)
+
+    orphans = await anyio.to_thread.run_sync(_remove_orphans, referenced, grace_seconds)
+    return GarbageCollectionReport(released_blobs=len(released), orphan_files=orphans)
+
+
+async def remove_released(urls: Iterable[str], grace_seconds: int = settings.image_gc_grace_seconds) -> int:
+    """
+    Удалить файлы обложек, освобождённых удалением книг.
+
+    Вызывается фоновой задачей после ответа на удаление: записи
+    image_blobs без ссылок удаляются сразу, файлы - только если они
+    старше grace-периода (свежий файл мог быть загружен заново).
+    Остальное подберёт периодическая сборка мусора.
+
+    Returns:
+        int: Число удалённых файлов.
+    """
+    urls = sorted({url for url in urls if url})
+    if not urls:
+        return 0
+
+    async with AsyncSessionLocal() as session:
+        released = await ImageBlobRepository(session).delete_unreferenced_urls(urls)
+        await session.commit()
+
+    deadline = time.time() - grace_seconds
+    removed = 0
+    for url in released:
+        path = anyio.Path(url)
+        if await path.exists() and (await path.stat()).st_mtime < deadline:
+            await anyio.to_thread.run_sync(delete_image, url)
+            removed += 1
+    return removed
+
+
+if __name__ == "__main__":
+    print(asyncio.run(collect_garbage()))
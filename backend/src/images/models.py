@@ -0,0 +1,25 @@
+"""Image blob ORM model."""
+
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+
+from src.core.base import Base
+
+
+class ImageBlobModel(Base):
+    """
+    Файл обложки в хранилище и число книг, которые на него ссылаются.
+
+    Файлы с refcount = 0 удаляет сборщик мусора (src.images.gc).
+    """
+
+    __tablename__ = "image_blobs"
+
+    url = Column(String, primary_key=True)
+    refcount = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
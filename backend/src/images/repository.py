@@ -0,0 +1,102 @@
+"""Image blob Repository - работа с БД."""
+
+import datetime
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from src.core.database import dialect_insert
+from src.images.models import ImageBlobModel
+
+
+class ImageBlobRepository:
+    """
+    Репозиторий счётчиков ссылок на файлы обложек.
+
+    Методы не коммитят: счётчик меняется в той же транзакции,
+    что и книга, которая ссылается на файл.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def acquire(self, url: Optional[str]) -> None:
+        """Увеличить счётчик ссылок на файл (создать запись при первой ссылке)."""
+        if not url:
+            return
+
+        stmt = dialect_insert(self.db)(ImageBlobModel).values(url=url, refcount=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ImageBlobModel.url],
+            set_={"refcount": ImageBlobModel.refcount + 1, "updated_at": func.now()},
+        )
+        await self.db.execute(stmt)
+
+    async def release(self, url: Optional[str]) -> None:
+        """Уменьшить счётчик ссылок на файл."""
+        if not url:
+            return
+
+        await self.db.execute(
+            update(ImageBlobModel)
+            .where(ImageBlobModel.url == url, ImageBlobModel.refcount > 0)
+            .values(refcount=ImageBlobModel.refcount - 1, updated_at=func.now())
+        )
+
+    async def release_many(self, urls: Iterable[str]) -> None:
+        """
+        Уменьшить счётчики ссылок сразу для многих файлов.
+
+        Одинаковые файлы (дедупликация) уменьшаются на число ссылок;
+        обычно это один UPDATE ... WHERE url IN (...).
+        """
+        by_decrement: Dict[int, List[str]] = {}
+        for url, count in Counter(url for url in urls if url).items():
+            by_decrement.setdefault(count, []).append(url)
+
+        for decrement, group in sorted(by_decrement.items()):
+            await self.db.execute(
+                update(ImageBlobModel)
+                .where(ImageBlobModel.url.in_(group), ImageBlobModel.refcount > 0)
+                .values(refcount=ImageBlobModel.refcount - decrement, updated_at=func.now())
+            )
+
+    async def get_referenced_urls(self) -> Set[str]:
+        """Файлы, на которые ссылается хотя бы одна книга."""
+        result = await self.db.execute(
+            select(ImageBlobModel.url).where(ImageBlobModel.refcount > 0)
+        )
+        return set(result.scalars().all())
+
+    async def delete_unreferenced_urls(self, urls: Sequence[str]) -> List[str]:
+        """
+        Удалить записи без ссылок среди `urls` (сразу после удаления книг).
+
+        Returns:
+            List[str]: URL файлов, на которые больше никто не ссылается.
+        """
+        if not urls:
+            return []
+        result = await self.db.execute(
+            delete(ImageBlobModel)
+            .where(ImageBlobModel.url.in_(urls), ImageBlobModel.refcount <= 0)
+            .returning(ImageBlobModel.url)
+        )
+        return list(result.scalars().all())
+
+    async def delete_unreferenced(self, older_than: datetime.datetime) -> List[str]:
+        """
+        Удалить записи без ссылок, не менявшиеся с `older_than`.
+
+        Returns:
+            List[str]: URL файлов, которые можно удалить с диска.
+        """
+        result = await self.db.execute(
+            delete(ImageBlobModel)
+            .where(ImageBlobModel.refcount <= 0, ImageBlobModel.updated_at < older_than)
+            .returning(ImageBlobModel.url)
+        )
+        return list(result.scalars().all())
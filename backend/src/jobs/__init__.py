@@ -0,0 +1,18 @@
+"""Jobs module - фоновые задачи после коммита."""
+
+from src.jobs.queue import Job, JobQueue, MemoryJobQueue, SQLiteJobQueue
+from src.jobs.registry import job_type
+from src.jobs.worker import JobWorker, enqueue, enqueue_periodically, start_worker, stop_worker
+
+__all__ = [
+    "Job",
+    "JobQueue",
+    "MemoryJobQueue",
+    "SQLiteJobQueue",
+    "JobWorker",
+    "job_type",
+    "enqueue",
+    "enqueue_periodically",
+    "start_worker",
+    "stop_worker",
+]
@@ -0,0 +1,39 @@
+"""
+Поставить задачу обслуживания вручную.
+
+    python -m src.jobs stats.rebuild
+    python -m src.jobs search.reindex
+
+С JOBS_BACKEND=sqlite задача попадает в общую очередь, и её выполнит
+запущенный сервер. Очередь в памяти принадлежит процессу сервера и
+снаружи недоступна, поэтому с JOBS_BACKEND=memory задача выполняется
+сразу в этом процессе.
+"""
+
+import argparse
+import asyncio
+
+import src.books  # noqa: F401 - роутер книг импортирует src.jobs.tasks; порядок как в src.main
+from src.core.config import settings
+from src.jobs import tasks
+from src.jobs.registry import get_job_type
+from src.jobs.worker import enqueue, stop_worker
+
+
+async def main(name: str) -> None:
+    if settings.jobs_backend == "memory":
+        await get_job_type(name).handler()
+        print(f"Job {name} done")
+        return
+    try:
+        await enqueue(name)
+    finally:
+        await stop_worker()
+    print(f"Job {name} enqueued")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("name", choices=tasks.MAINTENANCE_JOBS)
+    args = parser.parse_args()
+    asyncio.run(main(args.name))
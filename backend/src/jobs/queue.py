@@ -0,0 +1,234 @@
+"""
+Очереди фоновых задач.
+
+`MemoryJobQueue` держит задачи в памяти процесса: быстро, но задачи
+теряются при перезапуске (миниатюры приложение ставит заново при старте). `SQLiteJobQueue` хранит их в отдельном файле
+SQLite (не в основной БД, чтобы не конкурировать за её блокировку
+записи): задачи переживают перезапуск, а задача, взятая упавшим
+процессом, возвращается в очередь по истечении `lock_timeout`.
+"""
+
+import abc
+import asyncio
+import heapq
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import anyio
+
+
+@dataclass
+class Job:
+    """Задача: тип, параметры обработчика и номер попытки."""
+
+    name: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    # Время (time.time()), раньше которого задачу не выполнять
+    run_at: float = 0.0
+    id: Optional[int] = None
+
+
+class JobQueue(abc.ABC):
+    """Интерфейс очереди задач."""
+
+    @abc.abstractmethod
+    async def put(self, job: Job) -> None:
+        """Добавить задачу."""
+
+    @abc.abstractmethod
+    async def get(self) -> Job:
+        """Дождаться задачи, время которой наступило, и взять её в работу."""
+
+    async def done(self, job: Job) -> None:
+        """Задача выполнена."""
+
+    @abc.abstractmethod
+    async def retry(self, job: Job, delay: float, error: str) -> None:
+        """Вернуть задачу в очередь для повтора через `delay` секунд."""
+
+    async def fail(self, job: Job, error: str) -> None:
+        """Задача исчерпала попытки."""
+
+    @abc.abstractmethod
+    async def size(self) -> int:
+        """Число задач, ожидающих выполнения."""
+
+    async def close(self) -> None:
+        """Освободить ресурсы очереди."""
+
+
+class MemoryJobQueue(JobQueue):
+    """Очередь в памяти процесса (куча по времени запуска)."""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Job]] = []
+        self._sequence = itertools.count()
+        self._changed = asyncio.Event()
+
+    async def put(self, job: Job) -> None:
+        heapq.heappush(self._heap, (job.run_at, next(self._sequence), job))
+        self._changed.set()
+
+    async def get(self) -> Job:
+        while True:
+            timeout = None
+            if self._heap:
+                timeout = self._heap[0][0] - time.time()
+                if timeout <= 0:
+                    return heapq.heappop(self._heap)[2]
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def retry(self, job: Job, delay: float, error: str) -> None:
+        job.run_at = time.time() + delay
+        await self.put(job)
+
+    async def size(self) -> int:
+        return len(self._heap)
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    Очередь в файле SQLite.
+
+    Запросы выполняются в потоке через одно соединение под блокировкой.
+    Задачи забираются транзакцией BEGIN IMMEDIATE, поэтому одну очередь
+    могут разбирать несколько процессов. Новые задачи из этого процесса
+    будят обработчиков сразу, из других процессов - при опросе раз в
+    `poll_interval` секунд.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            run_at REAL NOT NULL,
+            locked_until REAL,
+            failed INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS ix_jobs_ready ON jobs (failed, run_at, id);
+    """
+
+    def __init__(self, path: str, poll_interval: float = 1.0, lock_timeout: float = 600.0):
+        self.poll_interval = poll_interval
+        self.lock_timeout = lock_timeout
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(self.SCHEMA)
+        self._changed = asyncio.Event()
+
+    async def _run(self, function, *args):
+        def locked():
+            with self._lock:
+                return function(*args)
+        return await anyio.to_thread.run_sync(locked)
+
+    def _insert(self, job: Job) -> None:
+        self._connection.execute(
+            "INSERT INTO jobs (name, payload, attempts, run_at) VALUES (?, ?, ?, ?)",
+            (job.name, json.dumps(job.payload), job.attempts, job.run_at),
+        )
+
+    def _claim(self) -> Optional[Job]:
+        now = time.time()
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Задачи с истёкшей блокировкой брал процесс, который не завершил их
+            row = connection.execute(
+                """
+                SELECT id, name, payload, attempts, run_at FROM jobs
+                WHERE failed = 0 AND run_at <= ? AND (locked_until IS NULL OR locked_until < ?)
+                ORDER BY run_at, id LIMIT 1
+                """,
+                (now, now),
+            ).fetchone()
+            if row is not None:
+                connection.execute("UPDATE jobs SET locked_until = ? WHERE id = ?", (now + self.lock_timeout, row[0]))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        job_id, name, payload, attempts, run_at = row
+        return Job(name=name, payload=json.loads(payload), attempts=attempts, run_at=run_at, id=job_id)
+
+    def _execute(self, sql: str, *parameters: Any) -> Any:
+        return self._connection.execute(sql, parameters).fetchone()
+
+    async def put(self, job: Job) -> None:
+        await self._run(self._insert, job)
+        self._changed.set()
+
+    async def get(self) -> Job:
+        while True:
+            self._changed.clear()
+            job = await self._run(self._claim)
+            if job is not None:
+                return job
+            try:
+                await asyncio.wait_for(self._changed.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def done(self, job: Job) -> None:
+        await self._run(self._execute, "DELETE FROM jobs WHERE id = ?", job.id)
+
+    async def retry(self, job: Job, delay: float, error: str) -> None:
+        await self._run(
+            self._execute,
+            "UPDATE jobs SET attempts = ?, run_at = ?, locked_until = NULL, last_error = ? WHERE id = ?",
+            job.attempts, time.time() + delay, error, job.id,
+        )
+
+    async def fail(self, job: Job, error: str) -> None:
+        # Строка остаётся для разбора: SELECT * FROM jobs WHERE failed = 1
+        await self._run(
+            self._execute,
+            "UPDATE jobs SET attempts = ?, failed = 1, locked_until = NULL, last_error = ? WHERE id = ?",
+            job.attempts, error, job.id,
+        )
+
+    async def size(self) -> int:
+        now = time.time()
+        row = await self._run(
+            self._execute,
+            "SELECT count(*) FROM jobs WHERE failed = 0 AND (locked_until IS NULL OR locked_until < ?)",
+            now,
+        )
+        return row[0]
+
+    async def close(self) -> None:
+        await self._run(self._connection.close)
+
+
+def create_queue(backend: str, path: str, poll_interval: float = 1.0, lock_timeout: float = 600.0) -> JobQueue:
+    """
+    Очередь по имени бэкенда.
+
+    Args:
+        backend: "memory" или "sqlite".
+        path: Файл очереди для "sqlite".
+
+    Raises:
+        ValueError: Если бэкенд неизвестен.
+    """
+    if backend == "memory":
+        return MemoryJobQueue()
+    if backend == "sqlite":
+        return SQLiteJobQueue(path, poll_interval=poll_interval, lock_timeout=lock_timeout)
+    raise ValueError(f"Unknown jobs backend: {backend}")
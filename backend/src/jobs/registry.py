@@ -0,0 +1,38 @@
+"""Реестр типов фоновых задач."""
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+Handler = Callable[..., Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class JobType:
+    """Тип задачи: обработчик и предел попыток (None - из настроек)."""
+
+    name: str
+    handler: Handler
+    max_attempts: Optional[int] = None
+
+
+_job_types: Dict[str, JobType] = {}
+
+
+def job_type(name: str, max_attempts: Optional[int] = None) -> Callable[[Handler], Handler]:
+    """
+    Декоратор: зарегистрировать async-обработчик задачи `name`.
+
+    Обработчик получает payload задачи именованными аргументами;
+    payload должен сериализоваться в JSON (для очереди в SQLite).
+    """
+    def register(handler: Handler) -> Handler:
+        if name in _job_types:
+            raise ValueError(f"Job type {name} is already registered")
+        _job_types[name] = JobType(name, handler, max_attempts)
+        return handler
+    return register
+
+
+def get_job_type(name: str) -> Optional[JobType]:
+    """Тип задачи по имени или None, если обработчик не зарегистрирован."""
+    return _job_types.get(name)
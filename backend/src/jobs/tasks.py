@@ -0,0 +1,100 @@
+"""
+Типы фоновых задач.
+
+Модуль импортируется при запуске приложения (src.main), чтобы
+обработчики были зарегистрированы до старта JobWorker.
+
+`images.collect_garbage` ставится по расписанию (IMAGE_GC_INTERVAL_SECONDS),
+`stats.rebuild` и `search.reindex` - вручную: `python -m src.jobs <name>`.
+"""
+
+import logging
+from typing import List, Optional
+
+from sqlalchemy import select, text
+
+from src.books import search
+from src.books.models import BookModel
+from src.books.repository import BookRepository
+from src.common.utils.image import create_variants
+from src.core.database import AsyncSessionLocal, WriterSessionLocal
+from src.images import gc as image_gc
+from src.jobs.registry import job_type
+from src.jobs.worker import enqueue
+from src.stats.rebuild import rebuild_stats
+
+logger = logging.getLogger(__name__)
+
+THUMBNAILS = "images.thumbnails"
+REMOVE_RELEASED = "images.remove_released"
+COLLECT_GARBAGE = "images.collect_garbage"
+REBUILD_STATS = "stats.rebuild"
+REINDEX_SEARCH = "search.reindex"
+
+# Задачи обслуживания без параметров, которые можно поставить из командной строки
+MAINTENANCE_JOBS = (COLLECT_GARBAGE, REBUILD_STATS, REINDEX_SEARCH)
+
+
+@job_type(THUMBNAILS)
+async def generate_thumbnails(book_id: int, image_url: str, owner_id: Optional[int] = None) -> None:
+    """Сгенерировать миниатюры обложки и записать их в книгу (если обложка не сменилась)."""
+    try:
+        variants = await create_variants(image_url)
+    except ValueError:
+        # Файл не декодируется - повтор не поможет, книга остаётся с оригиналом
+        logger.warning("Cover %s of book %s is not a valid image", image_url, book_id)
+        return
+
+    async with AsyncSessionLocal() as session:
+        await BookRepository(session, owner_id=owner_id).set_image_variants(book_id, image_url, variants)
+
+
+@job_type(REMOVE_RELEASED)
+async def remove_released_images(urls: List[str]) -> None:
+    """Удалить файлы обложек, на которые больше не ссылается ни одна книга."""
+    await image_gc.remove_released(urls)
+
+
+@job_type(COLLECT_GARBAGE, max_attempts=1)
+async def collect_image_garbage() -> None:
+    """Полная сборка мусора в хранилище обложек (осиротевшие файлы)."""
+    logger.info("Image GC: %s", await image_gc.collect_garbage())
+
+
+@job_type(REBUILD_STATS, max_attempts=1)
+async def rebuild_book_stats() -> None:
+    """Пересчитать book_stats по таблице books."""
+    logger.info("Rebuilt stats for %d books", await rebuild_stats())
+
+
+@job_type(REINDEX_SEARCH, max_attempts=1)
+async def reindex_search() -> None:
+    """Пересобрать полнотекстовый индекс FTS5 (на Postgres индексы pg_trgm ведёт сама СУБД)."""
+    async with WriterSessionLocal() as session:
+        if session.get_bind().dialect.name != "sqlite":
+            return
+        await session.execute(text(search.FTS_REBUILD))
+        await session.commit()
+
+
+async def requeue_missing_thumbnails() -> int:
+    """
+    Поставить заново миниатюры книг с обложкой, но без image_variants.
+
+    Очередь в памяти теряет задачи при перезапуске, поэтому при старте
+    один из воркеров вызывает эту функцию. Сюда же попадут обложки,
+    которые не декодируются: их задача завершится сразу, без повторов.
+
+    Returns:
+        int: Число поставленных задач.
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(BookModel.id, BookModel.image_url, BookModel.owner_id)
+            .where(BookModel.image_url.is_not(None), BookModel.image_variants.is_(None))
+        )
+        rows = result.all()
+
+    for book_id, image_url, owner_id in rows:
+        await enqueue(THUMBNAILS, book_id=book_id, image_url=image_url, owner_id=owner_id)
+    return len(rows)
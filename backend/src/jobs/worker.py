@@ -0,0 +1,163 @@
+"""
+Обработчик фоновых задач и очередь процесса.
+
+`JobWorker` разбирает очередь в `concurrency` параллельных задачах
+asyncio. Упавшая задача повторяется с экспоненциальной задержкой
+(со случайным разбросом, чтобы повторы не шли пачкой), после
+`max_attempts` попыток - помечается неуспешной.
+
+Маршруты ставят задачи через `enqueue` после коммита и сразу отвечают.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, List, Optional
+
+from src.common import metrics
+from src.core.config import settings
+from src.jobs.queue import Job, JobQueue, create_queue
+from src.jobs.registry import get_job_type
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """Задержка перед повтором `attempt` (1, 2, ...): base * 2^(attempt-1) с разбросом ±50%, не больше maximum."""
+    delay = min(maximum, base * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1.5)
+
+
+class JobWorker:
+    """Пул обработчиков одной очереди."""
+
+    def __init__(
+            self,
+            queue: JobQueue,
+            concurrency: int = 4,
+            max_attempts: int = 5,
+            retry_base_seconds: float = 1.0,
+            retry_max_seconds: float = 300.0,
+    ):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Запустить обработчики в текущем event loop."""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        """Остановить обработчики; прерванные задачи очереди SQLite будут повторены после lock_timeout."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _consume(self) -> None:
+        while True:
+            job = await self.queue.get()
+            await self.run(job)
+
+    async def run(self, job: Job) -> None:
+        """Выполнить задачу и отметить результат в очереди."""
+        job_type = get_job_type(job.name)
+        if job_type is None:
+            logger.error("Unknown job type %s, dropping job", job.name)
+            metrics.jobs_total.inc(job.name, "failed")
+            await self.queue.fail(job, "unknown job type")
+            return
+
+        job.attempts += 1
+        metrics.jobs_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await job_type.handler(**job.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            max_attempts = job_type.max_attempts or self.max_attempts
+            if job.attempts >= max_attempts:
+                logger.exception("Job %s failed after %d attempts", job.name, job.attempts)
+                metrics.jobs_total.inc(job.name, "failed")
+                await self.queue.fail(job, error)
+            else:
+                delay = backoff_delay(job.attempts, self.retry_base_seconds, self.retry_max_seconds)
+                logger.warning("Job %s failed (attempt %d), retry in %.1fs: %s", job.name, job.attempts, delay, error)
+                metrics.jobs_total.inc(job.name, "retried")
+                await self.queue.retry(job, delay, error)
+        else:
+            metrics.jobs_total.inc(job.name, "succeeded")
+            await self.queue.done(job)
+        finally:
+            metrics.jobs_in_flight.dec()
+            metrics.job_duration_seconds.observe(time.perf_counter() - started, job.name)
+
+
+# Очередь и обработчики процесса
+job_queue: Optional[JobQueue] = None
+job_worker: Optional[JobWorker] = None
+
+
+def _get_queue() -> JobQueue:
+    global job_queue
+    if job_queue is None:
+        job_queue = create_queue(
+            settings.jobs_backend,
+            settings.jobs_sqlite_path,
+            poll_interval=settings.jobs_poll_interval_seconds,
+            lock_timeout=settings.jobs_lock_timeout_seconds,
+        )
+    return job_queue
+
+
+async def enqueue(name: str, **payload: Any) -> None:
+    """
+    Поставить задачу `name` в очередь процесса.
+
+    Вызывается после коммита: обработчик может начать работу раньше,
+    чем запрос вернёт ответ, и должен видеть закоммиченные данные.
+    """
+    await _get_queue().put(Job(name=name, payload=payload, run_at=time.time()))
+
+
+async def enqueue_periodically(name: str, interval_seconds: float, **payload: Any) -> None:
+    """Ставить задачу `name` в очередь раз в `interval_seconds` (для фоновой задачи в lifespan)."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await enqueue(name, **payload)
+        except Exception:
+            logger.exception("Failed to enqueue periodic job %s", name)
+
+
+def start_worker() -> JobWorker:
+    """Запустить обработчики очереди процесса (из lifespan)."""
+    global job_worker
+    if job_worker is None:
+        job_worker = JobWorker(
+            _get_queue(),
+            concurrency=settings.jobs_concurrency,
+            max_attempts=settings.jobs_max_attempts,
+            retry_base_seconds=settings.jobs_retry_base_seconds,
+            retry_max_seconds=settings.jobs_retry_max_seconds,
+        )
+    job_worker.start()
+    return job_worker
+
+
+async def stop_worker() -> None:
+    """Остановить обработчики и закрыть очередь процесса."""
+    global job_queue, job_worker
+    if job_worker is not None:
+        await job_worker.stop()
+        job_worker = None
+    if job_queue is not None:
+        await job_queue.close()
+        job_queue = None
@@ -1,28 +1,42 @@
 """Main FastAPI application."""
 
+import asyncio
+import contextlib
 from contextlib import asynccontextmanager
-from pathlib import Path
+
+import anyio
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi.responses import RedirectResponse, JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
-from fastapi.staticfiles import StaticFiles
 
+from src.core.bootstrap import UPLOAD_DIRS, bootstrap, try_hold_lock
 from src.core.config import settings
-from src.core.database import engine
-from src.core.base import Base
+from src.core.database import engine, read_engine
 from src.books.router import router as books_router
+from src.user.router import router as user_router
+from src.common import instrumentation, metrics
+from src.common.utils.body_limit import BodySizeLimitMiddleware
+from src.common.utils.compression import CompressionMiddleware
+from src.common.utils.image import MAX_FILE_SIZE, shutdown_image_workers
+from src.common.utils.static import CoverStaticFiles
+from src.jobs import enqueue_periodically, start_worker, stop_worker
+from src.jobs.tasks import COLLECT_GARBAGE, requeue_missing_thumbnails
+from src.user.security import PasswordHasherSaturatedError, password_hasher
 
 # Импортируем модели для инициализации Base.metadata
 from src.books.models import BookModel  # noqa: F401
 from src.genres.models import GenreModel  # noqa: F401
+from src.images.models import ImageBlobModel  # noqa: F401
+from src.stats.models import BookStatsModel  # noqa: F401
+from src.user.models import UserModel  # noqa: F401
 
+# Регистрируем типы фоновых задач до запуска обработчиков
+import src.jobs.tasks  # noqa: F401
 
-# Создать директорию для загрузок, если её нет
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
-(UPLOAD_DIR / "images").mkdir(exist_ok=True)
+# Запас на текстовые поля и разметку multipart сверх размера обложки
+FORM_FIELDS_MAX_SIZE = 64 * 1024
 
 
 @asynccontextmanager
@@ -39,13 +53,42 @@ async def lifespan(app: FastAPI):
     
     Для создания новой миграции:
         alembic revision --autogenerate -m "описание изменений"
+
+    Каталоги загрузок и схема (DB_SCHEMA_INIT) готовятся под файловой
+    блокировкой, поэтому одновременный старт нескольких воркеров безопасен.
+    При `python main.py --production` это уже сделано до запуска воркеров.
     """
-    # Создаем все таблицы (только для dev, не изменяет существующие таблицы)
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Каталоги и схема; create_all - только для dev: создаёт пустую базу, существующую мигрирует
+    await anyio.to_thread.run_sync(bootstrap, settings.db_schema_init)
+
+    # Обработчики фоновых задач (миниатюры, удаление обложек, пересчёты)
+    start_worker()
+
+    # Расписание и восстановление очереди: только в одном воркере
+    gc_task = None
+    leader_lock = try_hold_lock("jobs-leader")
+    if leader_lock is not None:
+        if settings.jobs_backend == "memory":
+            # Задачи очереди в памяти не пережили перезапуск
+            await requeue_missing_thumbnails()
+        if settings.image_gc_interval_seconds > 0:
+            gc_task = asyncio.create_task(
+                enqueue_periodically(COLLECT_GARBAGE, settings.image_gc_interval_seconds)
+            )
     
     yield
 
+    if gc_task is not None:
+        gc_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await gc_task
+    if leader_lock is not None:
+        leader_lock.close()
+
+    await stop_worker()
+    shutdown_image_workers()
+    password_hasher.shutdown()
+
 
 # Создание приложения FastAPI
 app = FastAPI(
@@ -56,6 +99,13 @@ app = FastAPI(
     redoc_url="/api/redoc",
 )
 
+# Предел тела создания книги (обложка и поля формы) до разбора multipart:
+# внутренний слой, чтобы ответ 413 прошёл через CORS
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={("POST", "/api/v1/book"): MAX_FILE_SIZE + FORM_FIELDS_MAX_SIZE},
+)
+
 # Настройка CORS
 app.add_middleware(
     CORSMiddleware,
@@ -65,11 +115,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Монтируем статические файлы для изображений (до подключения роутеров)
-app.mount("/uploads", StaticFiles(directory=str(UPLOAD_DIR.absolute())), name="uploads")
+# Сжатие ответов (добавлено после CORS - внешний слой)
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        content_types=settings.compression_content_types,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+        cached_paths=settings.compression_cached_paths,
+        cache_max_entries=settings.compression_cache_max_entries,
+    )
+
+# Метрики: самый внешний слой, чтобы в латентность входило и сжатие
+if settings.metrics_enabled:
+    app.add_middleware(instrumentation.MetricsMiddleware)
+    for _engine in {engine, read_engine}:
+        instrumentation.instrument_engine(_engine, settings.metrics_slow_query_ms)
+    metrics.register_collector(instrumentation.collect_cache_metrics)
+    metrics.register_collector(lambda: instrumentation.collect_password_hasher_metrics(password_hasher))
+
+# Монтируем статические файлы для изображений (до подключения роутеров).
+# Имена файлов неизменяемы, поэтому отдаём их с immutable-кэшированием.
+# Каталог создаётся в lifespan (bootstrap), а не при импорте модуля.
+app.mount(
+    "/uploads",
+    CoverStaticFiles(directory=str(UPLOAD_DIRS[0].absolute()), check_dir=False),
+    name="uploads",
+)
 
 # Подключение роутеров модулей
 app.include_router(books_router, prefix="/api/v1/book", tags=["book"])
+app.include_router(user_router, prefix="/api/v1/auth", tags=["auth"])
 
 
 @app.exception_handler(RequestValidationError)
@@ -92,6 +169,38 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+@app.exception_handler(PasswordHasherSaturatedError)
+async def password_hasher_saturated_handler(request: Request, exc: PasswordHasherSaturatedError):
+    """
+    Пул хэширования паролей переполнен.
+    Возвращает 503 с Retry-After, чтобы клиент повторил запрос позже.
+
+    Args:
+        request: HTTP запрос.
+        exc: Исключение переполнения очереди.
+
+    Returns:
+        JSONResponse: Ответ с деталями ошибки.
+    """
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def get_metrics():
+        """
+        Метрики процесса в текстовом формате Prometheus.
+
+        Returns:
+            Response: text/plain; version=0.0.4.
+        """
+        return Response(content=metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 async def root():
     """
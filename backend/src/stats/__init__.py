@@ -0,0 +1,6 @@
+"""Stats module - агрегаты по книгам пользователя."""
+
+from src.stats.models import BookStatsModel
+from src.stats.repository import BookStatsRepository
+
+__all__ = ["BookStatsModel", "BookStatsRepository"]
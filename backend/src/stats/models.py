@@ -0,0 +1,26 @@
+"""Book stats ORM model."""
+
+from sqlalchemy import Column, Integer, String
+
+from src.core.base import Base
+
+
+class BookStatsModel(Base):
+    """
+    Счётчик книг владельца по одному значению измерения.
+
+    Например (owner_key=3, dimension="genre", value="Роман", count=12).
+    Строки меняются в той же транзакции, что и книги, поэтому статистика
+    читается по первичному ключу без сканирования books.
+    Пересчёт с нуля: python -m src.stats.rebuild
+    """
+
+    __tablename__ = "book_stats"
+
+    # owner_id книги; 0 - общий каталог (в первичном ключе не может быть NULL)
+    owner_key = Column(Integer, primary_key=True)
+    # status / genre / month
+    dimension = Column(String, primary_key=True)
+    # Значение измерения; "" - не задано (книга без статуса или жанра)
+    value = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0, server_default="0")
@@ -0,0 +1,32 @@
+"""
+Пересчёт агрегатов book_stats с нуля по таблице books.
+
+Нужен после ручных правок books в обход API или если счётчики
+разошлись с данными. Весь пересчёт - одна транзакция.
+
+Запуск вручную:
+    python -m src.stats.rebuild
+"""
+
+import asyncio
+
+from src.core.config import settings
+from src.core.database import WriterSessionLocal
+from src.stats.repository import rebuild
+
+
+async def rebuild_stats() -> int:
+    """
+    Пересчитать статистику всех пользователей.
+
+    Returns:
+        int: Число учтённых книг.
+    """
+    async with WriterSessionLocal() as session:
+        total = await rebuild(session, settings.export_batch_size)
+        await session.commit()
+    return total
+
+
+if __name__ == "__main__":
+    print(f"Rebuilt stats for {asyncio.run(rebuild_stats())} books")
@@ -0,0 +1,137 @@
+"""Book stats Repository - работа с БД."""
+
+import datetime
+from collections import Counter
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import dialect_insert
+from src.stats.models import BookStatsModel
+
+STATUS = "status"
+GENRE = "genre"
+MONTH = "month"
+
+def owner_key(owner_id: Optional[int]) -> int:
+    """Ключ владельца в book_stats (0 - общий каталог)."""
+    return owner_id or 0
+
+
+def month_of(created_at: Optional[datetime.datetime]) -> str:
+    """
+    Месяц добавления книги в виде YYYY-MM (UTC).
+
+    Книга без даты ещё не вставлена: created_at проставит сервер БД
+    текущим временем, поэтому берётся текущий месяц.
+    """
+    if created_at is None:
+        created_at = datetime.datetime.now(datetime.timezone.utc)
+    elif created_at.tzinfo is not None:
+        created_at = created_at.astimezone(datetime.timezone.utc)
+    return created_at.strftime("%Y-%m")
+
+
+def dimension_value(value: Any) -> str:
+    """Значение измерения для book_stats ("" - не задано)."""
+    if isinstance(value, Enum):
+        value = value.value
+    return value or ""
+
+
+def book_keys(book: Mapping[str, Any]) -> List[Tuple[str, str]]:
+    """Измерения, в которых учитывается книга (словарь с полями status, genre, created_at)."""
+    return [
+        (STATUS, dimension_value(book.get("status"))),
+        (GENRE, dimension_value(book.get("genre"))),
+        (MONTH, month_of(book.get("created_at"))),
+    ]
+
+
+class BookStatsRepository:
+    """
+    Репозиторий агрегатов по книгам.
+
+    Методы изменения не коммитят: счётчики меняются в той же
+    транзакции, что и книги.
+    """
+
+    def __init__(self, db: AsyncSession, owner_id: Optional[int] = None):
+        self.db = db
+        self.owner_key = owner_key(owner_id)
+
+    async def add(self, books: Iterable[Mapping[str, Any]], sign: int = 1) -> None:
+        """Учесть добавленные (sign=1) или удалённые (sign=-1) книги."""
+        delta: Counter = Counter()
+        for book in books:
+            for key in book_keys(book):
+                delta[key] += sign
+        await self.apply(delta)
+
+    async def apply(self, delta: Counter) -> None:
+        """Применить изменения счётчиков {(dimension, value): изменение} одним INSERT ... ON CONFLICT DO UPDATE."""
+        values = [
+            {"owner_key": self.owner_key, "dimension": dimension, "value": value, "count": change}
+            for (dimension, value), change in sorted(delta.items())
+            if change
+        ]
+        if not values:
+            return
+
+        stmt = dialect_insert(self.db)(BookStatsModel).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BookStatsModel.owner_key, BookStatsModel.dimension, BookStatsModel.value],
+            set_={"count": BookStatsModel.count + stmt.excluded.count},
+        )
+        await self.db.execute(stmt)
+
+    async def get(self) -> Dict[str, Dict[str, int]]:
+        """
+        Счётчики владельца по измерениям.
+
+        Returns:
+            Dict[str, Dict[str, int]]: {dimension: {value: count}}, только ненулевые.
+        """
+        result = await self.db.execute(
+            select(BookStatsModel.dimension, BookStatsModel.value, BookStatsModel.count)
+            .where(BookStatsModel.owner_key == self.owner_key, BookStatsModel.count > 0)
+        )
+        stats: Dict[str, Dict[str, int]] = {STATUS: {}, GENRE: {}, MONTH: {}}
+        for dimension, value, count in result:
+            stats.setdefault(dimension, {})[value] = count
+        return stats
+
+
+async def rebuild(db: AsyncSession, batch_size: int) -> int:
+    """
+    Пересчитать агрегаты всех владельцев по таблице books (без коммита).
+
+    Returns:
+        int: Число учтённых книг.
+    """
+    # Импорт здесь: books.repository сам зависит от этого модуля
+    from src.books.models import BookModel
+
+    counts: Counter = Counter()
+    total = 0
+    result = await db.stream(
+        select(BookModel.owner_id, BookModel.status, BookModel.genre, BookModel.created_at)
+        .execution_options(yield_per=batch_size)
+    )
+    async for rows in result.partitions():
+        for owner_id, status, genre, created_at in rows:
+            book = {"status": status, "genre": genre, "created_at": created_at}
+            for dimension, value in book_keys(book):
+                counts[owner_key(owner_id), dimension, value] += 1
+        total += len(rows)
+
+    await db.execute(delete(BookStatsModel))
+    values = [
+        {"owner_key": key, "dimension": dimension, "value": value, "count": count}
+        for (key, dimension, value), count in counts.items()
+    ]
+    if values:
+        await db.execute(insert(BookStatsModel), values)
+    return total
@@ -0,0 +1,18 @@
+"""User module."""
+
+from src.user.models import UserModel
+from src.user.schemas import TokenPublic, UserCreate, UserLogin, UserPublic
+from src.user.repository import UserRepository
+from src.user.service import UserService
+from src.user.router import router
+
+__all__ = [
+    "UserModel",
+    "TokenPublic",
+    "UserCreate",
+    "UserLogin",
+    "UserPublic",
+    "UserRepository",
+    "UserService",
+    "router",
+]
@@ -0,0 +1,47 @@
+"""Зависимости FastAPI для аутентификации."""
+
+from typing import Optional
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from src.user.tokens import InvalidTokenError, decode_access_token
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def get_optional_user_id(
+        credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+) -> Optional[int]:
+    """
+    ID пользователя из заголовка `Authorization: Bearer`, если он передан.
+
+    Raises:
+        HTTPException: 401, если токен передан, но недействителен.
+    """
+    if credentials is None:
+        return None
+    try:
+        return decode_access_token(credentials.credentials)
+    except InvalidTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def get_current_user_id(user_id: Optional[int] = Depends(get_optional_user_id)) -> int:
+    """
+    ID аутентифицированного пользователя.
+
+    Raises:
+        HTTPException: 401, если токен не передан.
+    """
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Требуется аутентификация",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user_id
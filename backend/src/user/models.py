@@ -1,9 +1,15 @@
+"""User ORM model."""
+
 from sqlalchemy import Column, Integer, String
+
 from src.core.base import Base
 
+
 class UserModel(Base):
+    """Модель пользователя. В `password` хранится bcrypt-хэш, а не пароль."""
+
     __tablename__ = "users"
-    
+
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
-    password = Column(String, nullable=False)
\ No newline at end of file
+    password = Column(String, nullable=False)
@@ -0,0 +1,43 @@
+"""User Repository - работа с БД."""
+
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.user.models import UserModel
+
+
+class UserRepository:
+    """Репозиторий для работы с пользователями в БД."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_email(self, email: str) -> Optional[UserModel]:
+        """Найти пользователя по email."""
+        result = await self.db.execute(select(UserModel).where(UserModel.email == email))
+        return result.scalar_one_or_none()
+
+    async def create(self, email: str, password_hash: str) -> Optional[UserModel]:
+        """
+        Создать пользователя.
+
+        Returns:
+            Optional[UserModel]: Новый пользователь или None, если email уже занят.
+        """
+        user = UserModel(email=email, password=password_hash)
+        self.db.add(user)
+        try:
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            return None
+        await self.db.refresh(user)
+        return user
+
+    async def update_password_hash(self, user_id: int, password_hash: str) -> None:
+        """Сохранить новый хэш пароля (после смены параметров bcrypt)."""
+        await self.db.execute(update(UserModel).where(UserModel.id == user_id).values(password=password_hash))
+        await self.db.commit()
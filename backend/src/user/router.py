@@ -0,0 +1,70 @@
+"""Auth API endpoints."""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import get_db
+from src.user.dependencies import get_current_user_id
+from src.user.repository import UserRepository
+from src.user.schemas import TokenPublic, UserCreate, UserLogin, UserPublic
+from src.user.service import UserService
+
+router = APIRouter()
+
+
+def get_user_service(db: AsyncSession = Depends(get_db)) -> UserService:
+    """Dependency для получения UserService."""
+    repository = UserRepository(db)
+    return UserService(repository)
+
+
+@router.post("/register", response_model=UserPublic, status_code=status.HTTP_201_CREATED)
+async def register(
+        user: UserCreate,
+        service: UserService = Depends(get_user_service)
+):
+    """
+    Зарегистрировать пользователя.
+
+    Returns:
+        UserPublic: Созданный пользователь.
+    """
+    try:
+        return await service.register(user)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.post("/login", response_model=TokenPublic)
+async def login(
+        credentials: UserLogin,
+        service: UserService = Depends(get_user_service)
+):
+    """
+    Войти по email и паролю.
+
+    Returns:
+        TokenPublic: Токен для заголовка `Authorization: Bearer <token>`.
+    """
+    try:
+        return await service.login(credentials)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get("/me")
+async def me(user_id: int = Depends(get_current_user_id)):
+    """
+    ID текущего пользователя по токену (без обращения к БД).
+
+    Returns:
+        dict: {"id": user_id}.
+    """
+    return {"id": user_id}
@@ -1,11 +1,34 @@
-from pydantic import BaseModel, EmailStr, ConfigDict
+"""User Pydantic schemas."""
+
+from pydantic import BaseModel, EmailStr, ConfigDict, Field
+
 
 class UserCreate(BaseModel):
+    """Схема регистрации."""
+
+    email: EmailStr
+    password: str = Field(min_length=8)
+
+
+class UserLogin(BaseModel):
+    """Схема входа."""
+
     email: EmailStr
     password: str
 
+
 class UserPublic(BaseModel):
+    """Схема пользователя для публичного API."""
+
     id: int
     email: EmailStr
-    
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TokenPublic(BaseModel):
+    """Токен доступа."""
+
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int
@@ -1,9 +1,185 @@
-from passlib.context import CryptContext
+"""Хэширование паролей bcrypt вне event loop."""
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple, TypeVar
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+import bcrypt
 
-def verify_password(password: str, hashed: str) -> bool:
-    return pwd_context.verify(password, hashed)
+from src.core.config import settings
+
+T = TypeVar("T")
+
+# bcrypt учитывает только первые 72 байта пароля, длиннее - ошибка, а не молчаливая обрезка
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+
+class PasswordHasherSaturatedError(RuntimeError):
+    """Очередь хэширования переполнена - запрос нужно повторить позже (HTTP 503)."""
+
+
+@dataclass
+class PasswordHasherStats:
+    """Метрики пула хэширования."""
+
+    in_flight: int = 0
+    queue_depth: int = 0
+    rejected: int = 0
+    hash_count: int = 0
+    hash_seconds_total: float = 0.0
+    verify_count: int = 0
+    verify_seconds_total: float = 0.0
+    wait_seconds_total: float = 0.0
+    max_latency_seconds: float = 0.0
+
+
+class PasswordHasher:
+    """
+    Асинхронный bcrypt в ограниченном пуле потоков.
+
+    bcrypt освобождает GIL на время вычисления, поэтому потоки дают
+    настоящий параллелизм, а event loop не блокируется на ~250 мс.
+    Число ожидающих задач ограничено `max_pending`: при переполнении
+    сразу выбрасывается PasswordHasherSaturatedError, а не копится
+    очередь с растущей задержкой.
+    """
+
+    def __init__(self, rounds: int, workers: int, max_pending: int):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._stats = PasswordHasherStats()
+        # Хэш для проверки при неизвестном email (создаётся при первом обращении)
+        self._dummy_hash: Optional[str] = None
+
+    async def hash(self, password: str) -> str:
+        """Захэшировать пароль с текущим cost factor."""
+        secret = self._encode(password)
+        rounds = self.rounds
+        hashed = await self._submit(lambda: bcrypt.hashpw(secret, bcrypt.gensalt(rounds)), "hash")
+        return hashed.decode()
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """Проверить пароль по хэшу."""
+        try:
+            secret = self._encode(password)
+        except ValueError:
+            return False
+        try:
+            return await self._submit(lambda: bcrypt.checkpw(secret, hashed.encode()), "verify")
+        except ValueError:
+            # Не bcrypt-хэш (повреждённая запись)
+            return False
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """
+        Проверить пароль и, если хэш создан с другими параметрами, перехэшировать.
+
+        Returns:
+            Tuple[bool, Optional[str]]: Результат проверки и новый хэш,
+                который нужно сохранить (None - хэш актуален).
+        """
+        if not await self.verify(password, hashed):
+            return False, None
+        if self.needs_rehash(hashed):
+            return True, await self.hash(password)
+        return True, None
+
+    async def verify_dummy(self, password: str) -> None:
+        """
+        Проверить пароль по фиктивному хэшу с текущим cost factor.
+
+        Вызывается, когда пользователь не найден: вход по неизвестному
+        email занимает столько же времени, сколько по известному, и время
+        ответа не выдаёт, зарегистрирован ли email.
+        """
+        if self._dummy_hash is None:
+            self._dummy_hash = await self.hash("dummy-password")
+        await self.verify(password, self._dummy_hash)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Хэш создан другой версией алгоритма или с другим cost factor."""
+        parts = hashed.split("$")
+        # $2b$12$<salt+hash>
+        if len(parts) != 4 or parts[1] != "2b" or not parts[2].isdigit():
+            return True
+        return int(parts[2]) != self.rounds
+
+    @property
+    def stats(self) -> PasswordHasherStats:
+        """Текущие метрики."""
+        self._stats.in_flight = min(self._pending, self.workers)
+        self._stats.queue_depth = max(self._pending - self.workers, 0)
+        return self._stats
+
+    def shutdown(self) -> None:
+        """Остановить пул потоков (при завершении приложения)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @staticmethod
+    def _encode(password: str) -> bytes:
+        """Пароль в байтах с проверкой ограничения bcrypt."""
+        secret = password.encode()
+        if len(secret) > BCRYPT_MAX_PASSWORD_BYTES:
+            raise ValueError(f"Пароль не должен быть длиннее {BCRYPT_MAX_PASSWORD_BYTES} байт")
+        return secret
+
+    async def _submit(self, operation: Callable[[], T], kind: str) -> T:
+        """Выполнить операцию в пуле с учётом лимита очереди и метрик."""
+        if self._pending >= self.max_pending:
+            self._stats.rejected += 1
+            raise PasswordHasherSaturatedError("Сервис проверки паролей перегружен, повторите запрос позже")
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+
+        self._pending += 1
+        submitted = time.perf_counter()
+        started = submitted
+
+        def timed() -> T:
+            nonlocal started
+            started = time.perf_counter()
+            return operation()
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self._pending -= 1
+            finished = time.perf_counter()
+            self._record(kind, started - submitted, finished - started)
+
+    def _record(self, kind: str, waited: float, elapsed: float) -> None:
+        """Учесть время ожидания в очереди и время вычисления."""
+        stats = self._stats
+        stats.wait_seconds_total += waited
+        stats.max_latency_seconds = max(stats.max_latency_seconds, waited + elapsed)
+        if kind == "hash":
+            stats.hash_count += 1
+            stats.hash_seconds_total += elapsed
+        else:
+            stats.verify_count += 1
+            stats.verify_seconds_total += elapsed
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.password_bcrypt_rounds,
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+
+
+async def hash_password(password: str) -> str:
+    """Захэшировать пароль (не блокирует event loop)."""
+    return await password_hasher.hash(password)
+
+
+async def verify_password(password: str, hashed: str) -> bool:
+    """Проверить пароль по хэшу (не блокирует event loop)."""
+    return await password_hasher.verify(password, hashed)
@@ -0,0 +1,55 @@
+"""User Service - регистрация и вход."""
+
+from src.user.repository import UserRepository
+from src.user.schemas import TokenPublic, UserCreate, UserLogin, UserPublic
+from src.user.security import password_hasher
+from src.user.tokens import create_access_token
+from src.core.config import settings
+
+
+class UserService:
+    """Сервис для работы с пользователями."""
+
+    def __init__(self, repository: UserRepository):
+        self.repository = repository
+
+    async def register(self, user: UserCreate) -> UserPublic:
+        """
+        Зарегистрировать пользователя.
+
+        Raises:
+            ValueError: Если email уже занят или пароль не подходит для bcrypt.
+        """
+        if await self.repository.get_by_email(user.email) is not None:
+            raise ValueError(f"Пользователь с email {user.email} уже зарегистрирован")
+
+        password_hash = await password_hasher.hash(user.password)
+        created = await self.repository.create(user.email, password_hash)
+        if created is None:
+            # Параллельная регистрация с тем же email
+            raise ValueError(f"Пользователь с email {user.email} уже зарегистрирован")
+        return UserPublic.model_validate(created)
+
+    async def login(self, credentials: UserLogin) -> TokenPublic:
+        """
+        Проверить email и пароль и выпустить токен доступа.
+
+        Raises:
+            ValueError: Если email или пароль неверны.
+        """
+        user = await self.repository.get_by_email(credentials.email)
+        if user is None:
+            # bcrypt выполняется и здесь, иначе по времени ответа видно, что email не зарегистрирован
+            await password_hasher.verify_dummy(credentials.password)
+            raise ValueError("Неверный email или пароль")
+
+        valid, new_hash = await password_hasher.verify_and_update(credentials.password, user.password)
+        if not valid:
+            raise ValueError("Неверный email или пароль")
+        if new_hash is not None:
+            await self.repository.update_password_hash(user.id, new_hash)
+
+        return TokenPublic(
+            access_token=create_access_token(user.id),
+            expires_in=settings.auth_token_ttl_seconds,
+        )
@@ -0,0 +1,91 @@
+"""
+Подписанные stateless-токены доступа.
+
+Формат: `<payload>.<signature>`, где payload - base64url JSON
+`{"sub": user_id, "exp": unix_time}`, signature - HMAC-SHA256 от payload
+на `AUTH_SECRET_KEY`. Проверка не обращается к БД; успешно проверенные
+токены кэшируются, так что повторный запрос стоит одного поиска в LRU.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from typing import Optional, Tuple
+
+from src.common.cache import TTLCache
+from src.core.config import settings
+
+# token -> (user_id, exp)
+verified_tokens: TTLCache[Tuple[int, int]] = TTLCache(
+    "auth.tokens",
+    maxsize=settings.auth_token_cache_size,
+    ttl=settings.auth_token_cache_ttl_seconds,
+)
+
+
+class InvalidTokenError(ValueError):
+    """Токен повреждён, подделан или истёк."""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: str) -> str:
+    digest = hmac.new(settings.auth_secret_key.encode(), payload.encode(), hashlib.sha256).digest()
+    return _b64encode(digest)
+
+
+def create_access_token(user_id: int, ttl_seconds: Optional[int] = None) -> str:
+    """
+    Выпустить токен доступа.
+
+    Args:
+        user_id: ID пользователя.
+        ttl_seconds: Время жизни (по умолчанию из настроек).
+
+    Returns:
+        str: Подписанный токен.
+    """
+    expires_at = int(time.time()) + (ttl_seconds or settings.auth_token_ttl_seconds)
+    payload = _b64encode(json.dumps({"sub": user_id, "exp": expires_at}, separators=(",", ":")).encode())
+    return f"{payload}.{_sign(payload)}"
+
+
+def decode_access_token(token: str) -> int:
+    """
+    Проверить токен и вернуть ID пользователя.
+
+    Raises:
+        InvalidTokenError: Если подпись неверна, формат нарушен или срок истёк.
+    """
+    cached = verified_tokens.get(token)
+    if cached is None:
+        cached = _verify(token)
+        verified_tokens.set(token, cached)
+
+    user_id, expires_at = cached
+    if expires_at <= time.time():
+        verified_tokens.invalidate(token)
+        raise InvalidTokenError("Срок действия токена истёк")
+    return user_id
+
+
+def _verify(token: str) -> Tuple[int, int]:
+    """Проверить подпись и разобрать payload (без кэша)."""
+    payload, _, signature = token.partition(".")
+    if not payload or not signature or not hmac.compare_digest(signature, _sign(payload)):
+        raise InvalidTokenError("Некорректный токен")
+
+    try:
+        claims = json.loads(_b64decode(payload))
+        return int(claims["sub"]), int(claims["exp"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidTokenError("Некорректный токен")
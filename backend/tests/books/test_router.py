@@ -0,0 +1,131 @@
+"""Сквозные проверки API книг: создание, список, изменение, удаление."""
+
+import io
+from pathlib import Path
+
+from PIL import Image
+
+BOOKS = "/api/v1/book"
+
+
+def _create(client, **data):
+    response = client.post(BOOKS, data={"name": "Книга", **data})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_create_list_update_delete(client):
+    book = _create(client, genre="Роман", author="Толстой", book_status="reading")
+    assert book["created_at"] is not None
+    assert book["genre"] == "Роман"
+
+    response = client.get(BOOKS, params={"limit": 500})
+    assert response.status_code == 200
+    assert book["id"] in [item["id"] for item in response.json()["items"]]
+
+    response = client.put(f"{BOOKS}/{book['id']}", json={"status": "finished", "genre": "Эпопея"})
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "finished"
+    assert response.json()["genre"] == "Эпопея"
+
+    stats = client.get(f"{BOOKS}/stats").json()
+    assert stats["by_status"].get("finished", 0) >= 1
+
+    assert client.delete(f"{BOOKS}/{book['id']}").status_code == 204
+    assert client.get(f"{BOOKS}/{book['id']}").status_code == 404
+    assert client.delete(f"{BOOKS}/{book['id']}").status_code == 404
+    assert client.put(f"{BOOKS}/{book['id']}", json={"author": "x"}).status_code == 404
+
+
+def test_list_filters_and_search(client):
+    book = _create(client, name="Уникальное название", genre="Фильтруемый", book_status="dropped")
+
+    items = client.get(BOOKS, params={"genre": "Фильтруемый", "status": "dropped"}).json()["items"]
+    assert [item["id"] for item in items] == [book["id"]]
+
+    items = client.get(BOOKS, params={"q": "уникальн"}).json()["items"]
+    assert book["id"] in [item["id"] for item in items]
+
+
+def test_search_with_name_filter(client):
+    first = _create(client, name="Капитанская дочка", author="Поисковый автор")
+    second = _create(client, name="Дубровский", author="Поисковый автор")
+
+    items = client.get(BOOKS, params={"q": "поисковый"}).json()["items"]
+    assert {first["id"], second["id"]} <= {item["id"] for item in items}
+
+    # name сужает и полнотекстовый поиск, а не игнорируется
+    items = client.get(BOOKS, params={"q": "поисковый", "name": "Дубров"}).json()["items"]
+    assert [item["id"] for item in items] == [second["id"]]
+
+
+def test_genres_cache_invalidated_only_for_new_genres(client, monkeypatch):
+    from src.books import service
+
+    invalidated = []
+    monkeypatch.setattr(service.reference_cache, "invalidate", invalidated.append)
+
+    book = _create(client, genre="Кэшируемый")
+    assert invalidated == [service.GENRES_CACHE_KEY]
+
+    _create(client, genre="Кэшируемый")
+    client.put(f"{BOOKS}/{book['id']}", json={"genre": "Кэшируемый", "status": "reading"})
+    client.post(f"{BOOKS}/batch/update", json={"ids": [book["id"]], "patch": {"genre": "Кэшируемый"}})
+    assert len(invalidated) == 1
+
+    client.put(f"{BOOKS}/{book['id']}", json={"genre": "Ещё не известный"})
+    assert len(invalidated) == 2
+    assert "Ещё не известный" in client.get(f"{BOOKS}/genres").json()
+
+
+def test_batch_update_and_delete(client):
+    ids = [_create(client, name=f"Пакет {index}", genre="Пакетный")["id"] for index in range(3)]
+
+    response = client.post(f"{BOOKS}/batch/update", json={"ids": ids, "patch": {"status": "finished"}})
+    assert response.json() == {"affected": 3}
+    assert {client.get(f"{BOOKS}/{book_id}").json()["status"] for book_id in ids} == {"finished"}
+
+    assert client.post(f"{BOOKS}/batch/delete", json={}).status_code == 400
+
+    response = client.post(f"{BOOKS}/batch/delete", json={"filter": {"genre": "Пакетный"}})
+    assert response.json() == {"affected": 3}
+    assert client.get(f"{BOOKS}/{ids[0]}").status_code == 404
+
+
+def test_create_with_cover(client):
+    cover = io.BytesIO()
+    Image.new("RGB", (400, 600), (10, 20, 30)).save(cover, "PNG")
+    response = client.post(BOOKS, data={"name": "С обложкой"}, files={"image": ("c.png", cover.getvalue(), "image/png")})
+    assert response.status_code == 201, response.text
+    assert response.json()["image_url"]
+
+    image_url = response.json()["image_url"]
+    served = client.get(f"/{image_url}")
+    assert served.status_code == 200
+    assert "immutable" in served.headers["cache-control"]
+
+
+def test_partial_upload_not_served(client):
+    # Каталог uploads/images создан lifespan в текущем (временном) каталоге
+    Path("uploads/images/.unfinished.part").write_bytes(b"partial")
+    assert client.get("/uploads/images/.unfinished.part").status_code == 404
+
+
+def test_oversized_cover_rejected_before_parsing(client):
+    from src.common.utils.image import MAX_FILE_SIZE
+
+    payload = b"\0" * (MAX_FILE_SIZE + 256 * 1024)
+    response = client.post(BOOKS, data={"name": "Большая"}, files={"image": ("big.png", payload, "image/png")})
+    assert response.status_code == 413
+
+    # Без Content-Length: тело обрывается по мере приёма
+    def chunks():
+        for _ in range(len(payload) // (64 * 1024)):
+            yield payload[:64 * 1024]
+
+    response = client.post(
+        BOOKS,
+        content=chunks(),
+        headers={"content-type": "multipart/form-data; boundary=limit"},
+    )
+    assert response.status_code == 413
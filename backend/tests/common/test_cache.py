@@ -0,0 +1,75 @@
+"""TTLCache: одна загрузка на одновременные промахи."""
+
+import anyio
+
+from src.common.cache import TTLCache
+
+
+def test_concurrent_misses_share_one_load():
+    cache: TTLCache[int] = TTLCache("test.single_flight")
+    calls = 0
+    results = []
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await anyio.sleep(0.05)
+        return 42
+
+    async def get():
+        results.append(await cache.get_or_load("key", loader))
+
+    async def scenario():
+        async with anyio.create_task_group() as group:
+            for _ in range(5):
+                group.start_soon(get)
+
+    anyio.run(scenario)
+    assert calls == 1
+    assert results == [42] * 5
+    assert cache.get("key") == 42
+
+
+def test_failed_load_is_shared_and_not_cached():
+    cache: TTLCache[int] = TTLCache("test.single_flight_error")
+    calls = 0
+    errors = []
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await anyio.sleep(0.05)
+        raise RuntimeError("нет данных")
+
+    async def get():
+        try:
+            await cache.get_or_load("key", loader)
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    async def scenario():
+        async with anyio.create_task_group() as group:
+            for _ in range(3):
+                group.start_soon(get)
+
+    anyio.run(scenario)
+    assert calls == 1
+    assert len(errors) == 3
+    assert cache.get("key") is None
+
+
+def test_invalidated_during_load_not_cached():
+    cache: TTLCache[int] = TTLCache("test.single_flight_invalidate")
+
+    async def loader():
+        await anyio.sleep(0.05)
+        return 1
+
+    async def scenario():
+        async with anyio.create_task_group() as group:
+            group.start_soon(cache.get_or_load, "key", loader)
+            await anyio.sleep(0.01)
+            cache.invalidate("key")
+
+    anyio.run(scenario)
+    assert cache.get("key") is None
@@ -0,0 +1,30 @@
+"""Метрики HTTP: метки маршрутов в /metrics."""
+
+import re
+
+
+def _routes(client):
+    text = client.get("/metrics").text
+    return set(re.findall(r'http_request_duration_seconds_count\{method="(\w+)",route="([^"]*)"', text))
+
+
+def test_route_labels_are_full_templates(client):
+    book_id = client.post("/api/v1/book", data={"name": "Метрики"}).json()["id"]
+    client.get(f"/api/v1/book/{book_id}")
+    client.get("/api/v1/book")
+    client.post("/api/v1/auth/register", json={"email": "metrics@example.com", "password": "long-enough-password"})
+    client.get("/api/v1/openapi.json")
+    client.get("/uploads/images/missing.png")
+    client.get("/no-such-route")
+
+    routes = _routes(client)
+    assert {
+        ("POST", "/api/v1/book"),
+        ("GET", "/api/v1/book"),
+        ("GET", "/api/v1/book/{book_id}"),
+        ("POST", "/api/v1/auth/register"),
+        ("GET", "/api/v1/openapi.json"),
+        ("GET", "/uploads/{path}"),
+        ("GET", "unmatched"),
+    } <= routes
+    assert ("GET", "/{book_id}") not in routes
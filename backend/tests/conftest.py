@@ -0,0 +1,35 @@
+"""
+Общие фикстуры тестов.
+
+Настройки и движки создаются при импорте `src`, поэтому окружение
+(временная база, каталог загрузок и блокировок) задаётся здесь,
+до первого импорта приложения.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+WORK_DIR = tempfile.mkdtemp(prefix="booklog-tests-")
+
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(WORK_DIR, 'books.db')}"
+os.environ["IMAGE_GC_INTERVAL_SECONDS"] = "0"
+os.environ["AUTH_SECRET_KEY"] = "test-secret-key"
+# uploads/ и файлы блокировок создаются в текущем каталоге
+os.chdir(WORK_DIR)
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient приложения с выполненным lifespan (схема, обработчики задач)."""
+    from fastapi.testclient import TestClient
+
+    from src.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,89 @@
+"""Очереди задач и повторы обработчика."""
+
+import anyio
+import pytest
+
+from src.jobs.queue import Job, JobQueue, MemoryJobQueue, SQLiteJobQueue
+from src.jobs.registry import job_type
+from src.jobs.worker import JobWorker
+
+calls = []
+
+
+@job_type("tests.flaky")
+async def flaky(fail_times: int) -> None:
+    calls.append(fail_times)
+    if len(calls) <= fail_times:
+        raise RuntimeError("boom")
+
+
+def test_queue_interface_is_abstract():
+    with pytest.raises(TypeError):
+        JobQueue()
+
+
+def test_worker_retries_then_fails():
+    async def scenario():
+        queue = MemoryJobQueue()
+        worker = JobWorker(queue, max_attempts=2, retry_base_seconds=0, retry_max_seconds=0)
+
+        calls.clear()
+        await worker.run(Job(name="tests.flaky", payload={"fail_times": 1}))
+        assert await queue.size() == 1
+        await worker.run(await queue.get())
+        assert await queue.size() == 0 and len(calls) == 2
+
+        calls.clear()
+        job = Job(name="tests.flaky", payload={"fail_times": 5})
+        await worker.run(job)
+        await worker.run(await queue.get())
+        assert job.attempts == 2 and await queue.size() == 0
+
+    anyio.run(scenario)
+
+
+def test_sqlite_queue_survives_reopen(tmp_path):
+    path = str(tmp_path / "jobs.db")
+
+    async def put():
+        queue = SQLiteJobQueue(path)
+        await queue.put(Job(name="tests.flaky", payload={"fail_times": 0}))
+        await queue.close()
+
+    async def take():
+        queue = SQLiteJobQueue(path)
+        job = await queue.get()
+        assert job.payload == {"fail_times": 0}
+        await queue.done(job)
+        assert await queue.size() == 0
+        await queue.close()
+
+    anyio.run(put)
+    anyio.run(take)
+
+
+def test_thumbnails_requeued_on_startup(client, monkeypatch):
+    from sqlalchemy import update
+
+    from src.books.models import BookModel
+    from src.core.database import WriterSessionLocal
+    from src.jobs import tasks
+
+    book_id = client.post("/api/v1/book", data={"name": "Обложка без миниатюр"}).json()["id"]
+    enqueued = []
+
+    async def fake_enqueue(name, **payload):
+        enqueued.append((name, payload))
+
+    async def scenario():
+        async with WriterSessionLocal() as session:
+            await session.execute(
+                update(BookModel).where(BookModel.id == book_id).values(image_url="uploads/images/lost.png")
+            )
+            await session.commit()
+        return await tasks.requeue_missing_thumbnails()
+
+    monkeypatch.setattr(tasks, "enqueue", fake_enqueue)
+    # В event loop приложения: движки БД привязаны к нему
+    assert client.portal.call(scenario) >= 1
+    assert (tasks.THUMBNAILS, {"book_id": book_id, "image_url": "uploads/images/lost.png", "owner_id": None}) in enqueued
@@ -0,0 +1,114 @@
+"""Миграции Alembic на чистой SQLite-базе и на базах, созданных через create_all."""
+
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+
+from tests.conftest import BACKEND_DIR
+
+
+def _alembic(database: str, *args: str) -> None:
+    # Отдельный процесс: env.py берёт URL из настроек, созданных при импорте src
+    subprocess.run(
+        [sys.executable, "-m", "alembic", *args],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "DATABASE_URL": f"sqlite+aiosqlite:///{database}"},
+        check=True,
+        capture_output=True,
+    )
+
+
+def _python(database: str, code: str, cwd: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=cwd,
+        env={
+            **os.environ,
+            "DATABASE_URL": f"sqlite+aiosqlite:///{database}",
+            "PYTHONPATH": str(BACKEND_DIR),
+            "DB_SCHEMA_INIT": "create_all",
+        },
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout
+
+
+def test_upgrade_head_on_fresh_sqlite(tmp_path):
+    database = str(tmp_path / "migrated.db")
+    _alembic(database, "upgrade", "head")
+
+    connection = sqlite3.connect(database)
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(books)")}
+    assert {"owner_id", "genre_id", "image_variants", "created_at"} <= columns
+    references = {row[2]: row[6] for row in connection.execute("PRAGMA foreign_key_list(books)")}
+    assert references == {"users": "CASCADE", "genres": "SET NULL"}
+    triggers = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    assert {"books_fts_ai", "books_fts_ad", "books_fts_au", "books_status_check_ai"} <= triggers
+
+    # Триггеры FTS и CHECK статуса работают после всей цепочки
+    connection.execute("INSERT INTO books (name, author) VALUES ('Война и мир', 'Толстой')")
+    assert connection.execute("SELECT rowid FROM books_fts WHERE books_fts MATCH 'толст*'").fetchall()
+    try:
+        connection.execute("INSERT INTO books (name, status) VALUES ('x', 'unknown')")
+    except sqlite3.IntegrityError:
+        pass
+    else:
+        raise AssertionError("status outside BookStatus was accepted")
+    connection.close()
+
+
+def test_downgrade_and_upgrade_again(tmp_path):
+    database = str(tmp_path / "roundtrip.db")
+    _alembic(database, "upgrade", "head")
+    _alembic(database, "downgrade", "e1f7a9b5c6d8")
+    _alembic(database, "upgrade", "head")
+
+
+def test_upgrade_head_on_legacy_create_all_database(tmp_path):
+    # books.db в репозитории создан старым lifespan через create_all, без alembic_version
+    database = str(tmp_path / "legacy.db")
+    shutil.copy(BACKEND_DIR / "books.db", database)
+    _alembic(database, "upgrade", "head")
+
+    connection = sqlite3.connect(database)
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(books)")}
+    assert {"genre", "owner_id", "genre_id", "image_variants"} <= columns
+    # Жанры существующих книг не перезаписаны значением по умолчанию
+    assert "Fantasy" not in {row[0] for row in connection.execute("SELECT genre FROM books")}
+    assert connection.execute("SELECT count(*) FROM books WHERE genre_id IS NULL AND genre IS NOT NULL").fetchone() == (0,)
+    connection.close()
+
+
+def test_upgrade_head_on_unversioned_create_all_database(tmp_path):
+    # create_all по текущим моделям, но без alembic_version
+    database = str(tmp_path / "create_all.db")
+    _python(database, "import asyncio; from src.core.bootstrap import _create_all; asyncio.run(_create_all())", tmp_path)
+    _alembic(database, "upgrade", "head")
+
+    connection = sqlite3.connect(database)
+    assert connection.execute("SELECT count(*) FROM alembic_version").fetchone() == (1,)
+    connection.close()
+
+
+def test_app_starts_on_legacy_database(tmp_path):
+    # DB_SCHEMA_INIT=create_all на базе без alembic_version: lifespan применяет миграции
+    database = str(tmp_path / "legacy.db")
+    shutil.copy(BACKEND_DIR / "books.db", database)
+    output = _python(database, (
+        "from fastapi.testclient import TestClient\n"
+        "from src.main import app\n"
+        "with TestClient(app) as client:\n"
+        "    response = client.get('/api/v1/book')\n"
+        "    print(response.status_code, len(response.json()['items']))\n"
+    ), tmp_path)
+    assert output.split() == ["200", "2"]
+
+    connection = sqlite3.connect(database)
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(books)")}
+    assert {"owner_id", "genre_id", "image_variants"} <= columns
+    assert connection.execute("SELECT count(*) FROM alembic_version").fetchone() == (1,)
+    connection.close()
@@ -0,0 +1,51 @@
+"""Регистрация, вход и доступ к книгам по токену."""
+
+BOOKS = "/api/v1/book"
+
+
+def test_register_and_login(client):
+    credentials = {"email": "reader@example.com", "password": "long-enough-password"}
+    assert client.post("/api/v1/auth/register", json=credentials).status_code == 201
+    response = client.post("/api/v1/auth/login", json=credentials)
+    assert response.status_code == 200, response.text
+    token = response.json()["access_token"]
+
+    response = client.post(BOOKS, data={"name": "Личная"}, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 201
+    # Книга пользователя не видна анонимно
+    assert client.get(f"{BOOKS}/{response.json()['id']}").status_code == 404
+
+
+def test_deleted_user_books_stay_private(client):
+    from sqlalchemy import delete, select
+
+    from src.books.models import BookModel
+    from src.core.database import WriterSessionLocal
+    from src.user.models import UserModel
+
+    credentials = {"email": "leaving@example.com", "password": "long-enough-password"}
+    user_id = client.post("/api/v1/auth/register", json=credentials).json()["id"]
+    token = client.post("/api/v1/auth/login", json=credentials).json()["access_token"]
+    book_id = client.post(BOOKS, data={"name": "Приватная"}, headers={"Authorization": f"Bearer {token}"}).json()["id"]
+
+    async def delete_user():
+        async with WriterSessionLocal() as session:
+            await session.execute(delete(UserModel).where(UserModel.id == user_id))
+            await session.commit()
+            return await session.scalar(select(BookModel.id).where(BookModel.id == book_id))
+
+    # ON DELETE CASCADE: книги не переходят в общий каталог (owner_id IS NULL)
+    assert client.portal.call(delete_user) is None
+    assert client.get(f"{BOOKS}/{book_id}").status_code == 404
+
+
+def test_login_unknown_email_runs_bcrypt(client):
+    from src.user.security import password_hasher
+
+    credentials = {"email": "nobody@example.com", "password": "long-enough-password"}
+    client.post("/api/v1/auth/login", json=credentials)
+    before = password_hasher.stats.verify_count
+    response = client.post("/api/v1/auth/login", json=credentials)
+    assert response.status_code == 401
+    # Та же проверка bcrypt, что и для существующего пользователя
+    assert password_hasher.stats.verify_count == before + 1
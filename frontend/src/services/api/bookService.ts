@@ -3,18 +3,29 @@
  */
 
 import { apiClient } from './axios';
-import type { Book, BookCreate, BookStatus, BookUpdate } from '@/types/book';
+import type { Book, BookCreate, BookPage, BookStatus, BookUpdate } from '@/types/book';
 
 const BOOKS_ENDPOINT = '/book';
 
 export const bookService = {
   /**
-   * Получить все книги
+   * Получить все книги, проходя по страницам через next_cursor
    */
   async getAllBooks(searchQuery?: string): Promise<Book[]> {
-    const params = searchQuery ? { name: searchQuery } : {};
-    const response = await apiClient.get<Book[]>(BOOKS_ENDPOINT, { params });
-    return response.data;
+    const books: Book[] = [];
+    let cursor: string | null = null;
+
+    do {
+      const params: Record<string, string> = searchQuery ? { name: searchQuery } : {};
+      if (cursor) {
+        params.cursor = cursor;
+      }
+      const response = await apiClient.get<BookPage>(BOOKS_ENDPOINT, { params });
+      books.push(...response.data.items);
+      cursor = response.data.next_cursor;
+    } while (cursor);
+
+    return books;
   },
 
   /**
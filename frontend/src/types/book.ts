@@ -4,6 +4,13 @@
 
 export type BookStatusValue = 'want_to_read' | 'reading' | 'finished' | 'dropped';
 
+export interface ImageVariant {
+  url: string;
+  width: number;
+  height: number;
+  format: string;
+}
+
 export interface Book {
   id: number;
   name: string;
@@ -11,11 +18,17 @@ export interface Book {
   author: string | null;
   status: BookStatusValue | null;
   image_url: string | null;
+  image_variants: ImageVariant[] | null;
   pages: number | null;
   year: number | null;
   created_at: string | null;
 }
 
+export interface BookPage {
+  items: Book[];
+  next_cursor: string | null;
+}
+
 export interface BookCreate {
   name: string;
   genre?: string | null;